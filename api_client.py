@@ -1,236 +1,492 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from datetime import datetime
-import random
 import numpy as np
 import json
 import os
 import subprocess
 import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from data_cache import DataCache
+from local_server import LocalAPIServer, LocalStore
+
+# Kategori bazlı ürünler (her kategoride birden fazla ürün)
+CATEGORY_PRODUCTS = {
+    'Elektronik': ['Laptop', 'Akıllı Telefon', 'Tablet', 'Kulaklık', 'Monitör', 'Klavye', 'Mouse', 'Kamera'],
+    'Giyim': ['T-shirt', 'Pantolon', 'Elbise', 'Gömlek', 'Ceket', 'Ayakkabı', 'Çanta', 'Şapka'],
+    'Kitap': ['Roman', 'Bilim Kurgu', 'Tarih', 'Biyografi', 'Kişisel Gelişim', 'Çocuk Kitabı', 'Dergi', 'Akademik'],
+    'Spor': ['Futbol Topu', 'Koşu Ayakkabısı', 'Fitness Ekipmanı', 'Bisiklet', 'Yüzme Gözlüğü', 'Tenis Raketi', 'Yoga Matı', 'Spor Çantası'],
+    'Ev & Yaşam': ['Mobilya', 'Mutfak Eşyası', 'Yatak Örtüsü', 'Aydınlatma', 'Dekorasyon', 'Halı', 'Perde', 'Ev Tekstili'],
+    'Kozmetik': ['Parfüm', 'Ruj', 'Fondöten', 'Şampuan', 'Krem', 'Güneş Kremi', 'Makyaj Seti', 'Saç Bakım Ürünü'],
+    'Oyuncak': ['Lego', 'Peluş Oyuncak', 'Puzzle', 'Oyun Konsolu', 'Kutu Oyunu', 'Bebek', 'Uzaktan Kumandalı Araba', 'Eğitici Oyuncak'],
+    'Bahçe': ['Bitki', 'Bahçe Mobilyası', 'Çim Biçme Makinesi', 'Sulama Sistemi', 'Tohum', 'Saksı', 'Bahçe Aletleri', 'Gübre'],
+    'Otomotiv': ['Araç Aksesuarı', 'Oto Parfümü', 'Lastik', 'Yağ', 'Araç Bakım Ürünü', 'Navigasyon Cihazı', 'Araç Şarj Cihazı', 'Koltuk Kılıfı'],
+    'Kırtasiye': ['Kalem', 'Defter', 'Dosya', 'Hesap Makinesi', 'Çanta', 'Takvim', 'Ajanda', 'Boya Seti']
+}
+
+# Kategori bazlı fiyat aralıkları (daha gerçekçi)
+CATEGORY_PRICE_RANGES = {
+    'Elektronik': (500, 5000),
+    'Giyim': (50, 500),
+    'Kitap': (20, 150),
+    'Spor': (100, 2000),
+    'Ev & Yaşam': (100, 3000),
+    'Kozmetik': (30, 300),
+    'Oyuncak': (50, 500),
+    'Bahçe': (100, 2000),
+    'Otomotiv': (50, 1000),
+    'Kırtasiye': (5, 100)
+}
+
+# Ödeme yöntemleri ve cinsiyet seçenekleri
+PAYMENT_METHODS = ['Kredi Kartı', 'Havale', 'Kapıda Ödeme', 'Mobil Ödeme', 'Kripto Para']
+GENDERS = ['Erkek', 'Kadın', 'Belirtilmemiş']
+
+# Kategori verisi (db.json içindeki /categories koleksiyonu)
+CATEGORIES = [
+    {'id': 1, 'name': 'Elektronik', 'description': 'Elektronik ürünler ve aksesuarlar'},
+    {'id': 2, 'name': 'Giyim', 'description': 'Kıyafet ve moda ürünleri'},
+    {'id': 3, 'name': 'Kitap', 'description': 'Kitaplar ve dergiler'},
+    {'id': 4, 'name': 'Spor', 'description': 'Spor ekipmanları ve giyim'},
+    {'id': 5, 'name': 'Ev & Yaşam', 'description': 'Ev dekorasyon ve mobilya ürünleri'},
+    {'id': 6, 'name': 'Kozmetik', 'description': 'Kozmetik ve kişisel bakım ürünleri'},
+    {'id': 7, 'name': 'Oyuncak', 'description': 'Çocuk oyuncakları ve oyunları'},
+    {'id': 8, 'name': 'Bahçe', 'description': 'Bahçe ekipmanları ve bitkileri'},
+    {'id': 9, 'name': 'Otomotiv', 'description': 'Araç aksesuarları ve bakım ürünleri'},
+    {'id': 10, 'name': 'Kırtasiye', 'description': 'Ofis ve okul malzemeleri'}
+]
+
+SALES_COLUMNS = [
+    'id', 'customer_id', 'product_name', 'category', 'price', 'purchase_date',
+    'quantity', 'satisfaction_score', 'payment_method', 'shipping_cost', 'discount_applied'
+]
+
+# API'den gelen satış kayıtlarının sütun tipleri (diğer sütunlar object kalır)
+SALES_DTYPES = {
+    'id': 'int64', 'customer_id': 'int64', 'price': 'float64', 'quantity': 'int64',
+    'satisfaction_score': 'float64', 'shipping_cost': 'float64', 'discount_applied': 'bool'
+}
+
+# Üretici için sabit lookup dizileri (kategori x ürün slotu)
+_CATEGORY_NAMES = np.array(list(CATEGORY_PRODUCTS), dtype=object)
+_CATEGORY_SIZES = np.array([len(p) for p in CATEGORY_PRODUCTS.values()])
+_CATEGORY_OFFSETS = np.concatenate([[0], np.cumsum(_CATEGORY_SIZES)[:-1]])
+_MAX_PRODUCTS = int(_CATEGORY_SIZES.max())
+_PRODUCT_SLOT_VALID = np.arange(_MAX_PRODUCTS) < _CATEGORY_SIZES[:, None]
+_PRODUCT_NAMES = np.array([p for products in CATEGORY_PRODUCTS.values() for p in products], dtype=object)
+# Aynı isim birden fazla kategoride olabilir (örn. 'Çanta'); fiyat varyasyonu isim bazlıdır
+_PRODUCT_NAME_CODES = pd.factorize(_PRODUCT_NAMES)[0]
+_PRICE_LOW = np.array([CATEGORY_PRICE_RANGES[c][0] for c in CATEGORY_PRODUCTS], dtype=float)
+_PRICE_HIGH = np.array([CATEGORY_PRICE_RANGES[c][1] for c in CATEGORY_PRODUCTS], dtype=float)
+_PAYMENT_METHODS = np.array(PAYMENT_METHODS, dtype=object)
+
+
+def generate_customers(n_customers=20, seed=None):
+    """Örnek müşteri listesi oluşturma"""
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(18, 76, size=n_customers)
+    genders = rng.choice(GENDERS, size=n_customers)
+    return [
+        {
+            'id': i,
+            'name': f"Müşteri {i}",
+            'email': f"musteri{i}@example.com",
+            'age': int(age),
+            'gender': str(gender),
+            'address': f"Adres {i}"
+        }
+        for i, age, gender in zip(range(1, n_customers + 1), ages, genders)
+    ]
+
+
+def generate_sample_sales(n_customers=20, n_rows=None, seed=None, first_id=1, first_basket=0):
+    """NumPy Generator ile sütun bazlı örnek satış verisi oluşturma
+    
+    Her (müşteri, kategori) sepetinde 2-4 farklı ürün alınır. n_rows verilirse
+    sepetler müşteriler üzerinde döngüsel olarak tekrarlanır ve tablo tam
+    n_rows satıra kesilir. Satır başına Python çağrısı yapılmaz.
+    
+    Args:
+        n_customers: Müşteri sayısı
+        n_rows: Hedef satır sayısı (None ise her müşteri her kategoriden bir sepet alır)
+        seed: Tohum değeri veya np.random.Generator
+        first_id: İlk satışın ID'si (parçalı üretimde kaydırma için)
+        first_basket: İlk sepetin global sırası (müşteri döngüsünü sürdürmek için)
+        
+    Returns:
+        df: Satış verilerini içeren DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    n_categories = len(_CATEGORY_NAMES)
+    
+    # Sepet sayısı ve her sepetten alınacak ürün sayısı (2-4)
+    if n_rows is None:
+        n_baskets = n_customers * n_categories
+    else:
+        n_baskets = -(-n_rows // 2)  # Her sepet en az 2 satır üretir
+    basket_category = (first_basket + np.arange(n_baskets)) % n_categories
+    n_to_buy = np.minimum(rng.integers(2, 5, size=n_baskets), _CATEGORY_SIZES[basket_category])
+    
+    # Hedef satır sayısına yetecek kadar sepet kullan
+    if n_rows is not None:
+        n_baskets = int(np.searchsorted(np.cumsum(n_to_buy), n_rows)) + 1
+        n_to_buy = n_to_buy[:n_baskets]
+        basket_category = basket_category[:n_baskets]
+    basket_customer = ((first_basket + np.arange(n_baskets)) // n_categories) % n_customers + 1
+    
+    # Sepet başına tekrarsız ürün seçimi: rastgele anahtarları sıralayıp ilk k slotu al
+    keys = rng.random((n_baskets, _MAX_PRODUCTS))
+    keys[~_PRODUCT_SLOT_VALID[basket_category]] = np.inf
+    slots = np.argsort(keys, axis=1)
+    row_basket, row_rank = np.nonzero(np.arange(_MAX_PRODUCTS) < n_to_buy[:, None])
+    if n_rows is not None:
+        row_basket, row_rank = row_basket[:n_rows], row_rank[:n_rows]
+    n_sales = len(row_basket)
+    
+    category_codes = basket_category[row_basket]
+    product_codes = _CATEGORY_OFFSETS[category_codes] + slots[row_basket, row_rank]
+    
+    # Fiyat (kategori bazlı), tarih (son 365 gün), miktar, memnuniyet ve ek alanlar
+    price = np.round(rng.uniform(_PRICE_LOW[category_codes], _PRICE_HIGH[category_codes]), 2)
+    # Tarih metinleri 366 günlük tablodan seçilir (satır başına strftime yok)
+    today = np.datetime64(datetime.now().date(), 'D')
+    date_strings = (today - np.arange(366).astype('timedelta64[D]')).astype(str).astype(object)
+    purchase_date = date_strings[rng.integers(0, 366, size=n_sales)]
+    quantity = rng.integers(1, 6, size=n_sales)
+    satisfaction_score = np.round(rng.uniform(1, 5, size=n_sales), 1)
+    payment_method = _PAYMENT_METHODS[rng.integers(0, len(_PAYMENT_METHODS), size=n_sales)]
+    shipping_cost = np.round(rng.uniform(0, 50, size=n_sales), 2)
+    discount_applied = rng.random(n_sales) < 0.5
+    product_name = _PRODUCT_NAMES[product_codes]
+    
+    # Eksik veri ekleme: satışların %5'inde rastgele bir alan (quantity hariç) eksik
+    missing_indices = rng.choice(n_sales, size=int(n_sales * 0.05), replace=False)
+    missing_fields = rng.integers(0, 4, size=len(missing_indices))
+    price[missing_indices[missing_fields == 0]] = np.nan
+    product_name[missing_indices[missing_fields == 1]] = None
+    purchase_date[missing_indices[missing_fields == 2]] = None
+    satisfaction_score[missing_indices[missing_fields == 3]] = np.nan
+    
+    # Satisfaction score için daha fazla eksik veri (satışların %15'i)
+    satisfaction_score[rng.choice(n_sales, size=int(n_sales * 0.15), replace=False)] = np.nan
+    
+    # Birden fazla satışı olan ürünlerde %30 olasılıkla ±%10 fiyat varyasyonu
+    name_codes = _PRODUCT_NAME_CODES[product_codes]
+    has_name = pd.notna(product_name)
+    name_counts = np.bincount(name_codes[has_name], minlength=len(_PRODUCT_NAMES))
+    vary = has_name & (name_counts[name_codes] > 1) & ~np.isnan(price) & (rng.random(n_sales) < 0.3)
+    price[vary] = np.round(price[vary] * rng.uniform(0.9, 1.1, size=int(vary.sum())), 2)
+    
+    return pd.DataFrame({
+        'id': np.arange(first_id, first_id + n_sales),
+        'customer_id': basket_customer[row_basket],
+        'product_name': product_name,
+        'category': _CATEGORY_NAMES[category_codes],
+        'price': price,
+        'purchase_date': purchase_date,
+        'quantity': quantity,
+        'satisfaction_score': satisfaction_score,
+        'payment_method': payment_method,
+        'shipping_cost': shipping_cost,
+        'discount_applied': discount_applied
+    }, columns=SALES_COLUMNS)
+
+
+def generate_sample_chunk(chunk_index, chunk_size, n_rows, n_customers=20, seed=0):
+    """Tek bir veri parçasını bağımsız olarak üretme
+    
+    Her parçanın Generator'ı (seed, chunk_index) çiftinden türetilir; böylece
+    parçalar herhangi bir sırada veya farklı süreçlerde aynı sonucu verir.
+    """
+    start = chunk_index * chunk_size
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+    return generate_sample_sales(
+        n_customers,
+        min(chunk_size, n_rows - start),
+        rng,
+        first_id=start + 1,
+        first_basket=start // 3  # Sepet başına ortalama 3 satır
+    )
+
+
+def iter_sample_chunks(n_rows, chunk_size=1_000_000, n_customers=20, seed=None, n_workers=1):
+    """Sabit boyutlu DataFrame parçaları üreten generator
+    
+    Args:
+        n_rows: Toplam satır sayısı
+        chunk_size: Parça başına satır sayısı (son parça daha küçük olabilir)
+        n_customers: Müşteri sayısı
+        seed: Tohum değeri (None ise bir kez rastgele seçilir)
+        n_workers: 1'den büyükse parçalar süreç havuzunda paralel üretilir
+        
+    Yields:
+        chunk: Sıradaki satış parçası (DataFrame)
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    n_chunks = -(-n_rows // chunk_size)
+    
+    if n_workers <= 1:
+        for chunk_index in range(n_chunks):
+            yield generate_sample_chunk(chunk_index, chunk_size, n_rows, n_customers, seed)
+        return
+    
+    # Bellekte aynı anda en fazla 2 * n_workers parça bekler, sıra korunur
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        pending = deque()
+        next_chunk = 0
+        while next_chunk < n_chunks or pending:
+            while next_chunk < n_chunks and len(pending) < 2 * n_workers:
+                pending.append(executor.submit(
+                    generate_sample_chunk, next_chunk, chunk_size, n_rows, n_customers, seed
+                ))
+                next_chunk += 1
+            yield pending.popleft().result()
+
+
+def sales_frame(records, columns=None):
+    """JSON kayıtlarından SALES_DTYPES tiplerinde DataFrame oluşturma
+    
+    Eksik değer içeren tamsayı/mantıksal sütunlar float/object olarak bırakılır.
+    columns verilirse diğer alanlar DataFrame'e hiç alınmaz.
+    """
+    df = pd.DataFrame.from_records(records, columns=columns)
+    for column, dtype in SALES_DTYPES.items():
+        if column not in df.columns:
+            continue
+        if dtype == 'float64' or not df[column].isnull().any():
+            df[column] = df[column].astype(dtype)
+        elif dtype == 'int64':
+            df[column] = df[column].astype('float64')
+    return df
+
+
+def query_params(columns=None, since=None, category=None):
+    """fetch_data filtrelerini json-server sorgu parametrelerine dönüştürme (senkron ve asenkron istemciler için)
+    
+    Args:
+        columns: İstenen sütunlar (json-server alan seçimi desteklemediğinden
+            parametre olarak gönderilmez; yanıt çözülür çözülmez uygulanır)
+        since: Bu tarihten (dahil) sonraki satışlar; tarih veya bugünden
+            geriye gün sayısı
+        category: Kategori adı veya adları
+        
+    Returns:
+        params: (ad, değer) çiftleri listesi
+    """
+    params = []
+    if since is not None:
+        if isinstance(since, int):
+            since = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=since)
+        params.append(('purchase_date_gte', pd.Timestamp(since).strftime('%Y-%m-%d')))
+    if category is not None:
+        categories = [category] if isinstance(category, str) else list(category)
+        params.extend(('category', name) for name in categories)
+    return params
+
+
+def write_sample_dataset(path, n_rows, chunk_size=1_000_000, n_customers=20, seed=None, n_workers=1):
+    """Örnek veriyi parça parça doğrudan diske yazma (CSV veya JSON Lines)
+    
+    Tüm tablo hiçbir zaman bellekte tutulmaz; tepe bellek kullanımı
+    parça boyutuyla sınırlıdır.
+    
+    Returns:
+        n_written: Yazılan satır sayısı
+    """
+    fmt = os.path.splitext(path)[1].lower()
+    if fmt not in ('.csv', '.jsonl'):
+        raise ValueError(f"Desteklenmeyen dosya formatı: {fmt} (.csv veya .jsonl kullanın)")
+    
+    n_written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in iter_sample_chunks(n_rows, chunk_size, n_customers, seed, n_workers):
+            if fmt == '.csv':
+                chunk.to_csv(f, header=(n_written == 0), index=False)
+            else:
+                lines = chunk.to_json(orient='records', lines=True, force_ascii=False)
+                f.write(lines if lines.endswith('\n') else lines + '\n')
+            n_written += len(chunk)
+    return n_written
+
+
+def write_db_json(path, products, customers, categories, indent=2, chunk_size=100_000):
+    """db.json dosyasını sütun bazlı ve parça parça yazma
+    
+    Ürünler satır satır dolaşılmaz: her parça pandas'ın C tabanlı JSON
+    kodlayıcısıyla (NaN -> null) tek seferde serileştirilir ve dosyaya
+    eklenir. Bellekte aynı anda yalnızca bir parçanın metni tutulur.
+    
+    Args:
+        path: Çıktı dosyası
+        products: Satış DataFrame'i veya DataFrame parçalarından oluşan iterable
+        customers: Müşteri sözlükleri listesi
+        categories: Kategori sözlükleri listesi
+        indent: Girinti boşluğu (None ise kompakt, girintisiz çıktı)
+        chunk_size: Tek DataFrame verildiğinde parça başına satır sayısı
+    """
+    if isinstance(products, pd.DataFrame):
+        frame = products
+        products = (frame.iloc[i:i + chunk_size] for i in range(0, len(frame), chunk_size))
+    
+    newline = '\n' if indent else ''
+    pad = ' ' * indent if indent else ''
+    separators = None if indent else (',', ':')
+    
+    def dump_nested(obj):
+        # Üst düzey nesnenin içinde bir seviye girintili JSON
+        return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators).replace('\n', '\n' + pad)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{' + newline + pad + '"products":' + (' ' if indent else '') + '[')
+        first = True
+        for chunk in products:
+            if chunk.empty:
+                continue
+            records = chunk.to_json(orient='records', force_ascii=False, indent=indent or 0)[1:-1]
+            if indent:
+                records = records.rstrip('\n').replace('\n', '\n' + pad)
+            f.write(records if first else ',' + records)
+            first = False
+        f.write((newline + pad if not first else '') + '],' + newline)
+        f.write(pad + '"customers":' + (' ' if indent else '') + dump_nested(customers) + ',' + newline)
+        f.write(pad + '"categories":' + (' ' if indent else '') + dump_nested(categories) + newline + '}')
+
 
 class ECommerceAPI:
-    def __init__(self, use_local_api=False):
+    # Geçici hatalarda tekrar denenecek HTTP durum kodları
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, use_local_api=False, n_customers=20, n_rows=None, seed=None, compact_json=False,
+                 max_workers=8, retries=3, backoff=0.5, timeout=10, page_size=None,
+                 http_cache=None, http_cache_ttl=0, embedded_server=True):
         self.use_local_api = use_local_api
+        self.compact_json = compact_json  # db.json girintisiz yazılsın mı
         self.api_url = "http://localhost:3000/products"
         
+        # HTTP bağlantı havuzu ve tekrar deneme ayarları
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.page_size = page_size  # Verilirse /products sayfa sayfa çekilir
+        
+        # Koşullu GET önbelleği (DataCache); ttl içinde istek hiç gönderilmez
+        self.http_cache = http_cache
+        self.http_cache_ttl = http_cache_ttl
+        self._session = None
+        self.server = None  # Süreç içi LocalAPIServer (embedded_server=True ise)
+        
+        # Örnek veri üretim parametreleri
+        self.n_customers = n_customers
+        self.n_rows = n_rows
+        self.seed = seed
+        
         # Eğer yerel API kullanılacaksa, JSON dosyasını oluştur ve sunucuyu başlat
         if self.use_local_api:
             self._create_json_data()
-            self._start_json_server()
+            if embedded_server:
+                self._start_local_server()
+            else:
+                self._start_json_server()
         else:
-            # Simüle edilmiş veri oluşturma
-            self.data, _ = self._generate_sample_data()
+            # Simüle edilmiş veri ilk fetch_data çağrısında oluşturulur
+            self.data = None
+    
+    @property
+    def session(self):
+        """Bağlantıları açık tutan (keep-alive) ve geçici hatalarda tekrar deneyen oturum"""
+        if self._session is None:
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=frozenset({'GET', 'PATCH'}),  # Fiyat PATCH'i idempotenttir
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+    
+    def close(self):
+        """HTTP oturumunu ve varsa süreç içi sunucuyu kapatma"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
     
     def _generate_sample_data(self):
         """Örnek veri oluşturma"""
-        # Kategori bazlı ürünler (her kategoride birden fazla ürün)
-        category_products = {
-            'Elektronik': ['Laptop', 'Akıllı Telefon', 'Tablet', 'Kulaklık', 'Monitör', 'Klavye', 'Mouse', 'Kamera'],
-            'Giyim': ['T-shirt', 'Pantolon', 'Elbise', 'Gömlek', 'Ceket', 'Ayakkabı', 'Çanta', 'Şapka'],
-            'Kitap': ['Roman', 'Bilim Kurgu', 'Tarih', 'Biyografi', 'Kişisel Gelişim', 'Çocuk Kitabı', 'Dergi', 'Akademik'],
-            'Spor': ['Futbol Topu', 'Koşu Ayakkabısı', 'Fitness Ekipmanı', 'Bisiklet', 'Yüzme Gözlüğü', 'Tenis Raketi', 'Yoga Matı', 'Spor Çantası'],
-            'Ev & Yaşam': ['Mobilya', 'Mutfak Eşyası', 'Yatak Örtüsü', 'Aydınlatma', 'Dekorasyon', 'Halı', 'Perde', 'Ev Tekstili'],
-            'Kozmetik': ['Parfüm', 'Ruj', 'Fondöten', 'Şampuan', 'Krem', 'Güneş Kremi', 'Makyaj Seti', 'Saç Bakım Ürünü'],
-            'Oyuncak': ['Lego', 'Peluş Oyuncak', 'Puzzle', 'Oyun Konsolu', 'Kutu Oyunu', 'Bebek', 'Uzaktan Kumandalı Araba', 'Eğitici Oyuncak'],
-            'Bahçe': ['Bitki', 'Bahçe Mobilyası', 'Çim Biçme Makinesi', 'Sulama Sistemi', 'Tohum', 'Saksı', 'Bahçe Aletleri', 'Gübre'],
-            'Otomotiv': ['Araç Aksesuarı', 'Oto Parfümü', 'Lastik', 'Yağ', 'Araç Bakım Ürünü', 'Navigasyon Cihazı', 'Araç Şarj Cihazı', 'Koltuk Kılıfı'],
-            'Kırtasiye': ['Kalem', 'Defter', 'Dosya', 'Hesap Makinesi', 'Çanta', 'Takvim', 'Ajanda', 'Boya Seti']
-        }
-        
-        # Kategori bazlı fiyat aralıkları (daha gerçekçi)
-        category_price_ranges = {
-            'Elektronik': (500, 5000),
-            'Giyim': (50, 500),
-            'Kitap': (20, 150),
-            'Spor': (100, 2000),
-            'Ev & Yaşam': (100, 3000),
-            'Kozmetik': (30, 300),
-            'Oyuncak': (50, 500),
-            'Bahçe': (100, 2000),
-            'Otomotiv': (50, 1000),
-            'Kırtasiye': (5, 100)
-        }
-        
-        # Müşteri sayısı
-        n_customers = 20  # Müşteri sayısını artırdık
-        
-        # Toplam satış sayısı (her müşteri her kategoriden rastgele 2-4 ürün alsın)
-        n_sales = 0  # Başlangıçta 0, dinamik olarak hesaplanacak
-        
-        # Müşteri bilgileri
-        customers = []
-        for i in range(1, n_customers + 1):
-            customer = {
-                'id': i,
-                'name': f"Müşteri {i}",
-                'email': f"musteri{i}@example.com",
-                'age': random.randint(18, 75),
-                'gender': random.choice(['Erkek', 'Kadın', 'Belirtilmemiş']),
-                'address': f"Adres {i}"
-            }
-            customers.append(customer)
+        # Müşteri ve satış verileri aynı Generator'dan üretilir (seed ile tekrarlanabilir)
+        rng = np.random.default_rng(self.seed)
+        customers = generate_customers(self.n_customers, rng)
+        df = generate_sample_sales(self.n_customers, self.n_rows, rng)
+        return df, customers
+    
+    def cache_source(self, columns=None, since=None, category=None):
+        """Önbellek anahtarı için veri kaynağını tanımlayan sözlük
         
-        # Satış verileri
-        data = {
-            'id': [],
-            'customer_id': [],
-            'product_name': [],
-            'category': [],
-            'price': [],
-            'purchase_date': [],
-            'quantity': [],
-            'satisfaction_score': [],
-            'payment_method': [],
-            'shipping_cost': [],
-            'discount_applied': []
+        fetch_data'ya verilen filtreler ve sütun seçimi de anahtarın parçasıdır
+        (farklı sütun seçimleri ayrı girdilerde saklanır). Tohum değeri
+        verilmemiş örnek veri her çalıştırmada farklı olduğundan önbelleğe
+        alınamaz; bu durumda None döner.
+        """
+        query = query_params(columns, since, category)
+        columns = sorted(columns) if columns else None
+        if self.use_local_api:
+            return {'source': 'api', 'url': self.api_url, 'query': query, 'columns': columns}
+        if self.seed is None:
+            return None
+        # Tarihler bugüne göre üretildiği için gün de anahtarın parçası
+        return {
+            'source': 'generator',
+            'n_customers': self.n_customers,
+            'n_rows': self.n_rows,
+            'seed': self.seed,
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'query': query,
+            'columns': columns
         }
-        
-        # Ödeme yöntemleri
-        payment_methods = ['Kredi Kartı', 'Havale', 'Kapıda Ödeme', 'Mobil Ödeme', 'Kripto Para']
-        
-        # Veri oluşturma - her müşteri her kategoriden rastgele 2-4 ürün alsın
-        sale_id = 1
-        for customer in customers:
-            for category, products in category_products.items():
-                # Her kategoriden kaç ürün alacak
-                n_products_to_buy = random.randint(2, 4)
-                
-                # Rastgele ürünler seç
-                selected_products = random.sample(products, min(n_products_to_buy, len(products)))
-                
-                for product in selected_products:
-                    # ID
-                    data['id'].append(sale_id)
-                    
-                    # Müşteri ID
-                    data['customer_id'].append(customer['id'])
-                    
-                    # Ürün ve kategori
-                    data['category'].append(category)
-                    data['product_name'].append(product)
-                    
-                    # Fiyat (kategori bazlı)
-                    min_price, max_price = category_price_ranges[category]
-                    price = round(random.uniform(min_price, max_price), 2)
-                    data['price'].append(price)
-                    
-                    # Tarih
-                    date = (datetime.now() - pd.Timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d')
-                    data['purchase_date'].append(date)
-                    
-                    # Miktar
-                    data['quantity'].append(random.randint(1, 5))
-                    
-                    # Memnuniyet puanı
-                    data['satisfaction_score'].append(round(random.uniform(1, 5), 1))
-                    
-                    # Ek alanlar
-                    data['payment_method'].append(random.choice(payment_methods))
-                    data['shipping_cost'].append(round(random.uniform(0, 50), 2))
-                    data['discount_applied'].append(random.choice([True, False]))
-                    
-                    sale_id += 1
-        
-        # Toplam satış sayısını güncelle
-        n_sales = len(data['id'])
-        
-        # DataFrame oluşturma
-        df = pd.DataFrame(data)
-        
-        # Eksik veri ekleme (gerçekçi olması için)
-        # Satışların %5'inde eksik veri olsun
-        missing_indices = random.sample(range(n_sales), int(n_sales * 0.05))
-        
-        for idx in missing_indices:
-            # Rastgele bir alan seç ve eksik bırak (quantity hariç)
-            field = random.choice(['price', 'product_name', 'purchase_date', 'satisfaction_score'])
-            df.loc[idx, field] = None
-        
-        # Satisfaction score için daha fazla eksik veri oluştur (satışların %15'i)
-        satisfaction_missing_indices = random.sample(range(n_sales), int(n_sales * 0.15))
-        for idx in satisfaction_missing_indices:
-            df.loc[idx, 'satisfaction_score'] = None
-            
-        # Bazı ürünlerin fiyatlarını değişken yap (aynı ürün farklı fiyatlarda olabilir)
-        # Bu, fiyat analizini daha ilginç hale getirecek
-        for category, products in category_products.items():
-            for product in products:
-                # Bu ürünün satışlarını bul
-                product_indices = df[df['product_name'] == product].index.tolist()
-                
-                if len(product_indices) > 1:
-                    # Fiyat varyasyonu ekle (±%10)
-                    for idx in product_indices:
-                        if random.random() < 0.3:  # %30 olasılıkla fiyatı değiştir
-                            current_price = df.loc[idx, 'price']
-                            if pd.notna(current_price):
-                                variation = random.uniform(0.9, 1.1)  # %10 yukarı veya aşağı
-                                df.loc[idx, 'price'] = round(current_price * variation, 2)
-        
-        return df, customers
+    
+    def iter_sample_chunks(self, chunk_size=1_000_000, n_workers=1):
+        """Örnek veriyi self.data'ya yüklemeden parça parça üretme"""
+        n_rows = self.n_rows if self.n_rows is not None else self.n_customers * len(CATEGORY_PRODUCTS) * 3
+        return iter_sample_chunks(n_rows, chunk_size, self.n_customers, self.seed, n_workers)
     
     def _create_json_data(self):
         """Dinamik olarak oluşturulan veriyi JSON dosyasına kaydetme"""
         # Veriyi oluştur
         df, customers = self._generate_sample_data()
         
-        # NaN değerleri None olarak değiştir (JSON serileştirme için)
-        df = df.where(pd.notna(df), None)
-        
-        # DataFrame'i JSON formatına dönüştür
-        products_data = []
-        
-        for _, row in df.iterrows():
-            # NaN değerleri kontrol et
-            quantity = None if pd.isna(row['quantity']) else int(row['quantity'])
-            price = None if pd.isna(row['price']) else float(row['price'])
-            satisfaction_score = None if pd.isna(row['satisfaction_score']) else float(row['satisfaction_score'])
-            
-            product = {
-                'id': int(row['id']),
-                'customer_id': int(row['customer_id']),
-                'product_name': row['product_name'],
-                'category': row['category'],
-                'price': price,
-                'purchase_date': row['purchase_date'],
-                'quantity': quantity,
-                'satisfaction_score': satisfaction_score,
-                'payment_method': row['payment_method'],
-                'shipping_cost': float(row['shipping_cost']),
-                'discount_applied': bool(row['discount_applied'])
-            }
-            products_data.append(product)
-        
-        # Kategori verisi oluştur
-        categories_data = [
-            {'id': 1, 'name': 'Elektronik', 'description': 'Elektronik ürünler ve aksesuarlar'},
-            {'id': 2, 'name': 'Giyim', 'description': 'Kıyafet ve moda ürünleri'},
-            {'id': 3, 'name': 'Kitap', 'description': 'Kitaplar ve dergiler'},
-            {'id': 4, 'name': 'Spor', 'description': 'Spor ekipmanları ve giyim'},
-            {'id': 5, 'name': 'Ev & Yaşam', 'description': 'Ev dekorasyon ve mobilya ürünleri'},
-            {'id': 6, 'name': 'Kozmetik', 'description': 'Kozmetik ve kişisel bakım ürünleri'},
-            {'id': 7, 'name': 'Oyuncak', 'description': 'Çocuk oyuncakları ve oyunları'},
-            {'id': 8, 'name': 'Bahçe', 'description': 'Bahçe ekipmanları ve bitkileri'},
-            {'id': 9, 'name': 'Otomotiv', 'description': 'Araç aksesuarları ve bakım ürünleri'},
-            {'id': 10, 'name': 'Kırtasiye', 'description': 'Ofis ve okul malzemeleri'}
-        ]
-        
-        # JSON dosyasını oluştur
-        json_data = {
-            'products': products_data,
-            'customers': customers,
-            'categories': categories_data
-        }
-        
-        # JSON dosyasına kaydet
-        with open('db.json', 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        # JSON dosyasına sütun bazlı, parça parça kaydet
+        write_db_json('db.json', df, customers, CATEGORIES, indent=None if self.compact_json else 2)
+        # Eski veriye ait değişiklik günlüğü yeni db.json'a uygulanmamalı
+        if os.path.exists('db.log.jsonl'):
+            os.remove('db.log.jsonl')
         
         print("JSON veri dosyası oluşturuldu: db.json")
         
         # Veriyi DataFrame olarak sakla
         self.data = df
     
+    def _start_local_server(self):
+        """db.json'u süreç içi LocalAPIServer ile sunma (port doluysa mevcut sunucu kullanılır)"""
+        try:
+            self.server = LocalAPIServer(LocalStore.open('db.json'), port=3000).start()
+        except OSError as e:
+            print(f"Yerel API sunucusu başlatılamadı ({e}); 3000 portundaki mevcut sunucu kullanılacak.")
+            return
+        print(f"Yerel API sunucusu başlatıldı: {self.server.url}")
+    
     def _start_json_server(self):
         """JSON Server'ı başlatma"""
         try:
@@ -274,54 +530,243 @@ class ECommerceAPI:
             print(f"JSON Server başlatılırken hata oluştu: {e}")
             print("Lütfen manuel olarak şu komutu çalıştırın: npx json-server --watch db.json --port 3000")
     
-    def fetch_data(self):
-        """Veriyi API'den çekme"""
+    def fetch_data(self, columns=None, since=None, category=None):
+        """Veriyi API'den çekme
+        
+        Tarih ve kategori filtreleri sunucuya sorgu parametresi olarak gönderilir
+        (purchase_date_gte, category); istenmeyen sütunlar yanıt çözülür çözülmez
+        atılır. Yerel API'de istekler self.timeout ile sınırlıdır ve geçici hatalar
+        oturumun tekrar deneme politikasıyla yeniden denenir; kalıcı hatalarda
+        requests istisnası yükseltilir (örnek veriye geri dönülmez).
+        
+        Args:
+            columns: İstenen sütunlar (varsayılan: tümü)
+            since: Bu tarihten (dahil) sonraki satışlar; tarih veya bugünden geriye gün sayısı
+            category: Kategori adı veya adları
+        """
         if self.use_local_api:
-            try:
-                # API'den veri çekme
-                print("API'den veri çekiliyor...")
-                print(self.api_url)
-                response = requests.get(self.api_url)
-                if response.status_code == 200:
-                    data = response.json()
-                    return pd.DataFrame(data)
-                else:
-                    print(f"API'den veri çekilemedi. Hata kodu: {response.status_code}")
-                    print("Simüle edilmiş veri kullanılıyor...")
-                    return self._generate_sample_data()[0]  # Sadece DataFrame'i döndür
-            except Exception as e:
-                print(f"API bağlantısında hata: {e}")
-                print("Simüle edilmiş veri kullanılıyor...")
-                return self._generate_sample_data()[0]  # Sadece DataFrame'i döndür
+            # API'den veri çekme
+            print("API'den veri çekiliyor...")
+            print(self.api_url)
+            if self.page_size:
+                chunks = list(self.iter_pages(self.page_size, columns, since, category))
+                return pd.concat(chunks, ignore_index=True) if chunks else sales_frame([], columns)
+            return self._get_frame(query_params(columns, since, category), columns)[0]
         else:
             # Simüle edilmiş veriyi kullan
-            return self.data
+            if self.data is None:
+                self.data, _ = self._generate_sample_data()
+            if columns is None and since is None and category is None:
+                return self.data
+            # Sunucudaki filtrelerin aynısı yerel veriye uygulanır
+            params = query_params(since=since, category=category)
+            mask = np.ones(len(self.data), dtype=bool)
+            for name, value in params:
+                if name == 'purchase_date_gte':
+                    mask &= (self.data['purchase_date'] >= value).to_numpy()
+            if category is not None:
+                mask &= self.data['category'].isin([value for name, value in params if name == 'category']).to_numpy()
+            return self.data.loc[mask, columns if columns is not None else self.data.columns]
+    
+    def iter_pages(self, page_size=10_000, columns=None, since=None, category=None):
+        """/products koleksiyonunu sayfa sayfa, tipli DataFrame parçaları olarak çekme
+        
+        İlk sayfadaki X-Total-Count başlığından sayfa sayısı bulunur; kalan
+        sayfalar ortak oturum üzerinden max_workers eşzamanlı istekle çekilir.
+        Bellekte aynı anda en fazla 2 * max_workers sayfa bekler, sıra korunur.
+        Başlık yoksa sayfalar kısa (veya boş) sayfa gelene kadar sırayla çekilir.
+        Filtreler fetch_data'daki gibidir.
+        
+        Yields:
+            chunk: Sıradaki sayfanın satışları (DataFrame)
+        """
+        params = query_params(columns, since, category)
+        chunk, total = self._fetch_page(1, page_size, params, columns)
+        yield chunk
+        
+        if total is None:
+            page = 1
+            while len(chunk) == page_size:
+                page += 1
+                chunk, _ = self._fetch_page(page, page_size, params, columns)
+                if len(chunk):
+                    yield chunk
+            return
+        
+        n_pages = -(-total // page_size)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            next_page = 2
+            while next_page <= n_pages or pending:
+                while next_page <= n_pages and len(pending) < 2 * self.max_workers:
+                    pending.append(executor.submit(self._fetch_page, next_page, page_size, params, columns))
+                    next_page += 1
+                yield pending.popleft().result()[0]
+    
+    def _fetch_page(self, page, page_size, params=(), columns=None):
+        """Tek sayfa isteği (json-server _page/_limit)
+        
+        Returns:
+            chunk, total: Sayfanın DataFrame'i ve toplam kayıt sayısı (başlık yoksa None)
+        """
+        return self._get_frame(list(params) + [('_page', page), ('_limit', page_size)], columns)
+    
+    def _get_frame(self, params, columns=None):
+        """/products isteğini tipli DataFrame'e dönüştürme (varsa HTTP önbelleğiyle)
+        
+        http_cache verilmişse yanıt, ETag / Last-Modified değerleriyle birlikte
+        tipli DataFrame olarak saklanır. http_cache_ttl süresi içindeki
+        tekrarlarda istek gönderilmez; sonrasında koşullu istek (If-None-Match,
+        If-Modified-Since) gönderilir ve 304 yanıtında saklanan DataFrame
+        kullanılır.
+        
+        Returns:
+            df, total: DataFrame ve X-Total-Count değeri (başlık yoksa None)
+        """
+        headers = {}
+        key = entry = None
+        if self.http_cache is not None:
+            key = 'http-' + DataCache.source_key({'url': self.api_url, 'params': params, 'columns': columns})
+            entry = self.http_cache.entry(key)
+            if entry is not None:
+                meta = entry['meta']
+                # Yaş okunan kayıttan hesaplanır; arada başka bir iş parçacığı kaydı silmiş olabilir
+                if time.time() - entry['created'] <= self.http_cache_ttl:
+                    cached = self.http_cache.get(key)
+                    if cached is not None:
+                        return cached, meta.get('total')
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+        
+        response = self.session.get(self.api_url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            cached = self.http_cache.get(key)
+            if cached is not None:
+                self.http_cache.renew(key)
+                return cached, entry['meta'].get('total')
+            # Saklanan dosya bu arada silinmişse koşulsuz tekrar iste
+            response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        
+        total = response.headers.get('X-Total-Count')
+        total = int(total) if total is not None else None
+        df = sales_frame(response.json(), columns)
+        if self.http_cache is not None:
+            self.http_cache.put(key, df, etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'), total=total)
+        return df, total
     
     def update_price(self, product_name, new_price):
         """Ürün fiyatını güncelleme"""
-        if self.use_local_api:
-            try:
-                # Önce ürünü bul
-                response = requests.get(f"{self.api_url}?product_name={product_name}")
-                if response.status_code == 200:
-                    products = response.json()
-                    if products:
-                        for product in products:
-                            # Ürün fiyatını güncelle
-                            product_id = product['id']
-                            update_data = {'price': new_price}
-                            update_response = requests.patch(f"{self.api_url}/{product_id}", json=update_data)
-                            
-                            if update_response.status_code == 200:
-                                print(f"{product_name} ürününün fiyatı {new_price} olarak güncellendi.")
-                            else:
-                                print(f"Ürün fiyatı güncellenemedi. Hata kodu: {update_response.status_code}")
-                    else:
-                        print(f"{product_name} adlı ürün bulunamadı.")
-                else:
-                    print(f"API'den veri çekilemedi. Hata kodu: {response.status_code}")
-            except Exception as e:
-                print(f"API bağlantısında hata: {e}")
+        summary = self.update_prices({product_name: new_price}).iloc[0]
+        if summary['status'] == 'ok':
+            print(f"{product_name} ürününün fiyatı {new_price} olarak güncellendi.")
+        elif summary['status'] == 'not_found':
+            print(f"{product_name} adlı ürün bulunamadı.")
         else:
-            # Simüle edilmiş veride güncelleme
-            self.data.loc[self.data['product_name'] == product_name, 'price'] = new_price 
\ No newline at end of file
+            print(f"Ürün fiyatı güncellenemedi: {summary['error']}")
+    
+    def update_prices(self, updates, lookup_batch_size=100, patch_batch_size=1000):
+        """Birden fazla ürünün fiyatını toplu güncelleme
+        
+        Yerel API'de ürün ID'leri, ürün adlarıyla toplu GET isteklerinde
+        (product_name=a&product_name=b...) bir kez çözülür; PATCH istekleri
+        ortak oturum üzerinden en fazla max_workers eşzamanlı iş parçacığıyla
+        gönderilir. Süreç içi sunucuda satırlar patch_batch_size'lık toplu
+        PATCH isteklerinde gönderilir. Geçici hatalar (RETRY_STATUSES, bağlantı
+        hataları) üstel beklemeyle tekrar denenir.
+        
+        Args:
+            updates: {ürün adı: yeni fiyat} sözlüğü veya product_name/new_price
+                sütunlu DataFrame (dynamic_pricing çıktısı)
+            lookup_batch_size: ID çözümlemede bir GET isteğindeki ürün adı sayısı
+            patch_batch_size: Toplu PATCH isteği başına satır sayısı (süreç içi sunucu)
+            
+        Returns:
+            summary: product_name, new_price, n_rows, n_updated, status, error
+                sütunlu DataFrame (status: 'ok', 'not_found', 'partial', 'failed')
+        """
+        if isinstance(updates, pd.DataFrame):
+            updates = dict(zip(updates['product_name'], updates['new_price']))
+        
+        if not self.use_local_api:
+            # Simüle edilmiş veride tek maskeyle güncelleme
+            self.fetch_data()
+            products = self.data['product_name']
+            mask = products.isin(updates.keys())
+            self.data.loc[mask, 'price'] = products[mask].map(updates)
+            counts = products[mask].value_counts()
+            return self._update_summary(updates, counts, counts, {})
+        
+        ids, errors = self._resolve_product_ids(list(updates), lookup_batch_size)
+        tasks = [(name, product_id) for name, product_ids in ids.items() for product_id in product_ids]
+        # Süreç içi sunucu toplu PATCH destekler; json-server'a satır başına bir istek gider
+        batch_size = patch_batch_size if self.server is not None else 1
+        batches = [tasks[start:start + batch_size] for start in range(0, len(tasks), batch_size)]
+        
+        def patch(batch):
+            try:
+                if batch_size == 1:
+                    name, product_id = batch[0]
+                    response = self.session.patch(f"{self.api_url}/{product_id}", json={'price': updates[name]},
+                                                  timeout=self.timeout)
+                    return [(name, response.ok, None if response.ok else f"HTTP {response.status_code}")]
+                body = [{'id': product_id, 'price': updates[name]} for name, product_id in batch]
+                response = self.session.patch(self.api_url, json=body, timeout=self.timeout)
+                response.raise_for_status()
+                updated_ids = set(response.json()['updated'])
+                return [(name, product_id in updated_ids, None) for name, product_id in batch]
+            except requests.RequestException as e:
+                return [(name, False, str(e)) for name, _ in batch]
+        
+        updated = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for results in executor.map(patch, batches):
+                for name, ok, error in results:
+                    updated[name] = updated.get(name, 0) + ok
+                    if error is not None:
+                        errors.setdefault(name, error)
+        
+        matched = {name: len(product_ids) for name, product_ids in ids.items()}
+        return self._update_summary(updates, matched, updated, errors)
+    
+    def _resolve_product_ids(self, names, batch_size):
+        """Ürün adlarını API'deki satır ID'lerine çözümleme (toplu GET)
+        
+        Returns:
+            ids: {ürün adı: [id, ...]}, errors: {ürün adı: hata mesajı}
+        """
+        ids, errors = {}, {}
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            try:
+                response = self.session.get(self.api_url, params=[('product_name', name) for name in batch],
+                                            timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                errors.update({name: f"ID çözümlenemedi: {e}" for name in batch})
+                continue
+            for product in response.json():
+                ids.setdefault(product['product_name'], []).append(product['id'])
+        return ids, errors
+    
+    @staticmethod
+    def _update_summary(updates, matched, updated, errors):
+        """Ürün bazlı güncelleme özeti"""
+        summary = pd.DataFrame({
+            'product_name': list(updates),
+            'new_price': list(updates.values())
+        })
+        summary['n_rows'] = summary['product_name'].map(matched).fillna(0).astype(int)
+        summary['n_updated'] = summary['product_name'].map(updated).fillna(0).astype(int)
+        summary['error'] = summary['product_name'].map(errors)
+        summary['status'] = np.select(
+            [summary['error'].notna() & (summary['n_updated'] == 0),
+             summary['n_rows'] == 0,
+             summary['n_updated'] < summary['n_rows']],
+            ['failed', 'not_found', 'partial'],
+            default='ok'
+        )
+        return summary[['product_name', 'new_price', 'n_rows', 'n_updated', 'status', 'error']]
@@ -0,0 +1,215 @@
+import aiohttp
+import asyncio
+import pandas as pd
+import re
+import time
+from api_client import ECommerceAPI, query_params, sales_frame
+from collections import deque
+
+
+class AsyncECommerceAPI:
+    """Yerel API için asyncio tabanlı istemci
+
+    Tüm istekler tek bir aiohttp oturumunun bağlantı havuzunu paylaşır ve
+    eşzamanlı istek sayısı bir semaforla max_concurrency ile sınırlanır.
+    Koleksiyonlar (ürünler, müşteriler, kategoriler) asyncio.gather ile
+    paralel çekilebilir. Her isteğin semafor kuyruğunda beklediği süre ve son
+    denemenin (bekleme ve tekrar deneme aralıkları hariç) süresi ayrı kaydedilir;
+    uzun ömürlü istemcilerde yalnızca son max_latencies kayıt tutulur.
+
+    Kullanım:
+        async with AsyncECommerceAPI() as api:
+            data = await api.fetch_all()
+            print(api.latency_report())
+    """
+
+    def __init__(self, base_url="http://localhost:3000", max_concurrency=8, timeout=10, retries=3, backoff=0.5,
+                 max_latencies=10_000):
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # Son max_latencies istek için method, path, status, attempts, queue_seconds, seconds
+        self.latencies = deque(maxlen=max_latencies)
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Bağlantı havuzunu ve semaforu oluşturma"""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Oturumu kapatma"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, path, **kwargs):
+        """Tek istek: semaforla sınırlı, geçici hatalarda üstel beklemeyle tekrar denenir
+
+        Returns:
+            body, headers: Çözümlenmiş JSON gövdesi ve yanıt başlıkları
+
+        Raises:
+            aiohttp.ClientError: Tekrar denemeler tükenirse
+        """
+        await self.open()
+        url = f"{self.base_url}{path}"
+        queued = time.perf_counter()
+        status = None
+        async with self._semaphore:
+            queue_seconds = time.perf_counter() - queued
+            for attempt in range(self.retries + 1):
+                # Gecikme her denemenin başından ölçülür (kuyruk ve bekleme aralıkları hariç)
+                start = time.perf_counter()
+                try:
+                    async with self._session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        if status in ECommerceAPI.RETRY_STATUSES and attempt < self.retries:
+                            await asyncio.sleep(self.backoff * 2 ** attempt)
+                            continue
+                        response.raise_for_status()
+                        body = await response.json()
+                        headers = response.headers
+                        break
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        self._record(method, path, status, attempt + 1, queue_seconds, start)
+                        raise
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+                except aiohttp.ClientResponseError:
+                    self._record(method, path, status, attempt + 1, queue_seconds, start)
+                    raise
+        self._record(method, path, status, attempt + 1, queue_seconds, start)
+        return body, headers
+
+    def _record(self, method, path, status, attempts, queue_seconds, start):
+        self.latencies.append({
+            'method': method,
+            'path': re.sub(r'/\d+$', '/{id}', path),
+            'status': status,
+            'attempts': attempts,
+            'queue_seconds': queue_seconds,
+            'seconds': time.perf_counter() - start
+        })
+
+    async def fetch_data(self, page_size=None, columns=None, since=None, category=None):
+        """Satış verisini (/products) çekme; page_size verilirse sayfalar paralel çekilir
+
+        Filtreler ECommerceAPI.fetch_data'daki gibi sunucuya gönderilir, sütunlar
+        yanıt çözülür çözülmez seçilir.
+        """
+        params = query_params(columns, since, category)
+        if not page_size:
+            records, _ = await self._request('GET', '/products', params=params)
+            return sales_frame(records, columns)
+
+        records, headers = await self._request('GET', '/products', params=params + [('_page', 1), ('_limit', page_size)])
+        total = headers.get('X-Total-Count')
+        pages = [sales_frame(records, columns)]
+        if total is not None:
+            n_pages = -(-int(total) // page_size)
+            results = await asyncio.gather(*[
+                self._request('GET', '/products', params=params + [('_page', page), ('_limit', page_size)])
+                for page in range(2, n_pages + 1)
+            ])
+            pages.extend(sales_frame(records, columns) for records, _ in results)
+        return pd.concat(pages, ignore_index=True)
+
+    async def fetch_customers(self):
+        """Müşteri verisini (/customers) çekme"""
+        records, _ = await self._request('GET', '/customers')
+        return pd.DataFrame.from_records(records)
+
+    async def fetch_categories(self):
+        """Kategori verisini (/categories) çekme"""
+        records, _ = await self._request('GET', '/categories')
+        return pd.DataFrame.from_records(records)
+
+    async def fetch_all(self, page_size=None):
+        """Ürün, müşteri ve kategori koleksiyonlarını paralel çekme
+
+        Returns:
+            data: {'products', 'customers', 'categories'} anahtarlı DataFrame sözlüğü
+        """
+        products, customers, categories = await asyncio.gather(
+            self.fetch_data(page_size), self.fetch_customers(), self.fetch_categories()
+        )
+        return {'products': products, 'customers': customers, 'categories': categories}
+
+    async def update_price(self, product_name, new_price):
+        """Tek ürünün fiyatını güncelleme (ürün bazlı özet satırı döndürür)"""
+        summary = await self.update_prices({product_name: new_price})
+        return summary.iloc[0]
+
+    async def update_prices(self, updates, lookup_batch_size=100):
+        """Birden fazla ürünün fiyatını toplu güncelleme (ECommerceAPI.update_prices ile aynı özet)
+
+        Args:
+            updates: {ürün adı: yeni fiyat} sözlüğü veya product_name/new_price sütunlu DataFrame
+            lookup_batch_size: ID çözümlemede bir GET isteğindeki ürün adı sayısı
+        """
+        if isinstance(updates, pd.DataFrame):
+            updates = dict(zip(updates['product_name'], updates['new_price']))
+        names = list(updates)
+        ids, errors = {}, {}
+
+        async def lookup(batch):
+            try:
+                records, _ = await self._request('GET', '/products', params=[('product_name', n) for n in batch])
+            except aiohttp.ClientError as e:
+                errors.update({name: f"ID çözümlenemedi: {e}" for name in batch})
+                return
+            for product in records:
+                ids.setdefault(product['product_name'], []).append(product['id'])
+
+        await asyncio.gather(*[lookup(names[start:start + lookup_batch_size])
+                               for start in range(0, len(names), lookup_batch_size)])
+
+        async def patch(name, product_id):
+            try:
+                await self._request('PATCH', f"/products/{product_id}", json={'price': float(updates[name])})
+                return name, True, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return name, False, str(e) or type(e).__name__
+
+        results = await asyncio.gather(*[patch(name, product_id)
+                                         for name, product_ids in ids.items() for product_id in product_ids])
+        updated = {}
+        for name, ok, error in results:
+            updated[name] = updated.get(name, 0) + ok
+            if error is not None:
+                errors.setdefault(name, error)
+
+        matched = {name: len(product_ids) for name, product_ids in ids.items()}
+        return ECommerceAPI._update_summary(updates, matched, updated, errors)
+
+    def latency_report(self):
+        """Uç nokta bazlı gecikme özeti (ms): istek sayısı, ortalama, p50, p95, en yüksek, ortalama kuyruk süresi"""
+        if not self.latencies:
+            return pd.DataFrame(columns=['requests', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'queue_mean_ms'])
+        latencies = pd.DataFrame(list(self.latencies))
+        latencies['ms'] = latencies['seconds'] * 1000
+        latencies['queue_ms'] = latencies['queue_seconds'] * 1000
+        grouped = latencies.groupby(['method', 'path'])
+        return pd.DataFrame({
+            'requests': grouped.size(),
+            'mean_ms': grouped['ms'].mean(),
+            'p50_ms': grouped['ms'].median(),
+            'p95_ms': grouped['ms'].quantile(0.95),
+            'max_ms': grouped['ms'].max(),
+            'queue_mean_ms': grouped['queue_ms'].mean()
+        })
@@ -0,0 +1,534 @@
+from api_client import CATEGORIES, generate_customers, generate_sample_sales, write_db_json, write_sample_dataset
+from data_processor import DataProcessor
+from imputation import DEFAULT_IMPUTATION_CONFIG, ImputationEngine
+from recommender import ApproximateItemIndex, ItemSimilarityIndex
+from local_server import LocalAPIServer, LocalStore
+from sales_store import SalesStore
+from sketches import StreamingTopProducts
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from scipy import sparse
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import argparse
+import contextlib
+import io
+import json
+import os
+import requests
+import resource
+import time
+
+
+def legacy_handle_missing_data(df):
+    """Eski satır bazlı eksik veri doldurma (karşılaştırma için referans)"""
+    df = df.copy()
+    
+    # 1. Çok fazla eksik değere sahip satırları kaldırma (örn. %50'den fazla eksik)
+    threshold = len(df.columns) * 0.5
+    df = df.dropna(thresh=threshold)
+    
+    # 2. Kritik alanlardaki eksik değerleri işleme
+    
+    # Ürün adı eksik olanları doldurma (kategori bilgisine göre)
+    if df['product_name'].isnull().any():
+        # Kategori bazında en sık görülen ürünleri bulalım
+        category_product_map = {}
+        for category in df['category'].dropna().unique():
+            # Kategorideki en sık görülen ürünü bul
+            most_common_product = df[df['category'] == category]['product_name'].mode()[0]
+            category_product_map[category] = most_common_product
+        print("Kategori bazında en sık görülen ürünler:")
+        print(category_product_map)
+        # Eksik ürün adlarını doldurma
+        for idx in df[df['product_name'].isnull()].index:
+            category = df.loc[idx, 'category']
+            if pd.notna(category) and category in category_product_map:
+                df.loc[idx, 'product_name'] = category_product_map[category]
+            else:
+                # Eğer kategori de eksikse, genel olarak en sık görülen ürünü kullan
+                df.loc[idx, 'product_name'] = df['product_name'].mode()[0]
+    
+    # Kategori eksik olanları doldurma (ürün adına göre)
+    if df['category'].isnull().any():
+        # Ürün bazında en sık görülen kategorileri bulalım
+        product_category_map = {}
+        for product in df['product_name'].dropna().unique():
+            product_data = df[df['product_name'] == product]
+            if not product_data['category'].dropna().empty:
+                most_common_category = product_data['category'].mode()[0]
+                product_category_map[product] = most_common_category
+        
+        # Eksik kategorileri doldurma
+        for idx in df[df['category'].isnull()].index:
+            product = df.loc[idx, 'product_name']
+            if pd.notna(product) and product in product_category_map:
+                df.loc[idx, 'category'] = product_category_map[product]
+            else:
+                # Eğer ürün adı da eksikse, genel olarak en sık görülen kategoriyi kullan
+                df.loc[idx, 'category'] = df['category'].mode()[0]
+    
+    # Fiyat eksik olanları doldurma (ürün ve kategoriye göre)
+    if df['price'].isnull().any():
+        # Önce ürün bazında ortalama fiyatları hesaplayalım
+        product_price_map = df.groupby('product_name')['price'].mean().to_dict()
+        
+        # Sonra kategori bazında ortalama fiyatları hesaplayalım
+        category_price_map = df.groupby('category')['price'].mean().to_dict()
+        
+        # Eksik fiyatları doldurma
+        for idx in df[df['price'].isnull()].index:
+            product = df.loc[idx, 'product_name']
+            category = df.loc[idx, 'category']
+            
+            if pd.notna(product) and product in product_price_map:
+                # Ürün bazlı fiyat
+                df.loc[idx, 'price'] = product_price_map[product]
+            elif pd.notna(category) and category in category_price_map:
+                # Kategori bazlı fiyat
+                df.loc[idx, 'price'] = category_price_map[category]
+            else:
+                # Genel ortalama fiyat
+                df.loc[idx, 'price'] = df['price'].mean()
+    
+    # Miktar eksik olanları doldurma
+    if df['quantity'].isnull().any():
+        # Ürün bazında ortalama miktarları hesaplayalım
+        product_quantity_map = df.groupby('product_name')['quantity'].median().to_dict()
+        
+        # Eksik miktarları doldurma
+        for idx in df[df['quantity'].isnull()].index:
+            product = df.loc[idx, 'product_name']
+            
+            if pd.notna(product) and product in product_quantity_map:
+                # Ürün bazlı miktar
+                df.loc[idx, 'quantity'] = int(product_quantity_map[product])
+            else:
+                # Genel medyan miktar
+                df.loc[idx, 'quantity'] = int(df['quantity'].median())
+    
+    # Memnuniyet puanı eksik olanları doldurma
+    if df['satisfaction_score'].isnull().any():
+        # Ürün bazında ortalama puanları hesaplayalım
+        product_score_map = df.groupby('product_name')['satisfaction_score'].mean().to_dict()
+        
+        # Eksik puanları doldurma
+        for idx in df[df['satisfaction_score'].isnull()].index:
+            product = df.loc[idx, 'product_name']
+            
+            if pd.notna(product) and product in product_score_map:
+                # Ürün bazlı puan
+                df.loc[idx, 'satisfaction_score'] = product_score_map[product]
+            else:
+                # Genel ortalama puan
+                df.loc[idx, 'satisfaction_score'] = df['satisfaction_score'].mean()
+    
+    # Tarih eksik olanları doldurma
+    if df['purchase_date'].isnull().any():
+        # Eksik tarihleri son 3 ay içinde rastgele tarihlerle dolduralım
+        for idx in df[df['purchase_date'].isnull()].index:
+            random_days = np.random.randint(0, 90)  # Son 90 gün içinde
+            random_date = (datetime.now() - timedelta(days=random_days)).strftime('%Y-%m-%d')
+            df.loc[idx, 'purchase_date'] = random_date
+    return df
+
+
+def benchmark_generate(args):
+    """Sütun bazlı örnek veri üreticisinin hızını ölçme"""
+    print(f"{args.rows:,} satır, {args.customers:,} müşteri için veri üretiliyor...")
+    start = time.perf_counter()
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Üretilen satır sayısı: {len(df):,}")
+    print(f"Süre: {elapsed:.2f} sn")
+    print(f"Hız: {len(df) / elapsed:,.0f} satır/sn")
+    print(f"Bellek: {df.memory_usage(deep=True).sum() / 1024 ** 2:,.1f} MB")
+
+
+def benchmark_stream(args):
+    """Parçalı üretimi doğrudan diske yazarak ölçme"""
+    print(f"{args.rows:,} satır {args.chunk_size:,} satırlık parçalarla {args.output} dosyasına yazılıyor...")
+    start = time.perf_counter()
+    n_written = write_sample_dataset(
+        args.output, args.rows, chunk_size=args.chunk_size, n_customers=args.customers,
+        seed=args.seed, n_workers=args.workers
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Yazılan satır sayısı: {n_written:,}")
+    print(f"Süre: {elapsed:.2f} sn")
+    print(f"Hız: {n_written / elapsed:,.0f} satır/sn")
+    print(f"Dosya boyutu: {os.path.getsize(args.output) / 1024 ** 2:,.1f} MB")
+    print(f"Tepe bellek (ana süreç): {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.1f} MB")
+
+
+def benchmark_db_json(args):
+    """db.json yazma ve okuma sürelerini girintili/kompakt olarak ölçme"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    customers = generate_customers(args.customers, args.seed)
+
+    for label, indent in [('Girintili', 2), ('Kompakt', None)]:
+        start = time.perf_counter()
+        write_db_json(args.output, df, customers, CATEGORIES, indent=indent)
+        write_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(args.output, encoding='utf-8') as f:
+            json.load(f)
+        read_time = time.perf_counter() - start
+
+        print(f"{label}: yazma {write_time:.2f} sn ({len(df) / write_time:,.0f} satır/sn), "
+              f"okuma {read_time:.2f} sn, boyut {os.path.getsize(args.output) / 1024 ** 2:,.1f} MB")
+
+
+def benchmark_impute(args):
+    """Vektörel eksik veri doldurmayı eski satır bazlı yöntemle karşılaştırma"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    print(f"{len(df):,} satır, {int(df.isnull().sum().sum()):,} eksik değer")
+
+    processor = DataProcessor.__new__(DataProcessor)
+    processor.imputer = ImputationEngine()
+    start = time.perf_counter()
+    cleaned = processor._handle_missing_data(df.copy(), fit=True)
+    vectorized_time = time.perf_counter() - start
+    print(f"Vektörel: {vectorized_time:.3f} sn ({len(df) / vectorized_time:,.0f} satır/sn)")
+
+    if args.skip_legacy:
+        return
+    start = time.perf_counter()
+    legacy = legacy_handle_missing_data(df)
+    legacy_time = time.perf_counter() - start
+    print(f"Satır bazlı: {legacy_time:.3f} sn ({len(df) / legacy_time:,.0f} satır/sn)")
+    print(f"Hızlanma: {legacy_time / vectorized_time:,.1f}x")
+
+    # Rastgele doldurulan tarih dışındaki sütunlar aynı olmalı
+    columns = [c for c in df.columns if c != 'purchase_date']
+    same = cleaned[columns].equals(legacy[columns])
+    print(f"Sonuçlar aynı (purchase_date hariç): {'Evet' if same else 'Hayır'}")
+
+
+def benchmark_recommend(args):
+    """Tüm müşteriler için toplu öneri hızını süreç sayısına göre ölçme"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    index = ItemSimilarityIndex.from_frame(df.dropna(subset=['product_name', 'satisfaction_score']))
+    print(f"{len(index.customers):,} müşteri, {len(index.products):,} ürün")
+
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        index.recommend_all(n=5, n_workers=n_workers, block_size=args.block_size)
+        elapsed = time.perf_counter() - start
+        print(f"{n_workers} süreç: {elapsed:.2f} sn ({len(index.customers) / elapsed:,.0f} müşteri/sn)")
+
+
+def synthetic_interactions(n_customers, n_products, latent_dim, pool, per_customer, seed):
+    """Gizli ürün vektörlerine dayalı rastgele müşteri x ürün matrisi
+
+    Her müşteri bir çapa ürün seçer ve ürünlerini çapanın gizli uzaydaki en
+    yakın pool komşusu arasından alır; böylece ürün benzerlikleri gerçek bir
+    yakınlık yapısı taşır.
+    """
+    rng = np.random.default_rng(seed)
+    latent = rng.standard_normal((n_products, latent_dim)).astype(np.float32)
+    latent /= np.linalg.norm(latent, axis=1, keepdims=True)
+    nearest = np.empty((n_products, pool), dtype=np.int64)
+    for start in range(0, n_products, 2048):
+        scores = latent[start:start + 2048] @ latent.T
+        nearest[start:start + 2048] = np.argpartition(-scores, pool - 1, axis=1)[:, :pool]
+
+    anchors = rng.integers(0, n_products, size=n_customers)
+    cols = nearest[anchors[:, None], rng.integers(0, pool, size=(n_customers, per_customer))].ravel()
+    rows = np.repeat(np.arange(n_customers), per_customer)
+    values = rng.integers(1, 6, size=len(rows)).astype(float)
+    interactions = sparse.csr_matrix((values, (rows, cols)), shape=(n_customers, n_products))
+    interactions.sum_duplicates()
+    products = np.array([f"Ürün {i:07d}" for i in range(n_products)], dtype=object)
+    return np.arange(n_customers), products, interactions
+
+
+def benchmark_ann(args):
+    """Yaklaşık (IVF) benzerlik indeksinin kesin indekse göre hızı ve isabeti"""
+    customers, products, interactions = synthetic_interactions(
+        args.customers, args.products, args.latent_dim, args.pool, args.per_customer, args.seed
+    )
+    print(f"{len(customers):,} müşteri, {len(products):,} ürün, {interactions.nnz:,} etkileşim")
+
+    start = time.perf_counter()
+    exact = ItemSimilarityIndex.from_interactions(customers, products, interactions, top_k=args.k)
+    print(f"Kesin indeks: {time.perf_counter() - start:.2f} sn")
+
+    start = time.perf_counter()
+    ann = ApproximateItemIndex.from_interactions(products, interactions, n_components=args.components,
+                                                 n_lists=args.lists, seed=args.seed)
+    print(f"Yaklaşık indeks ({len(ann.centroids)} liste, {ann.embeddings.shape[1]} boyut): "
+          f"{time.perf_counter() - start:.2f} sn")
+
+    report = ann.recall_report(exact, k=args.k, n_probes=args.probes, reranks=args.reranks,
+                               sample=args.sample, seed=args.seed)
+    print(f"\nrecall@{args.k} ve sorgu süresi:")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+def benchmark_server(args):
+    """Süreç içi API sunucusunun istek/sn ölçümü (GET, filtreli sayfa, tekil ve toplu PATCH)"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    start = time.perf_counter()
+    store = LocalStore({'products': json.loads(df.to_json(orient='records')), 'customers': [], 'categories': []})
+    print(f"{len(df):,} kayıt, depo {time.perf_counter() - start:.2f} sn'de oluşturuldu")
+    server = LocalAPIServer(store, port=0).start()
+    url = f"{server.url}/products"
+
+    rng = np.random.default_rng(args.seed)
+    ids = rng.integers(1, len(df) + 1, size=args.requests)
+    workloads = {
+        'GET /products/<id>': lambda session, i: session.get(f"{url}/{ids[i]}"),
+        'GET ?category=&_page=': lambda session, i: session.get(url, params={
+            'category': CATEGORIES[i % len(CATEGORIES)]['name'], '_page': i % 20 + 1, '_limit': 50}),
+        'PATCH /products/<id>': lambda session, i: session.patch(f"{url}/{ids[i]}", json={'price': 100.0}),
+        f'PATCH /products ({args.batch} satır)': lambda session, i: session.patch(url, json=[
+            {'id': int(product_id), 'price': 100.0} for product_id in ids[i:i + args.batch]]),
+    }
+
+    def run(workload, worker, n_requests):
+        with requests.Session() as session:
+            for i in range(worker, n_requests, args.concurrency):
+                workload(session, i).raise_for_status()
+
+    try:
+        for name, workload in workloads.items():
+            n_requests = args.requests if 'satır' not in name else max(args.requests // args.batch, 1)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                list(executor.map(lambda worker: run(workload, worker, n_requests), range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+            print(f"{name}: {n_requests / elapsed:,.0f} istek/sn ({n_requests} istek, {args.concurrency} eşzamanlı)")
+    finally:
+        server.stop()
+
+
+def benchmark_store(args):
+    """İndeksli satış deposu sorgularını maske taramasıyla karşılaştırma"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    df['purchase_date'] = pd.to_datetime(df['purchase_date'])
+    start = time.perf_counter()
+    store = SalesStore(df)
+    print(f"{len(df):,} satır, indeksler {time.perf_counter() - start:.2f} sn'de oluşturuldu")
+
+    rng = np.random.default_rng(args.seed)
+    customers = rng.choice(store.keys('customer_id'), size=args.queries)
+    categories = store.keys('category')
+    last_date = store.date_range()[1]
+    workloads = {
+        'customer_id ==': (
+            lambda i: df[df['customer_id'] == customers[i]],
+            lambda i: store.query(customer_id=customers[i])),
+        'category == ve son 7 gün': (
+            lambda i: df[(df['category'] == categories[i % len(categories)]) & (df['purchase_date'] >= last_date - timedelta(days=7))],
+            lambda i: store.query(category=categories[i % len(categories)], start=last_date - timedelta(days=7))),
+    }
+    for name, (scan, indexed) in workloads.items():
+        timings = []
+        for query in (scan, indexed):
+            start = time.perf_counter()
+            for i in range(args.queries):
+                query(i)
+            timings.append((time.perf_counter() - start) / args.queries)
+        same = all(a.index.equals(b.index) for a, b in zip(map(scan, range(3)), map(indexed, range(3))))
+        print(f"{name}: tarama {timings[0] * 1000:.2f} ms, indeks {timings[1] * 1000:.3f} ms "
+              f"({timings[0] / timings[1]:,.0f}x, sonuçlar {'aynı' if same else 'FARKLI'})")
+
+
+def zipf_sales_batches(n_rows, n_products, batch_size, seed, skew=1.1):
+    """Uzun kuyruklu (Zipf) ürün dağılımından product_name/quantity partileri"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, n_products + 1) ** skew
+    names = np.array([f"Ürün {i}" for i in range(n_products)], dtype=object)
+    for offset in range(0, n_rows, batch_size):
+        size = min(batch_size, n_rows - offset)
+        products = rng.choice(n_products, size=size, p=weights / weights.sum())
+        yield pd.DataFrame({'product_name': names[products], 'quantity': rng.integers(1, 6, size=size)})
+
+
+def _topk_partition(n_rows, n_products, batch_size, seed, capacity):
+    """Bir işçi sürecinde bölümün özeti ve (doğrulama için) kesin toplamları"""
+    tracker = StreamingTopProducts(capacity=capacity)
+    exact = []
+    for batch in zipf_sales_batches(n_rows, n_products, batch_size, seed):
+        tracker.update(batch)
+        exact.append(batch.groupby('product_name')['quantity'].sum())
+    return tracker, pd.concat(exact).groupby(level=0).sum()
+
+
+def benchmark_topk(args):
+    """Akış halindeki top-K özetlerinin süreçler arası birleştirilmesi ve isabeti"""
+    per_worker = -(-args.rows // args.workers)
+    print(f"{args.rows:,} satır, {args.products:,} ürün, {args.workers} süreç, kapasite {args.capacity:,}")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        results = list(pool.map(
+            _topk_partition, [per_worker] * args.workers, [args.products] * args.workers,
+            [args.batch] * args.workers, [args.seed + i for i in range(args.workers)], [args.capacity] * args.workers))
+    elapsed = time.perf_counter() - start
+
+    tracker = results[0][0]
+    for other, _ in results[1:]:
+        tracker.merge(other)
+    exact = pd.concat([totals for _, totals in results]).groupby(level=0).sum().sort_values(ascending=False, kind='stable')
+    top = tracker.top(args.top)
+    top['exact'] = exact.reindex(top.index).to_numpy()
+
+    recall = len(top.index.intersection(exact.index[:args.top])) / args.top
+    within = ((top['lower'] <= top['exact']) & (top['exact'] <= top['estimate'])).mean()
+    print(f"Süre: {elapsed:.2f} sn ({tracker.n_rows / elapsed:,.0f} satır/sn)")
+    print(f"İlk {args.top} isabeti: {recall:.0%}, kesin olarak doğrulanan: {top['guaranteed'].sum()}, "
+          f"sınırlar içinde: {within:.0%}")
+    print(f"En büyük göreli hata: {((top['estimate'] - top['exact']) / top['exact']).max():.4%}")
+    print(f"Özet belleği: {tracker.nbytes / 1024:,.1f} KB "
+          f"(kesin sayaçlar: {exact.memory_usage(deep=True) / 1024:,.1f} KB)")
+    print(top.head(10).to_string())
+
+
+def benchmark_parallel(args):
+    """Bölümlenmiş ön işlemenin 1..N süreçte ölçeklenmesi ve tek süreçli yolla karşılaştırma"""
+    df = generate_sample_sales(n_customers=args.customers, n_rows=args.rows, seed=args.seed)
+    print(f"{len(df):,} satır, bölümleme: {args.partition_by}, {os.cpu_count()} CPU")
+    # Rastgele tarih doldurma yerine sabit tarih: temiz verinin tamamı karşılaştırılabilir
+    config = dict(DEFAULT_IMPUTATION_CONFIG, purchase_date={'strategy': 'constant', 'value': '2024-01-01'})
+
+    def results(processor):
+        return {
+            'En çok satanlar': processor.analyze_top_products(),
+            'Kategori fiyatları': processor.category_price_analysis(),
+            'Ödeme yöntemleri': processor.payment_method_analysis(),
+            'Müşteri harcamaları': processor.aggregates.customer_spending,
+            'Temiz veri': processor.df,
+        }
+
+    def same(table, expected):
+        # Toplamlar kayan nokta toplama sırası kadar farklı olabilir
+        if table.equals(expected):
+            return True
+        if not table.index.equals(expected.index):
+            return False
+        if table.ndim == 2:
+            table, expected = table.select_dtypes('number'), expected.select_dtypes('number')
+        return np.allclose(table, expected)
+
+    # Sıralı indeksin yanında karıştırılmış indeksle de özgün satır sırası korunmalı
+    for name, frame in (('sıralı indeks', df), ('karışık indeks', df.sample(frac=1, random_state=args.seed))):
+        print(f"\n{name}:")
+        baseline = None
+        for n_workers in range(1, args.workers + 1):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                processor = DataProcessor(frame, imputation_config=config, n_workers=n_workers,
+                                          partition_by=args.partition_by)
+                processor.aggregates
+                elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline, baseline_time = results(processor), elapsed
+                print(f"1 süreç: {elapsed:.2f} sn ({len(frame) / elapsed:,.0f} satır/sn)")
+                continue
+            different = [key for key, table in results(processor).items() if not same(table, baseline[key])]
+            print(f"{n_workers} süreç: {elapsed:.2f} sn ({baseline_time / elapsed:.2f}x), "
+                  f"sonuçlar {'aynı' if not different else 'FARKLI: ' + ', '.join(different)}")
+
+
+def main():
+    # Komut satırı argümanlarını ayarla
+    parser = argparse.ArgumentParser(description='E-Ticaret performans ölçümleri')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help='Örnek veri üretim hızı')
+    generate_parser.add_argument('--rows', type=int, default=1_000_000, help='Üretilecek satır sayısı')
+    generate_parser.add_argument('--customers', type=int, default=10_000, help='Müşteri sayısı')
+    generate_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    generate_parser.set_defaults(func=benchmark_generate)
+
+    stream_parser = subparsers.add_parser('stream', help='Parçalı üretim ve diske yazma')
+    stream_parser.add_argument('--rows', type=int, default=10_000_000, help='Üretilecek satır sayısı')
+    stream_parser.add_argument('--chunk-size', type=int, default=1_000_000, help='Parça başına satır sayısı')
+    stream_parser.add_argument('--customers', type=int, default=100_000, help='Müşteri sayısı')
+    stream_parser.add_argument('--workers', type=int, default=1, help='Paralel süreç sayısı')
+    stream_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    stream_parser.add_argument('--output', default='sales.csv', help='Çıktı dosyası (.csv veya .jsonl)')
+    stream_parser.set_defaults(func=benchmark_stream)
+
+    db_json_parser = subparsers.add_parser('db-json', help='db.json yazma/okuma hızı')
+    db_json_parser.add_argument('--rows', type=int, default=1_000_000, help='Ürün satırı sayısı')
+    db_json_parser.add_argument('--customers', type=int, default=10_000, help='Müşteri sayısı')
+    db_json_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    db_json_parser.add_argument('--output', default='db_benchmark.json', help='Çıktı dosyası')
+    db_json_parser.set_defaults(func=benchmark_db_json)
+
+    impute_parser = subparsers.add_parser('impute', help='Eksik veri doldurma hızı')
+    impute_parser.add_argument('--rows', type=int, default=100_000, help='Satır sayısı')
+    impute_parser.add_argument('--customers', type=int, default=5_000, help='Müşteri sayısı')
+    impute_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    impute_parser.add_argument('--skip-legacy', action='store_true', help='Satır bazlı yöntemi çalıştırma')
+    impute_parser.set_defaults(func=benchmark_impute)
+
+    recommend_parser = subparsers.add_parser('recommend', help='Toplu öneri hızı')
+    recommend_parser.add_argument('--rows', type=int, default=2_000_000, help='Satır sayısı')
+    recommend_parser.add_argument('--customers', type=int, default=200_000, help='Müşteri sayısı')
+    recommend_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    recommend_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Denenecek süreç sayıları')
+    recommend_parser.add_argument('--block-size', type=int, default=50_000, help='Blok başına müşteri sayısı')
+    recommend_parser.set_defaults(func=benchmark_recommend)
+
+    ann_parser = subparsers.add_parser('ann', help='Yaklaşık benzerlik indeksi hızı ve isabeti')
+    ann_parser.add_argument('--customers', type=int, default=200_000, help='Müşteri sayısı')
+    ann_parser.add_argument('--products', type=int, default=20_000, help='Ürün sayısı')
+    ann_parser.add_argument('--latent-dim', type=int, default=16, help='Sentetik verinin gizli boyutu')
+    ann_parser.add_argument('--pool', type=int, default=50, help='Müşterinin seçtiği çapa komşusu sayısı')
+    ann_parser.add_argument('--per-customer', type=int, default=10, help='Müşteri başına etkileşim sayısı')
+    ann_parser.add_argument('--components', type=int, default=64, help='Gömme boyutu')
+    ann_parser.add_argument('--lists', type=int, default=None, help='IVF liste sayısı')
+    ann_parser.add_argument('--probes', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='Denenecek n_probe değerleri')
+    ann_parser.add_argument('--reranks', type=int, nargs='+', default=[0, 10],
+                            help='Denenecek kesin yeniden sıralama çarpanları (0: kapalı)')
+    ann_parser.add_argument('--k', type=int, default=10, help='Komşu sayısı')
+    ann_parser.add_argument('--sample', type=int, default=1000, help='Sorgu örneği sayısı')
+    ann_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    ann_parser.set_defaults(func=benchmark_ann)
+
+    server_parser = subparsers.add_parser('server', help='Süreç içi API sunucusu istek/sn')
+    server_parser.add_argument('--rows', type=int, default=200_000, help='Ürün satırı sayısı')
+    server_parser.add_argument('--customers', type=int, default=10_000, help='Müşteri sayısı')
+    server_parser.add_argument('--requests', type=int, default=2000, help='İş yükü başına istek sayısı')
+    server_parser.add_argument('--concurrency', type=int, default=8, help='Eşzamanlı istemci sayısı')
+    server_parser.add_argument('--batch', type=int, default=100, help='Toplu PATCH başına satır sayısı')
+    server_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    server_parser.set_defaults(func=benchmark_server)
+
+    store_parser = subparsers.add_parser('store', help='İndeksli satış deposu sorgu hızı')
+    store_parser.add_argument('--rows', type=int, default=1_000_000, help='Satır sayısı')
+    store_parser.add_argument('--customers', type=int, default=100_000, help='Müşteri sayısı')
+    store_parser.add_argument('--queries', type=int, default=200, help='İş yükü başına sorgu sayısı')
+    store_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    store_parser.set_defaults(func=benchmark_store)
+
+    topk_parser = subparsers.add_parser('topk', help='Akış halindeki en çok satanlar özeti (süreçler arası birleştirme)')
+    topk_parser.add_argument('--rows', type=int, default=5_000_000, help='Satır sayısı')
+    topk_parser.add_argument('--products', type=int, default=200_000, help='Ürün sayısı')
+    topk_parser.add_argument('--workers', type=int, default=4, help='İşçi süreç sayısı')
+    topk_parser.add_argument('--batch', type=int, default=100_000, help='Parti başına satır sayısı')
+    topk_parser.add_argument('--capacity', type=int, default=1000, help='Space-Saving sayaç sayısı')
+    topk_parser.add_argument('--top', type=int, default=20, help='Kontrol edilen ilk N')
+    topk_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    topk_parser.set_defaults(func=benchmark_topk)
+
+    parallel_parser = subparsers.add_parser('parallel', help='Bölümlenmiş paralel ön işleme ölçeklenmesi')
+    parallel_parser.add_argument('--rows', type=int, default=1_000_000, help='Satır sayısı')
+    parallel_parser.add_argument('--customers', type=int, default=100_000, help='Müşteri sayısı')
+    parallel_parser.add_argument('--workers', type=int, default=os.cpu_count(), help='En fazla süreç sayısı')
+    parallel_parser.add_argument('--partition-by', choices=['customer_id', 'date'], default='customer_id',
+                                 help='Bölümleme: müşteri karması veya tarih aralıkları')
+    parallel_parser.add_argument('--seed', type=int, default=42, help='Tohum değeri')
+    parallel_parser.set_defaults(func=benchmark_parallel)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
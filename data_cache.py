@@ -0,0 +1,161 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+
+class DataCache:
+    """Ham ve temizlenmiş veriler için Feather tabanlı disk önbelleği
+
+    Çerçeveler sıkıştırmasız Feather (Arrow IPC) dosyaları olarak saklanır ve
+    bellek eşlemeli (memory-mapped) okunur. Toplam boyut max_bytes'ı aşarsa en
+    uzun süredir kullanılmayan kayıtlar silinir (LRU). Aynı nesne birden fazla
+    iş parçacığından kullanılabilir.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir='.cache', max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._index = self._load_index()
+
+    @staticmethod
+    def source_key(source):
+        """Kaynak parametrelerinden (URL, seed vb.) anahtar üretme"""
+        payload = json.dumps(source, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def content_hash(df):
+        """DataFrame içeriğinin (değerler, index, sütunlar ve tipler) özeti"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()[:32]
+
+    def get(self, key, max_age=None):
+        """Önbellekteki çerçeveyi okuma (yoksa veya süresi dolmuşsa None)"""
+        with self._lock:
+            entry = self.entry(key)
+            if entry is None:
+                return None
+            if max_age is not None and self.age(key) > max_age:
+                self.invalidate(key)
+                return None
+
+            table = feather.read_table(self._path(key), memory_map=True)
+            entry['last_access'] = time.time()
+            self._save_index()
+        return table.to_pandas()
+
+    def put(self, key, df, **meta):
+        """Çerçeveyi önbelleğe yazma ve gerekirse eski kayıtları silme"""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp-{threading.get_ident()}"
+        feather.write_feather(pa.Table.from_pandas(df), tmp_path, compression='uncompressed')
+
+        with self._lock:
+            os.replace(tmp_path, path)
+            now = time.time()
+            self._index[key] = {
+                'size': os.path.getsize(path),
+                'created': now,
+                'last_access': now,
+                'meta': meta
+            }
+            self._evict()
+            self._save_index()
+
+    def entry(self, key):
+        """Kaydın index bilgisi (size, created, last_access, meta); yoksa None"""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or not os.path.exists(self._path(key)):
+                return None
+            return entry
+
+    def age(self, key):
+        """Kaydın yazıldığı (veya son yenilendiği) andan bu yana geçen süre (sn); kayıt yoksa sonsuz"""
+        with self._lock:
+            entry = self._index.get(key)
+            return math.inf if entry is None else time.time() - entry['created']
+
+    def renew(self, key, **meta):
+        """Kaydı yeniden yazmadan taze kabul etme (örn. HTTP 304 sonrası)"""
+        with self._lock:
+            entry = self.entry(key)
+            if entry is not None:
+                entry['created'] = time.time()
+                entry['meta'].update(meta)
+                self._save_index()
+
+    def invalidate(self, key=None):
+        """Tek bir kaydı (veya key verilmezse tüm önbelleği) geçersiz kılma"""
+        with self._lock:
+            keys = list(self._index) if key is None else [key]
+            for k in keys:
+                self._index.pop(k, None)
+                if os.path.exists(self._path(k)):
+                    os.remove(self._path(k))
+            self._save_index()
+
+    def total_size(self):
+        """Önbellekteki dosyaların toplam boyutu (byte)"""
+        return sum(entry['size'] for entry in self._index.values())
+
+    # Kaynak ve içerik anahtarlı yardımcılar
+
+    def get_raw(self, source, max_age=None):
+        """Kaynağa göre ham fetch_data() çıktısını okuma"""
+        return self.get('raw-' + self.source_key(source), max_age=max_age)
+
+    def put_raw(self, source, df):
+        """Ham fetch_data() çıktısını kaynak anahtarıyla saklama"""
+        self.put('raw-' + self.source_key(source), df, source=source, content_hash=self.content_hash(df))
+
+    def get_clean(self, raw_df):
+        """Ham verinin içerik özetine göre temizlenmiş DataProcessor.df'i okuma"""
+        return self.get('clean-' + self.content_hash(raw_df))
+
+    def put_clean(self, raw_df, clean_df):
+        """Temizlenmiş veriyi ham verinin içerik özetiyle saklama"""
+        self.put('clean-' + self.content_hash(raw_df), clean_df)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def _evict(self):
+        """Boyut sınırı aşılırsa en uzun süredir kullanılmayan kayıtları silme"""
+        total = self.total_size()
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Bozuk index: önbelleği boş kabul et
+            return {}
+
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, path)
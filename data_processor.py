@@ -1,23 +1,312 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
 import matplotlib.pyplot as plt
 import seaborn as sns
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
+from imputation import ImputationEngine, ImputationStatistics
+from recommender import ItemSimilarityIndex
+from sales_store import SalesStore
+from schema import MissingnessBitmap, concat_frames, enforce_schema, memory_report, memory_usage
+from sketches import QuantileSketch, quantile_tiers
+from timeseries import SalesTimeSeries
+
+class _ChunkedFrame:
+    """Sonradan eklenen parçaları ilk erişimde tek seferde birleştiren DataFrame özniteliği"""
+    
+    def __set_name__(self, owner, name):
+        self.name = '_' + name + '_parts'
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        parts = obj.__dict__[self.name]
+        if len(parts) > 1:
+            parts[:] = [concat_frames(parts)]
+        return parts[0]
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = [value]
+
+
+def _plain_index(table):
+    """Kategorik grup anahtarlarını düz değerlere çevirme (küçük toplam tabloları için)"""
+    index = table.index
+    if isinstance(index, pd.MultiIndex):
+        table.index = pd.MultiIndex.from_arrays(
+            [index.get_level_values(i).astype(object) for i in range(index.nlevels)], names=index.names
+        )
+    elif isinstance(index, pd.CategoricalIndex):
+        table.index = index.astype(object)
+    return table
+
+
+# Küp ölçüleri ve birleştirme kuralları (min/max dışındakiler toplanır)
+CUBE_MEASURES = {
+    'quantity': 'sum', 'revenue': 'sum', 'count': 'sum', 'score_sum': 'sum', 'score_count': 'sum',
+    'price_sum': 'sum', 'price_min': 'min', 'price_max': 'max'
+}
+
+
+def add_revenue(df):
+    """Satır tutarı sütunu: kuruşa yuvarlanmış fiyat x miktar (df yerinde güncellenir)"""
+    df['revenue'] = df['price'].astype('float64').round(2) * df['quantity']
+    return df
+
+
+def sum_by(keys, values):
+    """Anahtar bazında toplam (groupby().sum() karşılığı, tamsayı kodlar üzerinde np.bincount)
+    
+    Args:
+        keys: Grup anahtarları (eksik anahtarlı satırlar atlanır)
+        values: Toplanacak değerler
+        
+    Returns:
+        totals: Artan anahtar sırasında toplamlar
+    """
+    codes, uniques = pd.factorize(keys, sort=True)
+    valid = codes >= 0
+    totals = np.bincount(codes[valid], weights=np.asarray(values, dtype=float)[valid], minlength=len(uniques))
+    index = pd.Index(np.asarray(uniques, dtype=object) if isinstance(uniques.dtype, pd.CategoricalDtype) else uniques,
+                     name=getattr(keys, 'name', None))
+    return pd.Series(totals, index=index, name=getattr(values, 'name', None))
+
+
+def _build_cube(keys, measures):
+    """Anahtar kombinasyonlarına göre ölçüleri tek sıralamayla indirgeme
+    
+    Her anahtarın kodları tek bir tamsayı anahtarda birleştirilir; satırlar bu
+    anahtara göre bir kez sıralanarak grup numaraları bulunur. Toplamlar
+    np.bincount ile, min/max değerleri sıralı dizide ufunc.reduceat ile alınır.
+    
+    Args:
+        keys: {seviye adı: Series} (eksik değerler ayrı bir grup olur)
+        measures: {ölçü adı: dizi}; indirgeme kuralı CUBE_MEASURES'tan
+    """
+    n_rows = len(next(iter(keys.values())))
+    combined = np.zeros(n_rows, dtype=np.int64)
+    levels = []
+    for values in keys.values():
+        codes, uniques = pd.factorize(values)
+        combined = combined * (len(uniques) + 1) + (codes + 1)  # 0: eksik değer
+        levels.append((codes, uniques))
+    
+    order = np.argsort(combined)
+    sorted_keys = combined[order]
+    boundary = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if n_rows else np.empty(0, dtype=bool)
+    starts = np.flatnonzero(boundary)
+    group = np.empty(n_rows, dtype=np.intp)
+    group[order] = np.cumsum(boundary) - 1
+    
+    columns = {}
+    for name, values in measures.items():
+        how = CUBE_MEASURES[name]
+        if how == 'sum':
+            total = np.bincount(group, weights=values, minlength=len(starts))
+            columns[name] = total.astype(values.dtype) if values.dtype.kind in 'iu' else total
+        else:
+            reducer = np.minimum if how == 'min' else np.maximum
+            columns[name] = reducer.reduceat(values[order], starts) if len(starts) else values[:0]
+    
+    # Grup anahtarları ilk satırlarının seviye kodlarından okunur (-1: eksik değer)
+    first_rows = order[starts]
+    index = pd.MultiIndex(
+        levels=[pd.Index(np.asarray(uniques, dtype=object)) if isinstance(uniques.dtype, pd.CategoricalDtype)
+                else pd.Index(uniques) for _, uniques in levels],
+        codes=[codes[first_rows] for codes, _ in levels],
+        names=list(keys),
+        verify_integrity=False
+    )
+    return pd.DataFrame(columns, index=index)
+
+
+def partition_rows(df, n, by='customer_id'):
+    """Satır konumlarını n bölüme ayırma
+    
+    'customer_id': müşteri kimliğinin karması (bir müşterinin tüm satışları aynı
+    bölümde kalır), 'date': satış tarihine göre eşit boyutlu ardışık aralıklar
+    (tarihi eksik satırlar son bölümde).
+    
+    Returns:
+        partitions: Her bölüm için artan sırada satır konumları
+    """
+    if by == 'customer_id':
+        buckets = pd.util.hash_pandas_object(df['customer_id'], index=False).to_numpy() % np.uint64(n)
+        return [np.flatnonzero(buckets == i) for i in range(n)]
+    if by == 'date':
+        dates = pd.to_datetime(df['purchase_date']).to_numpy('datetime64[ns]')
+        return [np.sort(part) for part in np.array_split(np.argsort(dates, kind='stable'), n)]
+    raise ValueError(f"Bilinmeyen bölümleme: {by} ('customer_id' veya 'date' kullanın)")
+
+
+def _impute_stage(df, imputer, columns, requests, seed):
+    """Önceki aşamanın sütunlarını doldurup bir sonraki aşamanın istatistiklerini hesaplama (işçi süreçte)
+
+    Rastgele doldurmalar bölüme özgü seed (SeedSequence) ile oluşturulan Generator'ı kullanır.
+    """
+    if columns:
+        imputer.rng = np.random.default_rng(seed)
+        imputer.fill(df, columns)
+    return df, ImputationStatistics.compute(df, requests)
+
+
+def _clean_partition(df, imputer, columns, seed):
+    """Son aşamayı doldurup bölümü temizleme ve toplamlarını çıkarma (işçi süreçte)"""
+    imputer.rng = np.random.default_rng(seed)
+    df = imputer.fill(df, columns)
+    df['purchase_date'] = pd.to_datetime(df['purchase_date'])
+    df = add_revenue(enforce_schema(DataProcessor._handle_categorical_data(df)))
+    return df, SalesAggregates.from_frame(df)
+
+
+class SalesAggregates:
+    """Analiz sonuçlarının arkasındaki birleştirilebilir toplamlar
+    
+    Satışlar tek geçişte (kategori, ürün, ödeme yöntemi, gün) küpüne indirgenir:
+    miktar, ciro, satır sayısı, memnuniyet toplamı ve fiyat toplamı/min/max.
+    analyze_top_products, category_price_analysis, time_based_analysis,
+    payment_method_analysis, kategori bazlı popüler ürünler ve dynamic_pricing
+    küpten türetilir; türetilen tablolar önbelleğe alınır. Müşteri harcamaları
+    aynı geçişte ayrıca toplanır. Yeni satışların toplamları merge ile eklenir;
+    geçmiş veri yeniden taranmaz.
+    """
+    
+    def __init__(self, cube, customer_spending):
+        self.cube = cube                            # (kategori, ürün, ödeme, gün) -> CUBE_MEASURES
+        self.customer_spending = customer_spending  # müşteri -> toplam harcama
+        self._derived = {}
+    
+    @classmethod
+    def from_frame(cls, df):
+        """Temizlenmiş veriden küpü ve müşteri harcamalarını tek geçişte hesaplama"""
+        # Fiyatlar float32 saklanır; toplamlar float64'te, kuruşa yuvarlanmış değerlerle hesaplanır
+        price = df['price'].astype('float64').round(2)
+        revenue = df['revenue'] if 'revenue' in df.columns else price * df['quantity']
+        score = df['satisfaction_score'].astype('float64')
+        keys = {
+            'category': df['category'],
+            'product_name': df['product_name'],
+            'payment_method': df['payment_method'] if 'payment_method' in df.columns else pd.Series(np.nan, index=df.index),
+            'day': df['purchase_date'].dt.floor('D')
+        }
+        measures = {
+            'quantity': df['quantity'].to_numpy(np.int64),
+            'revenue': revenue.to_numpy(),
+            'count': np.ones(len(df), dtype=np.int64),
+            'score_sum': score.fillna(0).to_numpy(),
+            'score_count': score.notna().to_numpy(np.int64),
+            'price_sum': price.to_numpy(),
+            'price_min': price.to_numpy(),
+            'price_max': price.to_numpy()
+        }
+        return cls(_build_cube(keys, measures), sum_by(df['customer_id'], revenue).rename(None))
+    
+    @classmethod
+    def combine(cls, parts):
+        """Birden fazla parçanın toplamlarını tek geçişte birleştirme"""
+        cube = pd.concat([part.cube for part in parts])
+        cube = _build_cube({name: cube.index.get_level_values(name) for name in cube.index.names},
+                           {name: cube[name].to_numpy() for name in cube.columns})
+        spending = pd.concat([part.customer_spending for part in parts])
+        return cls(cube, sum_by(spending.index, spending))
+    
+    def merge(self, other):
+        """Başka bir parçanın toplamlarını ekleme"""
+        merged = SalesAggregates.combine([self, other])
+        self.cube, self.customer_spending = merged.cube, merged.customer_spending
+        self._derived = {}
+        return self
+    
+    def _rollup(self, levels, measures):
+        """Küpü verilen seviyelere indirgeme (toplama kuralları CUBE_MEASURES'tan)"""
+        return self.cube[measures].groupby(level=levels, observed=True, dropna=False).agg({m: CUBE_MEASURES[m] for m in measures})
+    
+    def _memo(self, key, compute):
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+    
+    @property
+    def product_quantity(self):
+        """Ürün -> toplam miktar"""
+        return self._memo('product_quantity', lambda: self._rollup('product_name', ['quantity'])['quantity'])
+    
+    @property
+    def category_quantity(self):
+        """Kategori -> toplam miktar"""
+        return self._memo('category_quantity', lambda: self._rollup('category', ['quantity'])['quantity'])
+    
+    @property
+    def category_price(self):
+        """Kategori -> fiyat sum/count/min/max"""
+        def compute():
+            table = self._rollup('category', ['price_sum', 'count', 'price_min', 'price_max'])
+            table.columns = ['sum', 'count', 'min', 'max']
+            return table
+        return self._memo('category_price', compute)
+    
+    @property
+    def product_price(self):
+        """(Kategori, ürün) -> fiyat sum/count, miktar ve memnuniyet toplamları"""
+        def compute():
+            table = self._rollup(['category', 'product_name'], ['price_sum', 'count', 'quantity', 'score_sum', 'score_count'])
+            return table.rename(columns={'price_sum': 'sum'})
+        return self._memo('product_price', compute)
+    
+    @property
+    def payment(self):
+        """Ödeme yöntemi -> işlem sayısı/tutar (ödeme yöntemi yoksa None)"""
+        def compute():
+            table = self._rollup('payment_method', ['count', 'revenue'])
+            return None if table.index.isna().all() else table
+        return self._memo('payment', compute)
+    
+    @property
+    def timeseries(self):
+        """Günlük ürün/kategori miktar matrisleri (zaman penceresi analizleri için)"""
+        return self._memo('timeseries', lambda: SalesTimeSeries.from_cube(self.cube))
+
 
 class DataProcessor:
-    def __init__(self, df):
-        self.df_original = df.copy()  # Orijinal veriyi saklayalım
-        self.df = df.copy()
+    # Eklenen satışlar ilk erişime kadar ayrı parçalar olarak tutulur
+    df = _ChunkedFrame()
+    # Bu sayının üzerindeki müşteri sayısında harcama seviyeleri yaklaşık quantile'larla bulunur
+    APPROXIMATE_TIERS_ABOVE = 1_000_000
+    
+    def __init__(self, df, df_clean=None, imputation_config=None, similarity_backend='exact',
+                 n_workers=1, partition_by='customer_id'):
+        self.imputer = ImputationEngine(imputation_config)
+        self.n_workers = n_workers        # > 1 ise ön işleme bölümlere ayrılıp süreç havuzunda yapılır
+        self.partition_by = partition_by  # 'customer_id' (karma) veya 'date' (tarih aralıkları)
+        self._aggregates = None
+        self._store = None
+        self._similarity_index = None
+        self.similarity_backend = similarity_backend  # 'exact' veya 'ann' (büyük kataloglar için yaklaşık)
+        # Orijinal verinin kopyası yerine yalnızca eksik değer konumları saklanır
+        self._missingness = MissingnessBitmap.from_frame(df)
+        self._raw_memory = memory_usage(df)
+        self._missing_counts = self._missingness.counts()
+        self._n_original_rows = self._missingness.n_rows
         self.missing_data_report = self._analyze_missing_data()
-        self._preprocess_data()
+        
+        if df_clean is not None:
+            # Önceden temizlenmiş veri (örn. önbellekten) varsa ön işleme atlanır
+            self.df = enforce_schema(df_clean if 'revenue' in df_clean.columns else add_revenue(df_clean))
+        else:
+            self.df = df.copy()
+            if n_workers > 1:
+                self._preprocess_partitioned()
+            else:
+                self._preprocess_data()
     
     def _analyze_missing_data(self):
         """Eksik verileri analiz etme"""
-        # Eksik veri sayısı ve oranı
-        missing_count = self.df.isnull().sum()
-        missing_percent = (missing_count / len(self.df)) * 100
+        # Eksik veri sayısı ve oranı (eklenen satışlarla birlikte güncel tutulur)
+        missing_count = self._missing_counts
+        missing_percent = (missing_count / self._n_original_rows) * 100
         
         # Eksik veri raporu
         missing_data = pd.DataFrame({
@@ -33,133 +322,194 @@ class DataProcessor:
         print(f"İşlem öncesi veri boyutu: {self.df.shape}")
         
         # Eksik verileri işleme
-        self._handle_missing_data()
+        self.df = self._handle_missing_data(self.df, fit=True)
         
         # Tarih formatını düzenleme
         self.df['purchase_date'] = pd.to_datetime(self.df['purchase_date'])
         
         # Kategorik değişkenleri kontrol etme
-        self._handle_categorical_data()
+        self.df = self._handle_categorical_data(self.df)
+        
+        # Kompakt tipler (kategorik metinler, küçültülmüş sayılar)
+        self.df = add_revenue(enforce_schema(self.df))
         
         print(f"İşlem sonrası veri boyutu: {self.df.shape}")
     
-    def _handle_missing_data(self):
-        """Eksik verileri işleme"""
+    def _preprocess_partitioned(self):
+        """Veri ön işleme (bölümlere ayrılmış, süreç havuzunda)
+        
+        Her doldurma aşaması için (bkz. ImputationEngine.stages) bölümlerin
+        istatistikleri (toplam, sayı ve değer sayımları) hesaplanıp birleştirilir
+        ve bölümlerde o aşamanın sütunları bu ortak istatistiklerle doldurulur;
+        son aşamada bölümler temizlenir ve analiz toplamları (küp, müşteri
+        harcamaları) bölüm bazında çıkarılıp birleştirilir. Temizlenmiş bölümler özgün satır
+        sırasıyla birleştirilir; sonuçlar tek süreçli yolla aynıdır (toplamlar
+        kayan nokta toplama sırası kadar farklı olabilir). ffill gibi sıraya bağlı
+        doldurmalar bölüm içinde uygulanır. Rastgele tarihlerle doldurulan hücreler
+        tek süreçli yolla aynı olmaz: her bölüm, imputer.seed_sequence.spawn ile
+        türetilen bağımsız bir Generator kullanır (işçiler aynı rastgele diziyi paylaşmaz).
+        """
+        print(f"Veri ön işleme başlıyor ({self.n_workers} süreç, bölümleme: {self.partition_by})...")
+        print(f"İşlem öncesi veri boyutu: {self.df.shape}")
+        
+        # Çok eksik satırların atılması satır bazlıdır; bölümlemeden önce yapılır
+        df = self.df.dropna(thresh=len(self.df.columns) * 0.5)
+        positions = partition_rows(df, self.n_workers, self.partition_by)
+        partitions = [df.take(rows) for rows in positions]
+        missing_products = df['product_name'].isnull().any()
+        
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            self.imputer.stats = None
+            filled = []
+            for columns in self.imputer.stages(df.columns):
+                # Aşamanın istatistikleri, önceki aşama bölümlerde doldurulduktan sonra hesaplanır
+                seeds = self.imputer.seed_sequence.spawn(len(partitions))
+                results = list(executor.map(_impute_stage, partitions, repeat(self.imputer), repeat(filled),
+                                            repeat(self.imputer.requests(columns)), seeds))
+                partitions = [part for part, _ in results]
+                stats = reduce(ImputationStatistics.merge, [part_stats for _, part_stats in results])
+                self.imputer.stats = stats if self.imputer.stats is None else self.imputer.stats.merge(stats)
+                filled = columns
+            seeds = self.imputer.seed_sequence.spawn(len(partitions))
+            results = list(executor.map(_clean_partition, partitions, repeat(self.imputer), repeat(filled), seeds))
+        
+        product_spec = self.imputer.config.get('product_name', {})
+        if missing_products and product_spec.get('strategy') == 'hierarchical':
+            print("Kategori bazında en sık görülen ürünler:")
+            print(self.imputer.stats.lookup(('category',), 'product_name', product_spec['stat']).to_dict())
+        
+        # Bölümler satır konumlarıyla geri sıralanır (indeks sıralı olmasa da özgün sıra korunur)
+        clean = concat_frames([part for part, _ in results])
+        clean = clean.take(np.argsort(np.concatenate(positions), kind='stable'))
+        for column in clean.columns:
+            # Bölümlerin kategorileri birleşim sırasıyla eklenir; tek süreçli yoldaki gibi sıralanır
+            if isinstance(clean[column].dtype, pd.CategoricalDtype):
+                clean[column] = clean[column].cat.reorder_categories(clean[column].cat.categories.sort_values())
+        self.df = clean
+        self._aggregates = SalesAggregates.combine([aggregates for _, aggregates in results])
+        
+        print(f"İşlem sonrası veri boyutu: {self.df.shape}")
+    
+    def _handle_missing_data(self, df, fit=False):
+        """Eksik verileri işleme
+        
+        Doldurma kuralları imputation_config ile sütun bazında seçilir. Grup
+        istatistikleri aşama aşama hesaplanır: bir aşamadaki tüm sütunların
+        istatistikleri tek geçişte, gruplandıkları sütunlar doldurulduktan sonra.
+        fit=False ise mevcut istatistiklere yeni satırların istatistikleri eklenir.
+        """
         # 1. Çok fazla eksik değere sahip satırları kaldırma (örn. %50'den fazla eksik)
-        threshold = len(self.df.columns) * 0.5
-        self.df = self.df.dropna(thresh=threshold)
+        threshold = len(df.columns) * 0.5
+        df = df.dropna(thresh=threshold)
+        missing_products = df['product_name'].isnull().any()
         
         # 2. Kritik alanlardaki eksik değerleri işleme
+        if fit:
+            df = self.imputer.fit_transform(df)
+        else:
+            df = self.imputer.partial_fit_transform(df)
         
-        # Ürün adı eksik olanları doldurma (kategori bilgisine göre)
-        if self.df['product_name'].isnull().any():
-            # Kategori bazında en sık görülen ürünleri bulalım
-            category_product_map = {}
-            for category in self.df['category'].dropna().unique():
-                # Kategorideki en sık görülen ürünü bul
-                most_common_product = self.df[self.df['category'] == category]['product_name'].mode()[0]
-                category_product_map[category] = most_common_product
+        product_spec = self.imputer.config.get('product_name', {})
+        if fit and missing_products and product_spec.get('strategy') == 'hierarchical':
+            # Kategori bazında en sık görülen ürünler
             print("Kategori bazında en sık görülen ürünler:")
-            print(category_product_map)
-            # Eksik ürün adlarını doldurma
-            for idx in self.df[self.df['product_name'].isnull()].index:
-                category = self.df.loc[idx, 'category']
-                if pd.notna(category) and category in category_product_map:
-                    self.df.loc[idx, 'product_name'] = category_product_map[category]
-                else:
-                    # Eğer kategori de eksikse, genel olarak en sık görülen ürünü kullan
-                    self.df.loc[idx, 'product_name'] = self.df['product_name'].mode()[0]
-        
-        # Kategori eksik olanları doldurma (ürün adına göre)
-        if self.df['category'].isnull().any():
-            # Ürün bazında en sık görülen kategorileri bulalım
-            product_category_map = {}
-            for product in self.df['product_name'].dropna().unique():
-                product_data = self.df[self.df['product_name'] == product]
-                if not product_data['category'].dropna().empty:
-                    most_common_category = product_data['category'].mode()[0]
-                    product_category_map[product] = most_common_category
-            
-            # Eksik kategorileri doldurma
-            for idx in self.df[self.df['category'].isnull()].index:
-                product = self.df.loc[idx, 'product_name']
-                if pd.notna(product) and product in product_category_map:
-                    self.df.loc[idx, 'category'] = product_category_map[product]
-                else:
-                    # Eğer ürün adı da eksikse, genel olarak en sık görülen kategoriyi kullan
-                    self.df.loc[idx, 'category'] = self.df['category'].mode()[0]
-        
-        # Fiyat eksik olanları doldurma (ürün ve kategoriye göre)
-        if self.df['price'].isnull().any():
-            # Önce ürün bazında ortalama fiyatları hesaplayalım
-            product_price_map = self.df.groupby('product_name')['price'].mean().to_dict()
-            
-            # Sonra kategori bazında ortalama fiyatları hesaplayalım
-            category_price_map = self.df.groupby('category')['price'].mean().to_dict()
-            
-            # Eksik fiyatları doldurma
-            for idx in self.df[self.df['price'].isnull()].index:
-                product = self.df.loc[idx, 'product_name']
-                category = self.df.loc[idx, 'category']
-                
-                if pd.notna(product) and product in product_price_map:
-                    # Ürün bazlı fiyat
-                    self.df.loc[idx, 'price'] = product_price_map[product]
-                elif pd.notna(category) and category in category_price_map:
-                    # Kategori bazlı fiyat
-                    self.df.loc[idx, 'price'] = category_price_map[category]
-                else:
-                    # Genel ortalama fiyat
-                    self.df.loc[idx, 'price'] = self.df['price'].mean()
-        
-        # Miktar eksik olanları doldurma
-        if self.df['quantity'].isnull().any():
-            # Ürün bazında ortalama miktarları hesaplayalım
-            product_quantity_map = self.df.groupby('product_name')['quantity'].median().to_dict()
-            
-            # Eksik miktarları doldurma
-            for idx in self.df[self.df['quantity'].isnull()].index:
-                product = self.df.loc[idx, 'product_name']
-                
-                if pd.notna(product) and product in product_quantity_map:
-                    # Ürün bazlı miktar
-                    self.df.loc[idx, 'quantity'] = int(product_quantity_map[product])
-                else:
-                    # Genel medyan miktar
-                    self.df.loc[idx, 'quantity'] = int(self.df['quantity'].median())
-        
-        # Memnuniyet puanı eksik olanları doldurma
-        if self.df['satisfaction_score'].isnull().any():
-            # Ürün bazında ortalama puanları hesaplayalım
-            product_score_map = self.df.groupby('product_name')['satisfaction_score'].mean().to_dict()
-            
-            # Eksik puanları doldurma
-            for idx in self.df[self.df['satisfaction_score'].isnull()].index:
-                product = self.df.loc[idx, 'product_name']
-                
-                if pd.notna(product) and product in product_score_map:
-                    # Ürün bazlı puan
-                    self.df.loc[idx, 'satisfaction_score'] = product_score_map[product]
-                else:
-                    # Genel ortalama puan
-                    self.df.loc[idx, 'satisfaction_score'] = self.df['satisfaction_score'].mean()
-        
-        # Tarih eksik olanları doldurma
-        if self.df['purchase_date'].isnull().any():
-            # Eksik tarihleri son 3 ay içinde rastgele tarihlerle dolduralım
-            for idx in self.df[self.df['purchase_date'].isnull()].index:
-                random_days = np.random.randint(0, 90)  # Son 90 gün içinde
-                random_date = (datetime.now() - timedelta(days=random_days)).strftime('%Y-%m-%d')
-                self.df.loc[idx, 'purchase_date'] = random_date
-    
-    def _handle_categorical_data(self):
+            print(self.imputer.stats.lookup(('category',), 'product_name', product_spec['stat']).to_dict())
+        
+        return df
+    
+    @staticmethod
+    def _handle_categorical_data(df):
         """Kategorik verileri işleme"""
         # Kategorik değişkenleri kontrol etme ve düzenleme
-        if 'payment_method' in self.df.columns and self.df['payment_method'].isnull().any():
-            self.df['payment_method'].fillna(self.df['payment_method'].mode()[0], inplace=True)
+        if 'payment_method' in df.columns and df['payment_method'].isnull().any():
+            df['payment_method'] = df['payment_method'].fillna(df['payment_method'].mode()[0])
+        
+        if 'customer_gender' in df.columns and df['customer_gender'].isnull().any():
+            df['customer_gender'] = df['customer_gender'].fillna('Belirtilmemiş')
+        
+        return df
+    
+    def append(self, new_df):
+        """Yeni satışları geçmişi yeniden işlemeden ekleme
+        
+        Yalnızca yeni satırlar temizlenir: doldurma istatistikleri (toplam, sayı
+        ve değer sayımları) yeni satırlarla güncellenir, analiz toplamlarına
+        yeni satırların toplamları eklenir. Yeni satırlar gelen indeksleri yerine
+        mevcut satır etiketlerinden sonra devam eden bir RangeIndex alır; böylece
+        self.df'in indeksi benzersiz kalır.
+        
+        Args:
+            new_df: fetch_data() ile aynı şemada yeni satışlar
+            
+        Returns:
+            cleaned: Temizlenmiş yeni satırlar
+        """
+        # Önbellekten yüklenmiş işlemcide doldurma istatistikleri henüz yoksa bir kez hesapla
+        if self.imputer.stats is None:
+            self.imputer.fit(self._reconstruct_original())
+        
+        self._missingness.append(new_df)
+        self._raw_memory = self._raw_memory.add(memory_usage(new_df), fill_value=0)
+        self._missing_counts = self._missing_counts.add(new_df.isnull().sum(), fill_value=0).astype(int)
+        self._n_original_rows += len(new_df)
+        self.missing_data_report = self._analyze_missing_data()
+        
+        new_df = new_df.copy()
+        start = self._next_label()
+        new_df.index = pd.RangeIndex(start, start + len(new_df))
+        cleaned = self._handle_missing_data(new_df)
+        cleaned['purchase_date'] = pd.to_datetime(cleaned['purchase_date'])
+        cleaned = add_revenue(enforce_schema(self._handle_categorical_data(cleaned)))
         
-        if 'customer_gender' in self.df.columns and self.df['customer_gender'].isnull().any():
-            self.df['customer_gender'].fillna('Belirtilmemiş', inplace=True)
+        if self._aggregates is not None:
+            self._aggregates.merge(SalesAggregates.from_frame(cleaned))
+        self._similarity_index = None  # Benzerlik indeksi bir sonraki kullanımda yeniden oluşturulur
+        self._store = None  # Satır konumu indeksleri de
+        self.__dict__['_df_parts'].append(cleaned)
+        return cleaned
+    
+    def _next_label(self):
+        """Eklenen satırlara verilecek ilk etiket (mevcut tamsayı etiketlerden ve satır sayısından büyük)"""
+        parts = self.__dict__['_df_parts']
+        labels = [part.index.max() for part in parts if len(part) and pd.api.types.is_integer_dtype(part.index)]
+        return int(max([sum(len(part) for part in parts) - 1] + labels)) + 1
+    
+    def _reconstruct_original(self):
+        """Temizlemede tutulan satırların ham hali (eksik değer bitleriyle)
+        
+        Temizlenmiş veride doldurulan hücreler bit dizisine göre yeniden boş
+        bırakılır; dropna ile atılan satırlar zaten temizlenmiş veride yoktur.
+        """
+        columns = [c for c in self._missingness.columns if c in self.df.columns]
+        kept = self._missingness.kept_rows(len(self._missingness.columns) * 0.5)
+        missing = self._missingness.matrix()[kept][:, [self._missingness.columns.index(c) for c in columns]]
+        original = self.df[columns].copy()
+        for i, column in enumerate(columns):
+            if missing[:, i].any():
+                values = original[column].astype(object) if isinstance(original[column].dtype, pd.CategoricalDtype) else original[column]
+                original[column] = values.mask(missing[:, i])
+        return original
+    
+    def memory_report(self):
+        """Ham veri (ve eski tam kopyası) ile tipli veri + eksik değer bitlerinin bellek karşılaştırması"""
+        return memory_report(self._raw_memory, memory_usage(self.df), extra={
+            'Orijinal veri kopyası': (self._raw_memory.sum(), 0),
+            'Eksik değer bit dizisi': (0, self._missingness.nbytes)
+        })
+    
+    @property
+    def aggregates(self):
+        """Analiz toplamları (ilk kullanımda tek geçişte hesaplanır)"""
+        if self._aggregates is None:
+            self._aggregates = SalesAggregates.from_frame(self.df)
+        return self._aggregates
+    
+    @property
+    def store(self):
+        """Ürün, kategori, müşteri ve tarih indeksli satış deposu (ilk kullanımda oluşturulur)"""
+        if self._store is None:
+            self._store = SalesStore(self.df)
+        return self._store
     
     def get_missing_data_report(self):
         """Eksik veri raporunu döndürme"""
@@ -167,7 +517,7 @@ class DataProcessor:
     
     def compare_before_after_cleaning(self):
         """Temizleme öncesi ve sonrası veri karşılaştırması"""
-        before = self.df_original.isnull().sum()
+        before = self._missing_counts
         after = self.df.isnull().sum()
         
         comparison = pd.DataFrame({
@@ -193,130 +543,224 @@ class DataProcessor:
     
     def analyze_top_products(self, n=10):
         """En çok satın alınan ürünleri analiz etme"""
-        return self.df.groupby('product_name')['quantity'].sum().sort_values(ascending=False).head(n)
+        return self.aggregates.product_quantity.sort_values(ascending=False).head(n)
     
     def price_quantity_correlation(self):
         """Fiyat ve satış miktarı arasındaki korelasyonu hesaplama"""
-        return self.df.groupby('product_name').agg({
-            'price': 'mean',
-            'quantity': 'sum'
+        products = self.aggregates.product_price.groupby(level='product_name')[['sum', 'count', 'quantity']].sum()
+        return pd.DataFrame({
+            'price': products['sum'] / products['count'],
+            'quantity': products['quantity']
         }).corr()
     
     def category_price_analysis(self):
         """Kategorilere göre ortalama fiyat analizi"""
-        return self.df.groupby('category')['price'].agg(['mean', 'min', 'max'])
+        category_price = self.aggregates.category_price
+        return pd.DataFrame({
+            'mean': category_price['sum'] / category_price['count'],
+            'min': category_price['min'],
+            'max': category_price['max']
+        })
     
     def time_based_analysis(self, days=30):
-        """Belirli bir zaman diliminde en çok satılan ürünleri bulma"""
-        recent_date = self.df['purchase_date'].max()
-        start_date = recent_date - timedelta(days=days)
-        recent_data = self.df[self.df['purchase_date'] >= start_date]
-        return recent_data.groupby('product_name')['quantity'].sum().sort_values(ascending=False)
+        """Belirli bir zaman diliminde en çok satılan ürünleri bulma
+        
+        Son satış gününden geriye days gün içindeki toplamlar günlük ürün
+        matrisinin kümülatif toplamlarından okunur; veri yeniden taranmaz.
+        """
+        return self.timeseries.top_products(n=None, days=days)
+    
+    @property
+    def timeseries(self):
+        """Ürün ve kategori bazlı zaman penceresi analizleri (SalesTimeSeries)"""
+        return self.aggregates.timeseries
+    
+    def category_top_products(self, n=3):
+        """Her kategoride en çok satılan n ürün (category, product_name, quantity)"""
+        quantity = self.aggregates.product_price['quantity'].reset_index()
+        quantity = quantity.sort_values(['category', 'quantity'], ascending=[True, False], kind='stable')
+        return quantity.groupby('category', sort=False).head(n).reset_index(drop=True)
+    
+    def customer_purchases(self, customer_id, columns=None):
+        """Bir müşterinin satın alımları (müşteri indeksinden, tabloyu taramadan)"""
+        return self.store.query(columns, customer_id=customer_id)
+    
+    def revenue_by(self, column):
+        """Bir sütunun değerlerine göre toplam ciro (revenue sütunu üzerinde np.bincount)"""
+        if column == 'customer_id':
+            return self.aggregates.customer_spending
+        return sum_by(self.df[column], self.df['revenue'])
+    
+    def spending_tiers(self, q=4, labels=None, approximate=None, relative_accuracy=0.001):
+        """Müşterileri toplam harcamalarının quantile'larına göre seviyelere ayırma
+        
+        Kesin yöntem pd.qcut ile tüm harcamaları sıralar. Yaklaşık yöntemde sınırlar
+        birleştirilebilir bir QuantileSketch'ten okunur (göreli hata en fazla
+        relative_accuracy); çok sayıda müşteride sıralama gerekmez.
+        
+        Args:
+            q: Seviye sayısı
+            labels: Seviye etiketleri
+            approximate: None ise müşteri sayısı APPROXIMATE_TIERS_ABOVE'u aşınca yaklaşık yöntem
+            relative_accuracy: Yaklaşık quantile'ların göreli hata sınırı
+        """
+        spending = self.aggregates.customer_spending
+        if approximate is None:
+            approximate = len(spending) > self.APPROXIMATE_TIERS_ABOVE
+        if not approximate:
+            return pd.qcut(spending, q=q, labels=labels)
+        sketch = QuantileSketch(relative_accuracy).add(spending.to_numpy())
+        return quantile_tiers(spending, sketch, q=q, labels=labels)
     
     def customer_spending_analysis(self):
         """Müşteri harcama seviyelerine göre gruplama"""
-        customer_spending = self.df.groupby('customer_id').apply(
-            lambda x: (x['price'] * x['quantity']).sum()
-        )
-        return pd.qcut(customer_spending, q=4, labels=['Düşük', 'Orta', 'Yüksek', 'Çok Yüksek'])
+        return self.spending_tiers(q=4, labels=['Düşük', 'Orta', 'Yüksek', 'Çok Yüksek'])
     
-    def dynamic_pricing(self, threshold=0.2):
+    def dynamic_pricing(self, threshold=0.2, max_adjustments=5):
         """NumPy kullanarak basit dinamik fiyatlandırma
         
+        Ürün ve kategori ortalamaları aynı (kategori, ürün) toplamlarından
+        türetilir; kurallar tüm ürünlere vektörel maskelerle uygulanır.
+        
+        Kurallar (kategori ve ürün adı sırasıyla):
+            'raise': Ortalama, kategori ortalamasının (1 - threshold) katının altında
+                -> kategori ortalamasının %90'ı
+            'lower': Ortalama, kategori ortalamasının (1 + threshold) katının üstünde
+                -> kategori ortalamasının %110'u
+            'adjust': Eşik içindeki ürünler, öneri sayısı max_adjustments'a
+                ulaşana kadar ±%5 ayarlanır (boş sonuç dönmemesi için)
+            'fallback': Hiç öneri yoksa en çok satan ürüne %10 artış
+        
         Args:
             threshold: Fiyat sapma eşiği (varsayılan: 0.2)
+            max_adjustments: 'adjust' kuralının uygulanacağı en fazla öneri sayısı
             
         Returns:
-            price_updates: Fiyat güncellemelerini içeren sözlük
+            price_updates: product_name, category, avg_price, new_price, rule sütunlu DataFrame
         """
-        price_updates = {}
+        columns = ['product_name', 'category', 'avg_price', 'new_price', 'rule']
+        pairs = self.aggregates.product_price
+        if pairs is None or len(pairs) == 0:
+            return pd.DataFrame(columns=columns)
         
-        # Kategorilere göre grupla
-        for category in self.df['category'].unique():
-            # Kategori verilerini al
-            category_data = self.df[self.df['category'] == category]
-            
-            # Fiyatları NumPy dizisine dönüştür
-            prices = np.array(category_data['price'])
-            products = np.array(category_data['product_name'])
-            
-            # Kategori ortalama fiyatını hesapla
-            mean_price = np.mean(prices)
-            
-            # Benzersiz ürünleri bul
-            unique_products = np.unique(products)
-            
-            for product in unique_products:
-                # Ürün fiyatlarını al
-                product_indices = np.where(products == product)
-                product_prices = prices[product_indices]
-                
-                if len(product_prices) == 0:
-                    continue
-                    
-                # Ürün ortalama fiyatı
-                avg_product_price = np.mean(product_prices)
-                
-                # Fiyat sapmasını kontrol et ve her ürün için en az bir güncelleme öner
-                if avg_product_price < mean_price * (1 - threshold):
-                    # Düşük fiyatlı ürün - fiyatı artır
-                    new_price = mean_price * 0.9  # Kategori ortalamasının %90'ı
-                    price_updates[product] = round(new_price, 2)
-                elif avg_product_price > mean_price * (1 + threshold):
-                    # Yüksek fiyatlı ürün - fiyatı düşür
-                    new_price = mean_price * 1.1  # Kategori ortalamasının %110'u
-                    price_updates[product] = round(new_price, 2)
-                else:
-                    # Eğer hiçbir ürün eşiği geçmiyorsa, yine de her üründen bir tane ekleyelim
-                    # Bu, boş sonuç dönmemesi için eklendi
-                    if product not in price_updates and len(price_updates) < 5:
-                        # Fiyatı biraz değiştir (±5%)
-                        adjustment = 0.95 if avg_product_price > mean_price else 1.05
-                        new_price = avg_product_price * adjustment
-                        price_updates[product] = round(new_price, 2)
-        
-        # Eğer hala boşsa, en az bir ürün ekleyelim
-        if not price_updates and len(self.df) > 0:
-            # En popüler ürünü bul
-            top_product = self.df.groupby('product_name')['quantity'].sum().idxmax()
-            top_product_price = self.df[self.df['product_name'] == top_product]['price'].mean()
-            # Fiyatı %10 artır
-            price_updates[top_product] = round(top_product_price * 1.1, 2)
+        pairs = pairs.sort_index()
+        categories = pairs.index.get_level_values('category')
+        avg_price = (pairs['sum'] / pairs['count']).to_numpy()
+        category_totals = pairs.groupby(level='category', sort=False)[['sum', 'count']].transform('sum')
+        mean_price = (category_totals['sum'] / category_totals['count']).to_numpy()
+        
+        low = avg_price < mean_price * (1 - threshold)
+        high = avg_price > mean_price * (1 + threshold)
+        fired = low | high
+        # Eşik içindeki ürünler, kendilerinden önceki öneri sayısı sınırın altındaysa ayarlanır
+        within = ~fired
+        prior_updates = np.cumsum(fired) - fired + np.cumsum(within) - within
+        adjust = within & (prior_updates < max_adjustments)
+        
+        new_price = np.select(
+            [low, high, adjust],
+            [mean_price * 0.9, mean_price * 1.1, avg_price * np.where(avg_price > mean_price, 0.95, 1.05)],
+            default=np.nan
+        )
+        rule = np.select([low, high, adjust], ['raise', 'lower', 'adjust'], default='')
+        price_updates = pd.DataFrame({
+            'product_name': pairs.index.get_level_values('product_name'),
+            'category': categories,
+            'avg_price': avg_price,
+            'new_price': np.round(new_price, 2),
+            'rule': rule
+        })[fired | adjust]
+        # Birden fazla kategoride görünen üründe son kategorinin önerisi geçerlidir
+        price_updates = price_updates.drop_duplicates('product_name', keep='last').reset_index(drop=True)
+        
+        if price_updates.empty:
+            # En popüler ürünün fiyatını %10 artır
+            top_product = self.aggregates.product_quantity.idxmax()
+            top_pairs = pairs.xs(top_product, level='product_name')
+            top_price = top_pairs['sum'].sum() / top_pairs['count'].sum()
+            price_updates = pd.DataFrame([{
+                'product_name': top_product,
+                'category': top_pairs.index[0],
+                'avg_price': top_price,
+                'new_price': round(top_price * 1.1, 2),
+                'rule': 'fallback'
+            }], columns=columns)
         
         return price_updates
     
+    @property
+    def similarity_index(self):
+        """Seyrek ürün-ürün benzerlik indeksi (ilk kullanımda bir kez oluşturulur)"""
+        if self._similarity_index is None:
+            self._similarity_index = ItemSimilarityIndex.from_frame(self.df, backend=self.similarity_backend)
+        return self._similarity_index
+    
+    def save_similarity_index(self, path):
+        """Benzerlik indeksini diske kaydetme"""
+        self.similarity_index.save(path)
+    
+    def load_similarity_index(self, path):
+        """Kaydedilmiş benzerlik indeksini bellek eşlemeli yükleme
+        
+        İndeks, mevcut verinin etkileşim özetiyle karşılaştırılır; dosya yoksa
+        veya veri değişmişse indeks yeniden oluşturulup kaydedilir.
+        """
+        customers, products, interactions = ItemSimilarityIndex.build_interactions(self.df)
+        expected_hash = ItemSimilarityIndex.interaction_hash(customers, products, interactions)
+        try:
+            index = ItemSimilarityIndex.load(path, expected_hash=expected_hash)
+            if index.backend != self.similarity_backend:
+                raise ValueError(f"indeks '{index.backend}' yöntemiyle oluşturulmuş")
+            self._similarity_index = index
+            print("Benzerlik indeksi diskten yüklendi.")
+        except (OSError, ValueError) as e:
+            print(f"Benzerlik indeksi yeniden oluşturuluyor ({e})")
+            self._similarity_index = ItemSimilarityIndex.from_interactions(
+                customers, products, interactions, backend=self.similarity_backend
+            )
+            self._similarity_index.save(path)
+        return self._similarity_index
+    
     def product_recommendation(self, customer_id, n_recommendations=5):
-        """Ürün öneri sistemi"""
-        # Müşterinin satın aldığı ürünleri bulma
-        customer_products = self.df[self.df['customer_id'] == customer_id]['product_name'].unique()
-        
-        # Benzer ürünleri bulma
-        product_matrix = pd.pivot_table(
-            self.df,
-            values='satisfaction_score',
-            index='customer_id',
-            columns='product_name',
-            fill_value=0
-        )
+        """Ürün öneri sistemi
         
-        # Cosine similarity hesaplama
-        similarity_matrix = cosine_similarity(product_matrix.T)
-        similarity_df = pd.DataFrame(
-            similarity_matrix,
-            index=product_matrix.columns,
-            columns=product_matrix.columns
-        )
+        Müşterinin aldığı her ürünün en benzer 5 komşusu, önceden hesaplanmış
+        seyrek benzerlik indeksinden okunur.
+        """
+        return self.similarity_index.recommend(customer_id, n=n_recommendations, per_product=5)
+    
+    def recommend_batch(self, customer_ids, n=5):
+        """Birden fazla müşteri için öneriler (customer_id, rank, product_name, score)"""
+        return self.similarity_index.recommend_batch(customer_ids, n=n, per_product=5)
+    
+    def recommend_all(self, n=5, output_path=None, n_workers=1, block_size=50_000):
+        """Tüm müşteriler için önerileri toplu hesaplama
         
-        # Önerileri oluşturma
-        recommendations = []
-        for product in customer_products:
-            if product in similarity_df.index:
-                similar_products = similarity_df[product].sort_values(ascending=False)[1:6]
-                recommendations.extend(similar_products.index.tolist())
+        Skorlar müşteri blokları üzerinde tek seyrek matris çarpımıyla hesaplanır;
+        n_workers > 1 ise bloklar süreç havuzuna dağıtılır.
         
-        # Tekrar eden önerileri kaldırma ve en popüler olanları seçme
-        unique_recommendations = list(set(recommendations))
-        return unique_recommendations[:n_recommendations]
+        Args:
+            n: Müşteri başına öneri sayısı
+            output_path: Verilirse sonuçlar Parquet dosyasına yazılır
+            n_workers: Paralel süreç sayısı
+            block_size: Blok başına müşteri sayısı
+            
+        Returns:
+            recommendations: Öneri DataFrame'i (output_path verilirse None)
+        """
+        index = self.similarity_index
+        start = time.perf_counter()
+        if output_path is None:
+            recommendations = index.recommend_all(n, 5, block_size, n_workers)
+        else:
+            index.write_recommendations(output_path, n, 5, block_size, n_workers)
+            recommendations = None
+        elapsed = time.perf_counter() - start
+        
+        n_customers = len(index.customers)
+        print(f"{n_customers} müşteri için öneriler {elapsed:.2f} sn'de hesaplandı "
+              f"({n_customers / elapsed:,.0f} müşteri/sn)")
+        return recommendations
     
     def plot_satisfaction_distribution(self):
         """Müşteri memnuniyeti dağılımını görselleştirme"""
@@ -329,7 +773,7 @@ class DataProcessor:
     
     def plot_category_sales(self):
         """Kategori bazlı satışları görselleştirme"""
-        category_sales = self.df.groupby('category')['quantity'].sum()
+        category_sales = self.aggregates.category_quantity
         plt.figure(figsize=(10, 6))
         category_sales.plot(kind='bar')
         plt.title('Kategori Bazlı Satışlar')
@@ -341,15 +785,11 @@ class DataProcessor:
         
     def payment_method_analysis(self):
         """Ödeme yöntemlerine göre analiz"""
-        if 'payment_method' in self.df.columns:
-            payment_counts = self.df['payment_method'].value_counts()
-            payment_amounts = self.df.groupby('payment_method').apply(
-                lambda x: (x['price'] * x['quantity']).sum()
-            )
-            
+        payment = self.aggregates.payment
+        if payment is not None:
             return pd.DataFrame({
-                'İşlem Sayısı': payment_counts,
-                'Toplam Tutar': payment_amounts
+                'İşlem Sayısı': payment['count'],
+                'Toplam Tutar': payment['revenue']
             })
         else:
             return pd.DataFrame()
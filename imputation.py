@@ -0,0 +1,310 @@
+import pandas as pd
+import numpy as np
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+# Varsayılan doldurma kuralları (sıra önemlidir: önce ürün adı ve kategori doldurulur).
+# Bir sütunun grup istatistikleri, gruplandığı sütunlar doldurulduktan sonra hesaplanır
+# (bkz. ImputationEngine.stages); sonuçlar eski satır bazlı yöntemle aynıdır.
+DEFAULT_IMPUTATION_CONFIG = {
+    'product_name': {'strategy': 'hierarchical', 'stat': 'mode', 'by': ['category']},
+    'category': {'strategy': 'hierarchical', 'stat': 'mode', 'by': ['product_name']},
+    'price': {'strategy': 'hierarchical', 'stat': 'mean', 'by': ['product_name', 'category']},
+    'quantity': {'strategy': 'hierarchical', 'stat': 'median', 'by': ['product_name'], 'round': 'floor'},
+    'satisfaction_score': {'strategy': 'hierarchical', 'stat': 'mean', 'by': ['product_name']},
+    'purchase_date': {'strategy': 'random_recent_date', 'days': 90},
+    'payment_method': {'strategy': 'mode'},
+}
+
+# İstatistik türleri: ortalama toplam/sayıdan, mod ve medyan değer sayımlarından türetilir
+_STAT_KINDS = {'mean': 'sum_count', 'median': 'value_counts', 'mode': 'value_counts'}
+
+IMPUTATION_STRATEGIES = {}
+
+
+def register_strategy(name):
+    """Doldurma stratejisini isimle kaydetme (sınıf dekoratörü)"""
+    def decorator(cls):
+        IMPUTATION_STRATEGIES[name] = cls()
+        return cls
+    return decorator
+
+
+def _as_keys(level):
+    """'product_name' veya ['product_name', 'category'] -> grup anahtarı tuple'ı"""
+    return (level,) if isinstance(level, str) else tuple(level)
+
+
+def _mode_from_counts(counts, keys):
+    """Değer sayımlarından grup modu (eşitlikte en küçük değer, Series.mode gibi)"""
+    column = counts.index.names[-1]
+    frame = counts.reset_index(name='n')
+    frame = frame.sort_values(list(keys) + ['n', column], ascending=[True] * len(keys) + [False, True])
+    if not keys:
+        return frame[column].iloc[0] if len(frame) else np.nan
+    return frame.drop_duplicates(list(keys)).set_index(list(keys))[column]
+
+
+def _median_from_counts(counts, keys):
+    """Değer sayımlarından grup medyanı (çift sayıda değerde iki ortadakinin ortalaması)"""
+    column = counts.index.names[-1]
+    frame = counts.reset_index(name='n').sort_values(list(keys) + [column])
+    groups = [frame[k] for k in keys] if keys else [np.zeros(len(frame), dtype=int)]
+    cumulative = frame.groupby(groups)['n'].cumsum()
+    total = frame.groupby(groups)['n'].transform('sum')
+    lower = frame[column].where(cumulative > (total - 1) // 2).groupby(groups).first()
+    upper = frame[column].where(cumulative > total // 2).groupby(groups).first()
+    median = (lower + upper) / 2
+    if not keys:
+        return median.iloc[0] if len(median) else np.nan
+    return median
+
+
+class ImputationStatistics:
+    """Doldurma stratejilerinin ihtiyaç duyduğu grup istatistikleri
+
+    Aynı grup anahtarını kullanan tüm toplam/sayı istatistikleri tek bir
+    groupby().agg() geçişinde hesaplanır; mod ve medyan için grup x değer
+    sayımları tutulur. Türetilen tablolar (ortalama, mod, medyan) önbelleğe
+    alınır ve stratejiler arasında paylaşılır.
+    """
+
+    def __init__(self):
+        self.sum_count = {}     # (keys, column) -> DataFrame['sum', 'count']
+        self.value_counts = {}  # (keys, column) -> Series (keys + [column] indeksli)
+        self._lookups = {}
+
+    @classmethod
+    def compute(cls, df, requests):
+        """İstenen istatistikleri veri üzerinden hesaplama
+
+        Args:
+            df: Kaynak veri
+            requests: (keys, column, stat) üçlüleri; stat 'mean', 'median' veya 'mode'
+        """
+        stats = cls()
+        by_keys = {}
+        for keys, column, stat in requests:
+            kinds = by_keys.setdefault(keys, {'sum_count': set(), 'value_counts': set()})
+            kinds[_STAT_KINDS[stat]].add(column)
+
+        for keys, kinds in by_keys.items():
+            columns = sorted(kinds['sum_count'])
+            if columns and keys:
+                # Bu anahtarı kullanan tüm sütunlar için tek geçiş
+                aggregated = df.groupby(list(keys), observed=True)[columns].agg(['sum', 'count'])
+                for column in columns:
+                    stats.sum_count[(keys, column)] = aggregated[column]
+            elif columns:
+                aggregated = df[columns].agg(['sum', 'count'])
+                for column in columns:
+                    stats.sum_count[(keys, column)] = aggregated[column].to_frame().T
+
+            for column in sorted(kinds['value_counts']):
+                if keys:
+                    counts = df.groupby(list(keys) + [column], observed=True).size()
+                else:
+                    counts = df[column].value_counts(sort=False).rename_axis(column)
+                stats.value_counts[(keys, column)] = counts
+        return stats
+
+    def merge(self, other):
+        """Başka bir veri parçasının istatistiklerini ekleme (toplam, sayı ve değer sayımları)"""
+        for key, table in other.sum_count.items():
+            if key in self.sum_count:
+                table = pd.concat([self.sum_count[key], table]).groupby(level=list(range(table.index.nlevels))).sum()
+            self.sum_count[key] = table
+        for key, counts in other.value_counts.items():
+            if key in self.value_counts:
+                counts = pd.concat([self.value_counts[key], counts]).groupby(level=list(range(counts.index.nlevels))).sum()
+            self.value_counts[key] = counts
+        self._lookups = {}
+        return self
+
+    def lookup(self, keys, column, stat):
+        """Grup bazında istatistik tablosu (keys boşsa tek bir genel değer)"""
+        cache_key = (keys, column, stat)
+        if cache_key not in self._lookups:
+            if stat == 'mean':
+                table = self.sum_count[(keys, column)]
+                mean = table['sum'].where(table['count'] > 0) / table['count']
+                result = mean.astype(float) if keys else float(mean.iloc[0])
+            elif stat == 'mode':
+                result = _mode_from_counts(self.value_counts[(keys, column)], keys)
+            else:
+                result = _median_from_counts(self.value_counts[(keys, column)], keys)
+            self._lookups[cache_key] = result
+        return self._lookups[cache_key]
+
+
+class ImputationStrategy(ABC):
+    """Doldurma stratejisi arayüzü (fill uygulanmamış stratejiler kaydedilirken hata verir)"""
+
+    def requires(self, column, spec):
+        """Stratejinin ihtiyaç duyduğu (keys, column, stat) istatistikleri"""
+        return []
+
+    @abstractmethod
+    def fill(self, df, column, spec, stats, rng):
+        """Sütunun doldurulmuş halini döndürme (rng: rastgele stratejiler için np.random.Generator)"""
+
+
+def _round_fill(values, spec):
+    """'round': 'floor' verilmişse doldurma değerlerini aşağı yuvarlama"""
+    if spec.get('round') == 'floor':
+        return np.floor(values)
+    return values
+
+
+@register_strategy('mean')
+@register_strategy('median')
+@register_strategy('mode')
+class GlobalStatStrategy(ImputationStrategy):
+    """Genel ortalama / medyan / mod ile doldurma"""
+
+    def requires(self, column, spec):
+        return [((), column, spec['strategy'])]
+
+    def fill(self, df, column, spec, stats, rng):
+        return df[column].fillna(_round_fill(stats.lookup((), column, spec['strategy']), spec))
+
+
+@register_strategy('hierarchical')
+class HierarchicalStrategy(ImputationStrategy):
+    """Grup seviyelerine göre sırayla doldurma (örn. ürün -> kategori -> genel)"""
+
+    def requires(self, column, spec):
+        levels = [_as_keys(level) for level in spec.get('by', [])] + [()]
+        return [(keys, column, spec['stat']) for keys in levels]
+
+    def fill(self, df, column, spec, stats, rng):
+        result = df[column]
+        for level in spec.get('by', []):
+            keys = _as_keys(level)
+            table = stats.lookup(keys, column, spec['stat'])
+            if len(keys) == 1:
+                values = df[keys[0]].map(table)
+            else:
+                values = pd.Series(table.reindex(pd.MultiIndex.from_frame(df[list(keys)])).to_numpy(), index=df.index)
+            result = result.fillna(_round_fill(values, spec))
+        return result.fillna(_round_fill(stats.lookup((), column, spec['stat']), spec))
+
+
+@register_strategy('constant')
+class ConstantStrategy(ImputationStrategy):
+    """Sabit değer ile doldurma"""
+
+    def fill(self, df, column, spec, stats, rng):
+        return df[column].fillna(spec['value'])
+
+
+@register_strategy('ffill')
+class ForwardFillStrategy(ImputationStrategy):
+    """Bir önceki değerle doldurma (isteğe bağlı olarak order_by sırasına göre)"""
+
+    def fill(self, df, column, spec, stats, rng):
+        if 'order_by' not in spec:
+            return df[column].ffill()
+        ordered = df.sort_values(spec['order_by'], kind='stable')[column].ffill()
+        return ordered.reindex(df.index)
+
+
+@register_strategy('random_recent_date')
+class RandomRecentDateStrategy(ImputationStrategy):
+    """Son N gün içinde rastgele tarihlerle doldurma"""
+
+    def fill(self, df, column, spec, stats, rng):
+        result = df[column].copy()
+        missing = result.isnull()
+        random_days = rng.integers(0, spec.get('days', 90), size=int(missing.sum()))
+        random_dates = pd.Timestamp(datetime.now().date()) - pd.to_timedelta(random_days, unit='D')
+        result[missing] = random_dates.strftime('%Y-%m-%d')
+        return result
+
+
+class ImputationEngine:
+    """Sütun bazlı, yapılandırılabilir eksik veri doldurma
+
+    Args:
+        config: {sütun: {'strategy': ..., ...}} sözlüğü (varsayılan: DEFAULT_IMPUTATION_CONFIG)
+        seed: Rastgele doldurmaların tohum değeri (None ise her çalıştırmada farklı)
+    """
+
+    def __init__(self, config=None, seed=None):
+        self.config = dict(DEFAULT_IMPUTATION_CONFIG if config is None else config)
+        for column, spec in self.config.items():
+            if spec.get('strategy') not in IMPUTATION_STRATEGIES:
+                raise ValueError(f"{column} için bilinmeyen doldurma stratejisi: {spec.get('strategy')}")
+        self.stats = None
+        # Bölümlenmiş işlemede her bölüm bu diziden türetilen ayrı bir Generator kullanır
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+
+    def requests(self, columns=None):
+        """Yapılandırmadaki stratejilerin ihtiyaç duyduğu tüm istatistikler"""
+        requests = []
+        for column, spec in self.config.items():
+            if columns is not None and column not in columns:
+                continue
+            for request in IMPUTATION_STRATEGIES[spec['strategy']].requires(column, spec):
+                if request not in requests:
+                    requests.append(request)
+        return requests
+
+    def stages(self, columns=None):
+        """Doldurma aşamaları (sütun listeleri)
+
+        Bir sütun, gruplandığı (by) veya sıralandığı (order_by) ve yapılandırmada
+        kendisinden önce gelen sütunların aşamasından sonraki aşamaya konur. Her
+        aşamanın istatistikleri önceki aşamalar doldurulduktan sonra, aşamadaki
+        tüm sütunlar için tek geçişte hesaplanır; böylece örn. fiyat ortalamaları
+        adı doldurulan satırları da içerir (eski satır bazlı yöntemdeki gibi).
+        """
+        stage = {}
+        for column, spec in self.config.items():
+            if columns is not None and column not in columns:
+                continue
+            depends = [key for level in spec.get('by', []) for key in _as_keys(level)]
+            if 'order_by' in spec:
+                depends += list(_as_keys(spec['order_by']))
+            stage[column] = max([stage[key] + 1 for key in depends if key in stage], default=0)
+        n_stages = max(stage.values(), default=-1) + 1
+        return [[column for column in stage if stage[column] == s] for s in range(n_stages)]
+
+    def _fit_transform(self, df, partial):
+        if not partial:
+            self.stats = None
+        for columns in self.stages(df.columns):
+            stats = ImputationStatistics.compute(df, self.requests(columns))
+            self.stats = stats if self.stats is None else self.stats.merge(stats)
+            self.fill(df, columns)
+        return df
+
+    def fit_transform(self, df):
+        """İstatistikleri aşama aşama hesaplayıp eksik değerleri doldurma (df yerinde güncellenir)"""
+        return self._fit_transform(df, partial=False)
+
+    def partial_fit_transform(self, df):
+        """Yeni satırların aşama istatistiklerini mevcut istatistiklere ekleyerek doldurma"""
+        return self._fit_transform(df, partial=True)
+
+    def fit(self, df):
+        """Gerekli grup istatistiklerini hesaplama (sonraki aşamalar için veri kopyası doldurulur)"""
+        self.fit_transform(df.copy())
+        return self
+
+    def partial_fit(self, df):
+        """Yeni satırların istatistiklerini mevcut istatistiklerle birleştirme"""
+        self.partial_fit_transform(df.copy())
+        return self
+
+    def fill(self, df, columns):
+        """Verilen sütunları mevcut istatistiklerle, yapılandırma sırasıyla doldurma (df yerinde güncellenir)"""
+        for column, spec in self.config.items():
+            if column in columns and column in df.columns and df[column].isnull().any():
+                df[column] = IMPUTATION_STRATEGIES[spec['strategy']].fill(df, column, spec, self.stats, self.rng)
+        return df
+
+    def transform(self, df):
+        """Eksik değerleri mevcut istatistiklerle yapılandırma sırasıyla doldurma (df yerinde güncellenir)"""
+        return self.fill(df, list(self.config))
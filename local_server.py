@@ -0,0 +1,412 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+import bisect
+import json
+import os
+import socket
+import threading
+
+# Eşitlik filtreleri için ikincil indeks tutulan alanlar
+INDEXED_FIELDS = {
+    'products': ('product_name', 'category', 'customer_id', 'payment_method'),
+    'customers': ('gender',),
+    'categories': ('name',),
+}
+
+# json-server ile aynı sorgu ekleri
+_RANGE_SUFFIXES = {'_gte': lambda a, b: a >= b, '_lte': lambda a, b: a <= b, '_ne': lambda a, b: a != b}
+
+# Desteklenen sayfalama parametreleri; '_' ile başlayan diğerleri (_sort, _order, _q ...) yok sayılır
+_PAGING_PARAMS = ('_page', '_limit', '_start', '_end')
+
+
+def _as_text(value):
+    """Sorgu karşılaştırmaları için alan değerinin metin hali (json-server gibi)"""
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def _coerce(value, text):
+    """Sorgu metnini alan değerinin tipine dönüştürme (aralık filtreleri için)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    return text
+
+
+class LocalStore:
+    """db.json koleksiyonları için bellek içi, indeksli kayıt deposu
+
+    Kayıtlar koleksiyon bazında id -> kayıt sözlüklerinde tutulur; INDEXED_FIELDS
+    alanlarında değer -> sıralı id listesi indeksleri vardır, böylece filtreli
+    sorgular ve sayfalama yalnızca eşleşen kayıtları dolaşır. Değişiklikler tüm dosya
+    yeniden yazılmadan bir ekleme günlüğüne (JSON Lines) yazılır; günlük
+    compact_every işleme ulaştığında db.json tek seferde yeniden yazılır ve
+    günlük sıfırlanır. Açılışta db.json okunur ve günlük üzerine uygulanır.
+    """
+
+    def __init__(self, collections, db_path=None, log_path=None, compact_every=10_000):
+        self.db_path = db_path
+        self.log_path = log_path
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._records = {}
+        self._rows = {}  # Kayıtlar id sırasıyla (filtresiz sayfalama için kopyasız dilimleme)
+        self._indexes = {}
+        self._versions = {}
+        for name, records in collections.items():
+            self._records[name] = {record['id']: record for record in records}
+            self._rows[name] = list(self._records[name].values())
+            self._versions[name] = 0
+            self._build_indexes(name)
+        self._log_file = None
+        self._log_ops = 0
+        # Sürüm sayaçları her açılışta sıfırlandığından ETag'lere örnek kimliği eklenir
+        self.instance_id = os.urandom(4).hex()
+
+    @classmethod
+    def open(cls, db_path='db.json', log_path=None, compact_every=10_000):
+        """db.json'u yükleyip varsa günlükteki değişiklikleri uygulama"""
+        log_path = log_path or os.path.splitext(db_path)[0] + '.log.jsonl'
+        with open(db_path, encoding='utf-8') as f:
+            collections = json.load(f)
+        store = cls(collections, db_path, log_path, compact_every)
+        if os.path.exists(log_path):
+            with open(log_path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    store._apply_patch(entry['collection'], entry['id'], entry['fields'])
+                    store._log_ops += 1
+        return store
+
+    def _build_indexes(self, name):
+        indexes = {field: {} for field in INDEXED_FIELDS.get(name, ())}
+        for record_id in sorted(self._records[name]):
+            record = self._records[name][record_id]
+            for field, index in indexes.items():
+                index.setdefault(_as_text(record.get(field)), []).append(record_id)
+        self._indexes[name] = indexes
+
+    def collections(self):
+        return list(self._records)
+
+    def version(self, name):
+        """Koleksiyonun değişiklik sayacı (ETag için)"""
+        return self._versions[name]
+
+    def get(self, name, record_id):
+        """Tek kayıt (yoksa None)"""
+        with self._lock:
+            return self._records[name].get(record_id)
+
+    def query(self, name, params=()):
+        """json-server uyumlu sorgu
+
+        Args:
+            name: Koleksiyon adı
+            params: (ad, değer) çiftleri; alan=değer (tekrarlanırsa VEYA),
+                alan_gte / alan_lte / alan_ne, _page + _limit veya _start + _end
+
+        Returns:
+            records, total: Sayfadaki kayıtlar ve sayfalama öncesi toplam kayıt sayısı
+
+        Raises:
+            ValueError: Sayfalama parametresi tamsayı değilse
+        """
+        equals, ranges, paging = {}, [], {}
+        for key, value in params:
+            if key.startswith('_'):
+                if key in _PAGING_PARAMS:
+                    try:
+                        paging[key] = int(value)
+                    except ValueError:
+                        raise ValueError(f"{key} tamsayı olmalı: {value!r}") from None
+                continue
+            for suffix, compare in _RANGE_SUFFIXES.items():
+                if key.endswith(suffix):
+                    ranges.append((key[:-len(suffix)], compare, value))
+                    break
+            else:
+                equals.setdefault(key, set()).add(value)
+
+        with self._lock:
+            records = self._records[name]
+            indexes = self._indexes[name]
+            # Adaylar en seçici indeksli eşitlik filtresinden alınır (id sırası korunur)
+            candidates = None
+            for field, values in equals.items():
+                if field not in indexes:
+                    continue
+                ids = [indexes[field].get(value, []) for value in values]
+                ids = ids[0] if len(ids) == 1 else sorted(i for part in ids for i in part)
+                if candidates is None or len(ids) < len(candidates[1]):
+                    candidates = (field, ids)
+
+            if candidates is None:
+                selected = self._rows[name]
+                remaining = equals
+            else:
+                selected = candidates[1]
+                remaining = {field: values for field, values in equals.items() if field != candidates[0]}
+                if remaining or ranges:
+                    selected = [records[record_id] for record_id in selected]
+
+            # Kalan filtreler yalnızca adaylar üzerinde uygulanır
+            for field, values in remaining.items():
+                selected = [r for r in selected if _as_text(r.get(field)) in values]
+            for field, compare, text in ranges:
+                selected = [r for r in selected
+                            if r.get(field) is not None and compare(r[field], _coerce(r[field], text))]
+
+            total = len(selected)
+            if '_page' in paging:
+                limit = paging.get('_limit', 10)
+                start = (paging['_page'] - 1) * limit
+                selected = selected[start:start + limit]
+            elif '_start' in paging or '_end' in paging or '_limit' in paging:
+                start = paging.get('_start', 0)
+                end = paging.get('_end', start + paging['_limit'] if '_limit' in paging else None)
+                selected = selected[start:end]
+            if candidates is not None and not remaining and not ranges:
+                selected = [records[record_id] for record_id in selected]
+        return selected, total
+
+    def patch(self, name, record_id, fields):
+        """Tek kaydı güncelleme (yoksa None)"""
+        return self.patch_many(name, [dict(fields, id=record_id)])[0]
+
+    def patch_many(self, name, updates):
+        """Birden fazla kaydı tek kilit ve tek günlük yazımıyla güncelleme
+
+        Args:
+            updates: {'id': ..., alan: değer, ...} sözlükleri listesi
+
+        Returns:
+            records: Güncellenen kayıtlar (bulunamayan id için None)
+        """
+        results, log_lines = [], []
+        with self._lock:
+            for update in updates:
+                fields = {k: v for k, v in update.items() if k != 'id'}
+                record = self._apply_patch(name, update['id'], fields)
+                results.append(record)
+                if record is not None:
+                    log_lines.append(json.dumps({'collection': name, 'id': update['id'], 'fields': fields},
+                                                ensure_ascii=False))
+            if log_lines:
+                self._versions[name] += 1
+                self._append_log(log_lines)
+        return results
+
+    def _apply_patch(self, name, record_id, fields):
+        record = self._records[name].get(record_id)
+        if record is None:
+            return None
+        for field, index in self._indexes[name].items():
+            if field in fields and fields[field] != record.get(field):
+                index[_as_text(record.get(field))].remove(record_id)
+                bisect.insort(index.setdefault(_as_text(fields[field]), []), record_id)
+        record.update(fields)
+        return record
+
+    def _append_log(self, lines):
+        if self.log_path is None:
+            return
+        if self._log_file is None:
+            self._log_file = open(self.log_path, 'a', encoding='utf-8')
+        self._log_file.write('\n'.join(lines) + '\n')
+        self._log_file.flush()
+        self._log_ops += len(lines)
+        if self._log_ops >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Güncel durumu db.json'a tek seferde yazıp günlüğü sıfırlama"""
+        if self.db_path is None:
+            return
+        with self._lock:
+            tmp_path = self.db_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({name: list(records.values()) for name, records in self._records.items()},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.db_path)
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            if self.log_path is not None and os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self._log_ops = 0
+
+    def close(self):
+        """Bekleyen günlüğü db.json'a işleyip dosyaları kapatma"""
+        if self._log_ops:
+            self.compact()
+        elif self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Bağlantılar açık tutulur (keep-alive)
+    wbufsize = -1                  # Başlık ve gövde tek parça gönderilir
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _route(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts or parts[0] not in self.server.store.collections() or len(parts) > 2:
+            return None, None, url
+        record_id = None
+        if len(parts) == 2:
+            try:
+                record_id = int(parts[1])
+            except ValueError:
+                return None, None, url
+        return parts[0], record_id, url
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def do_GET(self):
+        store = self.server.store
+        name, record_id, url = self._route()
+        if name is None:
+            return self._send_json(404, {})
+        if record_id is not None:
+            record = store.get(name, record_id)
+            return self._send_json(200 if record is not None else 404, record or {})
+
+        # Koleksiyon sürümü değişmediyse aynı sorgunun yanıtı da değişmemiştir
+        etag = f'W/"{store.instance_id}-{name}-{store.version(name)}-{url.query}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            records, total = store.query(name, parse_qsl(url.query))
+        except ValueError as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(200, records, {
+            'X-Total-Count': str(total),
+            'ETag': etag,
+            'Access-Control-Expose-Headers': 'X-Total-Count, ETag'
+        })
+
+    def do_PATCH(self):
+        store = self.server.store
+        name, record_id, _ = self._route()
+        if name is None:
+            return self._send_json(404, {})
+        try:
+            body = self._read_body()
+        except ValueError:
+            return self._send_json(400, {'error': 'Geçersiz JSON'})
+
+        if record_id is not None:
+            if not isinstance(body, dict):
+                return self._send_json(400, {'error': 'Alan sözlüğü bekleniyor'})
+            record = store.patch(name, record_id, body)
+            return self._send_json(200 if record is not None else 404, record or {})
+
+        # Toplu PATCH: [{'id': 1, 'price': ...}, ...]
+        if not isinstance(body, list) or not all(isinstance(u, dict) and 'id' in u for u in body):
+            return self._send_json(400, {'error': 'id alanlı kayıt listesi bekleniyor'})
+        results = store.patch_many(name, body)
+        self._send_json(200, {
+            'updated': [u['id'] for u, r in zip(body, results) if r is not None],
+            'missing': [u['id'] for u, r in zip(body, results) if r is None]
+        })
+
+    def _method_not_allowed(self):
+        # Yalnızca okuma ve PATCH desteklenir; gövde okunur ki bağlantı açık kalabilsin
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._send_json(405, {'error': 'Yalnızca GET ve PATCH desteklenir'}, {'Allow': 'GET, PATCH'})
+
+    do_POST = do_PUT = do_DELETE = _method_not_allowed
+
+
+class LocalAPIServer:
+    """LocalStore'u json-server uyumlu rotalarla sunan, süreç içi HTTP sunucusu
+
+    GET /<koleksiyon>[?filtreler], GET /<koleksiyon>/<id>, PATCH /<koleksiyon>/<id>
+    ve toplu PATCH /<koleksiyon> (id alanlı kayıt listesi) desteklenir. POST, PUT ve
+    DELETE 405 döndürür; kayıt ekleme/silme için json-server kullanılmalıdır.
+
+    Varsayılan adres istemcilerle aynıdır (localhost); adres ailesi (IPv4/IPv6)
+    localhost'un ilk çözümlendiği adrese göre seçilir.
+    """
+
+    def __init__(self, store, host='localhost', port=3000):
+        self.store = store
+        self.host = host
+        server_class = type('_Server', (ThreadingHTTPServer,), {
+            'address_family': socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+        })
+        self._server = server_class((host, port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.store = store
+        self._thread = None
+
+    @property
+    def url(self):
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        return f"http://{host}:{self._server.server_address[1]}"
+
+    def start(self):
+        """Sunucuyu arka plan iş parçacığında başlatma"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Sunucuyu bu iş parçacığında çalıştırma (Ctrl+C ile durdurulur)"""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            self.store.close()
+
+    def stop(self):
+        """Sunucuyu durdurup depoyu kapatma"""
+        self._server.shutdown()
+        self._server.server_close()
+        self.store.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Yerel E-Ticaret API sunucusu')
+    parser.add_argument('--db', default='db.json', help='Veri dosyası')
+    parser.add_argument('--host', default='localhost', help='Dinlenecek adres')
+    parser.add_argument('--port', type=int, default=3000, help='Port')
+    parser.add_argument('--compact-every', type=int, default=10_000, help='Günlüğün db.json\'a işlendiği işlem sayısı')
+    args = parser.parse_args()
+
+    server = LocalAPIServer(LocalStore.open(args.db, compact_every=args.compact_every), args.host, args.port)
+    print(f"API şu adreste çalışıyor: {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
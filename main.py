@@ -1,20 +1,75 @@
 from api_client import ECommerceAPI
 from data_processor import DataProcessor
+from data_cache import DataCache
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import argparse
+import requests
+import threading
 
 def main():
     # Komut satırı argümanlarını ayarla
     parser = argparse.ArgumentParser(description='E-Ticaret Veri Analizi')
     parser.add_argument('--use-api', action='store_true', help='Yerel API kullan')
+    parser.add_argument('--serve', action='store_true',
+                        help='Analizden sonra süreç içi API sunucusunu çalışır durumda tut')
+    parser.add_argument('--external-api', action='store_true',
+                        help='Süreç içi sunucuyu başlatma, 3000 portundaki json-server\'ı kullan')
+    parser.add_argument('--n-customers', type=int, default=20, help='Örnek veri için müşteri sayısı')
+    parser.add_argument('--n-rows', type=int, default=None, help='Örnek veri için hedef satır sayısı')
+    parser.add_argument('--seed', type=int, default=None, help='Örnek veri için tohum değeri')
+    parser.add_argument('--compact-json', action='store_true', help='db.json dosyasını girintisiz yaz')
+    parser.add_argument('--page-size', type=int, default=None, help='API verisini bu boyutta sayfalarla paralel çek')
+    parser.add_argument('--since', default=None,
+                        help='Yalnızca bu tarihten (YYYY-AA-GG) sonraki satışları çek')
+    parser.add_argument('--category', nargs='+', default=None, help='Yalnızca bu kategorilerin satışlarını çek')
+    parser.add_argument('--api-timeout', type=float, default=10, help='API istek zaman aşımı (sn)')
+    parser.add_argument('--cache-dir', default=None, help='Veri önbelleği klasörü (verilmezse önbellek kullanılmaz)')
+    parser.add_argument('--cache-max-mb', type=int, default=2048, help='Önbelleğin en fazla boyutu (MB)')
+    parser.add_argument('--cache-ttl', type=int, default=3600,
+                        help='API yanıtlarının sunucuya sorulmadan kullanılacağı süre (sn); sonrasında koşullu GET')
+    parser.add_argument('--refresh-cache', action='store_true', help='Önbelleği yok sayıp veriyi yeniden çek')
+    parser.add_argument('--recommendations-output', default=None,
+                        help='Tüm müşterilerin önerilerini bu Parquet dosyasına yaz')
+    parser.add_argument('--workers', type=int, default=1, help='Ön işleme ve toplu öneri için paralel süreç sayısı')
+    parser.add_argument('--partition-by', choices=['customer_id', 'date'], default='customer_id',
+                        help='Paralel ön işlemede bölümleme: müşteri karması veya tarih aralıkları')
+    parser.add_argument('--similarity-backend', choices=['exact', 'ann'], default='exact',
+                        help='Benzerlik yöntemi: kesin seyrek kosinüs veya yaklaşık (büyük kataloglar için)')
+    parser.add_argument('--push-prices', action='store_true',
+                        help='Dinamik fiyatlandırma önerilerini API\'ye toplu gönder')
+    parser.add_argument('--similarity-index', default=None,
+                        help='Benzerlik indeksi klasörü (varsa yüklenir, yoksa oluşturulup kaydedilir)')
     args = parser.parse_args()
     
     # API'den veri çekme
     print("Veri çekiliyor...")
-    api = ECommerceAPI(use_local_api=args.use_api)
-    df = api.fetch_data()
+    cache = DataCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 ** 2) if args.cache_dir else None
+    # API verisi HTTP düzeyinde (ETag / Last-Modified ile koşullu GET) önbelleğe alınır
+    api = ECommerceAPI(use_local_api=args.use_api, n_customers=args.n_customers,
+                       n_rows=args.n_rows, seed=args.seed, compact_json=args.compact_json,
+                       timeout=args.api_timeout, page_size=args.page_size,
+                       http_cache=cache if args.use_api else None,
+                       http_cache_ttl=0 if args.refresh_cache else args.cache_ttl,
+                       embedded_server=not args.external_api)
+    source = api.cache_source(since=args.since, category=args.category)
+    use_raw_cache = cache is not None and source is not None and not args.use_api
+    
+    df = None
+    if use_raw_cache and not args.refresh_cache:
+        df = cache.get_raw(source)
+        if df is not None:
+            print("Ham veri önbellekten yüklendi.")
+    if df is None:
+        try:
+            df = api.fetch_data(since=args.since, category=args.category)
+        except requests.RequestException as e:
+            print(f"API'den veri çekilemedi: {e}")
+            api.close()
+            return
+        if use_raw_cache:
+            cache.put_raw(source, df)
     
     # Veri hakkında genel bilgi
     print("\nVeri seti hakkında genel bilgi:")
@@ -35,7 +90,18 @@ def main():
     
     # Veri işleme
     print("\nVeri işleniyor...")
-    processor = DataProcessor(df)
+    df_clean = cache.get_clean(df) if cache is not None and not args.refresh_cache else None
+    if df_clean is not None:
+        print("Temizlenmiş veri önbellekten yüklendi.")
+    processor = DataProcessor(df, df_clean=df_clean, similarity_backend=args.similarity_backend,
+                              n_workers=args.workers, partition_by=args.partition_by)
+    if cache is not None and df_clean is None:
+        cache.put_clean(df, processor.df)
+    del df, df_clean  # Ham veri tutulmaz; eksik değer konumları işlemcide bit dizisi olarak saklanır
+    
+    # Bellek kullanımı
+    print("\nBellek kullanımı (ham veri -> tipli veri):")
+    print(processor.memory_report())
     
     # Eksik veri işleme sonuçları
     print("\nEksik veri temizleme sonuçları:")
@@ -63,11 +129,10 @@ def main():
     
     # 1.1 Kategori bazlı en popüler ürünler
     print("\nKategori bazlı en popüler ürünler:")
-    category_popular_products = processor.df.groupby(['category', 'product_name'])['quantity'].sum().reset_index()
-    for category in processor.df['category'].unique():
-        cat_products = category_popular_products[category_popular_products['category'] == category].sort_values('quantity', ascending=False).head(3)
+    category_popular_products = processor.category_top_products(n=3)
+    for category, cat_products in category_popular_products.groupby('category', sort=False):
         print(f"\n{category} kategorisinde en popüler 3 ürün:")
-        print(cat_products[['product_name', 'quantity']])
+        print(cat_products[['product_name', 'quantity']].to_string(index=False))
     
     # 2. Fiyat ve satış miktarı korelasyonu
     print("\nFiyat ve satış miktarı korelasyonu:")
@@ -118,32 +183,40 @@ def main():
     # 6. Dinamik fiyatlandırma önerileri
     # NumPy ile dinamik fiyatlandırma
     print("\nNumPy ile dinamik fiyatlandırma önerileri:")
-    numpy_price_updates = processor.dynamic_pricing(threshold=0.1)  # Eşik değerini 0.1'e düşürdük
+    price_updates = processor.dynamic_pricing(threshold=0.1)  # Eşik değerini 0.1'e düşürdük
     
     # Önerileri göster
-    if numpy_price_updates:
-        print(f"Toplam {len(numpy_price_updates)} ürün için fiyat güncellemesi önerildi:")
-        
-        # Kategori bazlı fiyat güncellemelerini göster
-        price_updates_df = pd.DataFrame(list(numpy_price_updates.items()), columns=['Ürün', 'Yeni Fiyat'])
-        price_updates_df['Kategori'] = price_updates_df['Ürün'].apply(
-            lambda x: processor.df[processor.df['product_name'] == x]['category'].iloc[0] if len(processor.df[processor.df['product_name'] == x]) > 0 else 'Bilinmiyor'
-        )
+    if not price_updates.empty:
+        print(f"Toplam {len(price_updates)} ürün için fiyat güncellemesi önerildi:")
         
         # Kategori bazlı grupla
-        for category in price_updates_df['Kategori'].unique():
-            cat_updates = price_updates_df[price_updates_df['Kategori'] == category]
+        for category, cat_updates in price_updates.groupby('category', sort=False):
             print(f"\n{category} kategorisinde {len(cat_updates)} ürün için fiyat güncellemesi:")
-            for _, row in cat_updates.iterrows():
-                print(f"{row['Ürün']}: {row['Yeni Fiyat']:.2f} TL")
+            for product, new_price in zip(cat_updates['product_name'], cat_updates['new_price']):
+                print(f"{product}: {new_price:.2f} TL")
     else:
         print("Fiyat güncellemesi önerilen ürün bulunamadı.")
     
+    if args.push_prices and not price_updates.empty:
+        print("\nFiyat güncellemeleri gönderiliyor...")
+        update_summary = api.update_prices(price_updates)
+        print(update_summary['status'].value_counts().to_string())
+        failed = update_summary[update_summary['status'].isin(['failed', 'partial'])]
+        for _, row in failed.iterrows():
+            print(f"{row['product_name']}: {row['n_updated']}/{row['n_rows']} satır güncellendi ({row['error']})")
+    
     # 7. Ürün önerileri
+    if args.similarity_index:
+        processor.load_similarity_index(args.similarity_index)
     print("\nÖrnek müşteri için ürün önerileri (Müşteri ID: 1):")
     recommendations = processor.product_recommendation(customer_id=1)
     print(recommendations)
     
+    if args.recommendations_output:
+        print("\nTüm müşteriler için öneriler hesaplanıyor...")
+        processor.recommend_all(output_path=args.recommendations_output, n_workers=args.workers)
+        print(f"Öneriler '{args.recommendations_output}' dosyasına kaydedildi.")
+    
     # 8. Ödeme yöntemi analizi
     print("\nÖdeme yöntemi analizi:")
     payment_analysis = processor.payment_method_analysis()
@@ -202,6 +275,7 @@ def main():
     
     # Sonuçları kaydetme
     print("\nAnaliz sonuçları kaydediliyor...")
+    # Raporlar önbelleğe alınmış toplam küpünden türetilir; tekrar çağrılar veriyi yeniden taramaz
     results = {
         'top_products': processor.analyze_top_products(),
         'category_prices': processor.category_price_analysis(),
@@ -211,9 +285,6 @@ def main():
         'cleaning_comparison': processor.compare_before_after_cleaning()
     }
     
-    # price_updates sözlüğünü DataFrame'e dönüştürme
-    price_updates_df = pd.DataFrame(list(numpy_price_updates.items()), columns=['Ürün', 'Yeni Fiyat'])
-    
     # Excel dosyasına kaydetme
     with pd.ExcelWriter('analiz_sonuclari.xlsx') as writer:
         for sheet_name, data in results.items():
@@ -223,7 +294,7 @@ def main():
                 data.to_excel(writer, sheet_name=sheet_name)
         
         # price_updates DataFrame'ini ayrıca kaydetme
-        price_updates_df.to_excel(writer, sheet_name='price_updates')
+        price_updates.to_excel(writer, sheet_name='price_updates', index=False)
     
     print("\nAnaliz tamamlandı! Sonuçlar 'analiz_sonuclari.xlsx' dosyasına kaydedildi.")
     
@@ -236,6 +307,16 @@ def main():
         print("  * Ürün filtreleme: GET http://localhost:3000/products?category=Elektronik")
         print("  * Müşteriler: GET http://localhost:3000/customers")
         print("  * Kategoriler: GET http://localhost:3000/categories")
+        print("  * Toplu güncelleme: PATCH http://localhost:3000/products  [{\"id\": 1, \"price\": 100}, ...]")
+        
+        if args.serve and api.server is not None:
+            print("\nSunucu çalışmaya devam ediyor (durdurmak için Ctrl+C)...")
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                pass
+    
+    api.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
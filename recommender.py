@@ -0,0 +1,640 @@
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+
+def _top_k_per_row(block, k, row_offset=0):
+    """Seyrek bloğun her satırında en yüksek k skoru seçme (kendisi hariç)
+
+    Eşit skorlarda küçük ürün kodu (alfabetik sıra) önce gelir.
+
+    Returns:
+        rows, cols, scores: Seçilen elemanlar (satır sırasına göre, skor azalan)
+    """
+    block = block.tocoo()
+    keep = (block.row + row_offset) != block.col
+    rows, cols, scores = _top_k_triples(block.row[keep], block.col[keep], block.data[keep], k, positive=False)
+    return rows + row_offset, cols, scores
+
+
+def _top_k_triples(rows, cols, scores, k, positive=True):
+    """(satır, sütun, skor) üçlülerinden her satırın en yüksek k skoru (eşitlikte küçük sütun önce)
+
+    positive=True ise pozitif olmayan skorlar önce atılır.
+    """
+    if positive:
+        keep = scores > 0
+        rows, cols, scores = rows[keep], cols[keep], scores[keep]
+    order = np.lexsort((cols, -scores, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+
+    # Satır içindeki sıra: pozisyon - satırın ilk pozisyonu
+    row_starts = np.searchsorted(rows, rows, side='left')
+    rank = np.arange(len(rows)) - row_starts
+    selected = rank < k
+    return rows[selected], cols[selected], scores[selected]
+
+
+class ItemSimilarityIndex:
+    """Seyrek müşteri x ürün matrisi üzerinde ürün-ürün benzerlik indeksi
+
+    Benzerlik matrisi bir kez, ürün blokları halinde hesaplanır ve her ürün
+    için yalnızca en benzer top_k komşu saklanır (CSR: indptr, neighbors,
+    scores). Müşteri önerileri bu indeks üzerinde seyrek satır okumalarıyla
+    üretilir; yoğun pivot tablo veya ürün x ürün matris oluşturulmaz.
+    """
+
+    # Disk formatı değiştiğinde artırılır; farklı sürümdeki indeksler yüklenmez
+    FORMAT_VERSION = 1
+
+    def __init__(self, customers, products, interactions, indptr, neighbors, scores, data_hash=None,
+                 backend='exact'):
+        self.customers = customers          # Müşteri ID'leri (satır sırası)
+        self.products = products            # Ürün adları (sütun sırası)
+        self.interactions = interactions    # Müşteri x ürün CSR (ortalama memnuniyet)
+        self.indptr = indptr                # Ürün başına komşu aralığı
+        self.neighbors = neighbors          # Komşu ürün kodları (int32)
+        self.scores = scores                # Kosinüs benzerlikleri (float32)
+        self.data_hash = data_hash or self.interaction_hash(customers, products, interactions)
+        self.backend = backend              # Komşuların hesaplandığı yöntem ('exact' veya 'ann')
+        self.ann_index = None               # 'ann' ile oluşturulduysa ApproximateItemIndex
+        self.path = None                    # save()/load() klasörü (komşu matrisleri de buraya yazılır)
+        self._customer_positions = pd.Index(customers)
+        self._neighbor_matrices = {}
+
+    @staticmethod
+    def interaction_hash(customers, products, interactions):
+        """İndeksin oluşturulduğu etkileşim verisinin özeti (müşteriler, ürünler ve CSR dizileri)"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(p) for p in products], ensure_ascii=False).encode('utf-8'))
+        digest.update(np.ascontiguousarray(customers, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(interactions.indptr, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(interactions.indices, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(interactions.data, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def save(self, path):
+        """İndeksi düz diziler halinde (.npy) bir klasöre kaydetme
+
+        Dosyalar önce geçici bir klasöre yazılır ve klasör sonra yerine taşınır;
+        eski indeksi bellek eşlemeli kullanan süreçler etkilenmez.
+        """
+        final_path = path
+        path = f"{final_path}.tmp-{os.getpid()}"
+        os.makedirs(path, exist_ok=True)
+        index_dtype = np.int32 if self.interactions.nnz < np.iinfo(np.int32).max else np.int64
+        arrays = {
+            'customers': np.asarray(self.customers, dtype=np.int64),
+            'indptr': np.asarray(self.indptr, dtype=np.int64),
+            'neighbors': np.asarray(self.neighbors, dtype=np.int32),
+            'scores': np.asarray(self.scores, dtype=np.float32),
+            'interactions_indptr': self.interactions.indptr.astype(index_dtype),
+            'interactions_indices': self.interactions.indices.astype(index_dtype),
+            'interactions_data': self.interactions.data.astype(np.float64),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        with open(os.path.join(path, 'products.json'), 'w', encoding='utf-8') as f:
+            json.dump([str(p) for p in self.products], f, ensure_ascii=False)
+        # meta.json en son yazılır; yarım kalmış kayıtlar yüklenmez
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': self.FORMAT_VERSION,
+                'data_hash': self.data_hash,
+                'backend': self.backend,
+                'n_customers': len(self.customers),
+                'n_products': len(self.products)
+            }, f)
+
+        if os.path.exists(final_path):
+            old_path = f"{final_path}.old-{os.getpid()}"
+            os.replace(final_path, old_path)
+            os.replace(path, final_path)
+            shutil.rmtree(old_path)
+        else:
+            os.replace(path, final_path)
+        self.path = final_path
+
+    @classmethod
+    def load(cls, path, expected_hash=None):
+        """Kaydedilmiş indeksi bellek eşlemeli (np.memmap) olarak yükleme
+
+        Diziler kopyalanmadan diskten eşlenir; aynı dosyayı açan süreçler
+        işletim sisteminin sayfa önbelleğindeki tek fiziksel kopyayı paylaşır.
+
+        Args:
+            path: save() ile yazılmış klasör
+            expected_hash: Verilirse indeksin oluşturulduğu verinin özetiyle karşılaştırılır
+
+        Raises:
+            ValueError: Format sürümü veya veri özeti uyuşmazsa
+        """
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen indeks sürümü: {meta.get('format_version')}")
+        if expected_hash is not None and meta['data_hash'] != expected_hash:
+            raise ValueError("Benzerlik indeksi güncel değil: veri özeti uyuşmuyor")
+
+        def mapped(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+
+        with open(os.path.join(path, 'products.json'), encoding='utf-8') as f:
+            products = np.array(json.load(f), dtype=object)
+        customers = mapped('customers')
+        interactions = sparse.csr_matrix(
+            (mapped('interactions_data'), mapped('interactions_indices'), mapped('interactions_indptr')),
+            shape=(meta['n_customers'], meta['n_products']),
+            copy=False
+        )
+        index = cls(customers, products, interactions, mapped('indptr'), mapped('neighbors'),
+                    mapped('scores'), data_hash=meta['data_hash'], backend=meta.get('backend', 'exact'))
+        index.path = path
+        return index
+
+    @staticmethod
+    def build_interactions(df, value_column='satisfaction_score'):
+        """Müşteri x ürün seyrek matrisi (pivot_table(aggfunc='mean', fill_value=0) karşılığı)"""
+        customer_codes, customers = pd.factorize(df['customer_id'], sort=True)
+        product_codes, products = pd.factorize(df['product_name'], sort=True)
+        valid = (customer_codes >= 0) & (product_codes >= 0)
+
+        values = pd.Series(df[value_column].to_numpy()[valid], dtype=float)
+        means = values.groupby([customer_codes[valid], product_codes[valid]]).mean()
+        rows = means.index.get_level_values(0).to_numpy()
+        cols = means.index.get_level_values(1).to_numpy()
+        interactions = sparse.csr_matrix(
+            (means.to_numpy(), (rows, cols)), shape=(len(customers), len(products))
+        )
+        interactions.eliminate_zeros()
+        return np.asarray(customers), np.asarray(products, dtype=object), interactions
+
+    @classmethod
+    def from_frame(cls, df, top_k=20, value_column='satisfaction_score', block_size=1024,
+                   backend='exact', ann_options=None):
+        """Satış verisinden indeks oluşturma
+
+        Args:
+            df: Temizlenmiş satış verisi
+            top_k: Ürün başına saklanacak komşu sayısı
+            value_column: Etkileşim değeri olarak kullanılacak sütun
+            block_size: Benzerlik hesabında aynı anda işlenen ürün sayısı
+            backend: 'exact' (seyrek kosinüs) veya 'ann' (ApproximateItemIndex)
+            ann_options: 'ann' için ApproximateItemIndex.from_interactions argümanları
+        """
+        customers, products, interactions = cls.build_interactions(df, value_column)
+        return cls.from_interactions(customers, products, interactions, top_k, block_size, backend, ann_options)
+
+    @classmethod
+    def from_interactions(cls, customers, products, interactions, top_k=20, block_size=1024,
+                          backend='exact', ann_options=None):
+        """Hazır etkileşim matrisinden indeks oluşturma"""
+        if backend == 'exact':
+            indptr, neighbors, scores = cls._similarity_top_k(interactions, top_k, block_size)
+            ann_index = None
+        elif backend == 'ann':
+            # Komşular ürün sayısının karesiyle büyüyen çarpım yerine IVF sorgularıyla bulunur
+            ann_index = ApproximateItemIndex.from_interactions(products, interactions, **(ann_options or {}))
+            indptr, neighbors, scores = ann_index.top_k(top_k)
+        else:
+            raise ValueError(f"Bilinmeyen benzerlik yöntemi: {backend}")
+        index = cls(customers, products, interactions, indptr, neighbors, scores, backend=backend)
+        index.ann_index = ann_index
+        return index
+
+    @staticmethod
+    def _similarity_top_k(interactions, top_k, block_size):
+        """Sütun kosinüs benzerliğini bloklar halinde hesaplayıp top_k komşuyu tutma"""
+        n_products = interactions.shape[1]
+        norms = np.sqrt(np.asarray(interactions.multiply(interactions).sum(axis=0))).ravel()
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        normalized = sparse.csc_matrix(interactions @ sparse.diags(inverse))
+        normalized_t = normalized.T.tocsr()
+
+        all_rows, all_cols, all_scores = [], [], []
+        for start in range(0, n_products, block_size):
+            block = normalized_t[start:start + block_size] @ normalized
+            rows, cols, scores = _top_k_per_row(block, top_k, row_offset=start)
+            all_rows.append(rows)
+            all_cols.append(cols)
+            all_scores.append(scores)
+
+        rows = np.concatenate(all_rows) if all_rows else np.array([], dtype=int)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_products))]).astype(np.int64)
+        neighbors = (np.concatenate(all_cols) if all_cols else np.array([])).astype(np.int32)
+        scores = (np.concatenate(all_scores) if all_scores else np.array([])).astype(np.float32)
+        return indptr, neighbors, scores
+
+    def similar_products(self, product_name, n=5):
+        """Bir ürüne en benzer n ürün (benzerlik skoruyla)"""
+        code = np.searchsorted(self.products, product_name)
+        if code >= len(self.products) or self.products[code] != product_name:
+            return pd.Series(dtype=float)
+        start, end = self.indptr[code], min(self.indptr[code] + n, self.indptr[code + 1])
+        return pd.Series(self.scores[start:end], index=self.products[self.neighbors[start:end]])
+
+    def customer_products(self, customer_id):
+        """Müşterinin etkileşimde bulunduğu ürün kodları"""
+        position = self._customer_positions.get_indexer([customer_id])[0]
+        if position < 0:
+            return np.array([], dtype=np.int32)
+        return self.interactions.indices[self.interactions.indptr[position]:self.interactions.indptr[position + 1]]
+
+    def _neighbor_matrix_files(self, per_product):
+        return {part: os.path.join(self.path, f"neighbor_matrix_{per_product}_{part}.npy")
+                for part in ('data', 'indices', 'indptr')}
+
+    def neighbor_matrix(self, per_product=5):
+        """Her ürünün ilk per_product komşusundan oluşan ürün x ürün CSR matrisi
+
+        Matris save_neighbor_matrix ile indeks klasörüne yazılmışsa hesaplanmaz,
+        bellek eşlemeli olarak okunur.
+        """
+        if per_product in self._neighbor_matrices:
+            return self._neighbor_matrices[per_product]
+        if self.path is not None:
+            files = self._neighbor_matrix_files(per_product)
+            if all(os.path.exists(file) for file in files.values()):
+                matrix = sparse.csr_matrix(
+                    tuple(np.load(files[part], mmap_mode='r') for part in ('data', 'indices', 'indptr')),
+                    shape=(len(self.products), len(self.products)), copy=False
+                )
+                self._neighbor_matrices[per_product] = matrix
+                return matrix
+        counts = np.diff(self.indptr)
+        rank = np.arange(len(self.neighbors)) - np.repeat(self.indptr[:-1], counts)
+        keep = rank < per_product
+        rows = np.repeat(np.arange(len(self.products)), counts)[keep]
+        matrix = sparse.csr_matrix(
+            (self.scores[keep].astype(float), (rows, self.neighbors[keep])),
+            shape=(len(self.products), len(self.products))
+        )
+        self._neighbor_matrices[per_product] = matrix
+        return matrix
+
+    def save_neighbor_matrix(self, per_product=5):
+        """Komşu matrisini kaydedilmiş indeks klasörüne yazma (diğer süreçler yalnızca eşler)"""
+        if self.path is None:
+            raise ValueError("Komşu matrisi yazmak için indeks önce save() ile kaydedilmeli")
+        matrix = self.neighbor_matrix(per_product)
+        for part, file in self._neighbor_matrix_files(per_product).items():
+            if not os.path.exists(file):
+                temporary = f"{file[:-len('.npy')]}.tmp-{os.getpid()}.npy"
+                np.save(temporary, getattr(matrix, part))
+                os.replace(temporary, file)
+
+    def _score_positions(self, positions, n, neighbor_matrix):
+        """Müşteri satırları için skorlar: satın alınan ürünler x komşu matrisi (tek seyrek çarpım)
+
+        Returns:
+            rows, cols, scores: Her müşteri satırı için en yüksek n ürün
+        """
+        purchased = self.interactions[positions]
+        purchased.data = np.ones_like(purchased.data)
+        scores = (purchased @ neighbor_matrix).tocoo()
+        order = np.lexsort((scores.col, -scores.data, scores.row))
+        rows, cols, values = scores.row[order], scores.col[order], scores.data[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows, side='left')
+        keep = rank < n
+        return rows[keep], cols[keep], values[keep]
+
+    def recommend_batch(self, customer_ids, n=5, per_product=5):
+        """Birden fazla müşteri için öneriler (toplam benzerlik skoruna göre sıralı)
+
+        Returns:
+            recommendations: customer_id, rank, product_name, score sütunlu DataFrame
+        """
+        positions = self._customer_positions.get_indexer(customer_ids)
+        positions = positions[positions >= 0]
+        rows, cols, scores = self._score_positions(positions, n, self.neighbor_matrix(per_product))
+        return self._to_frame(positions, rows, cols, scores)
+
+    def _to_frame(self, positions, rows, cols, scores):
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows, side='left') + 1
+        return pd.DataFrame({
+            'customer_id': self.customers[positions[rows]],
+            'rank': rank.astype(np.int16),
+            'product_name': self.products[cols],
+            'score': scores.astype(np.float32)
+        })
+
+    def iter_recommendations(self, n=5, per_product=5, block_size=50_000, n_workers=1):
+        """Tüm müşteriler için önerileri müşteri blokları halinde üretme
+
+        n_workers > 1 ise bloklar süreç havuzunda hesaplanır. İşçilere indeksin
+        kendisi değil kayıt klasörü verilir: indeks ve komşu matrisi klasörden
+        bellek eşlemeli açılır, böylece tüm süreçler (fork, spawn veya forkserver)
+        sayfa önbelleğindeki tek fiziksel kopyayı paylaşır. Kaydedilmemiş indeks
+        geçici bir klasöre yazılır.
+
+        Yields:
+            recommendations: Bloktaki müşterilerin önerileri (DataFrame)
+        """
+        blocks = [np.arange(start, min(start + block_size, len(self.customers)))
+                  for start in range(0, len(self.customers), block_size)]
+        if n_workers <= 1:
+            neighbor_matrix = self.neighbor_matrix(per_product)
+            for positions in blocks:
+                yield self._to_frame(positions, *self._score_positions(positions, n, neighbor_matrix))
+            return
+
+        temporary = None
+        if self.path is None:
+            temporary = tempfile.mkdtemp(prefix='similarity-index-')
+            self.save(os.path.join(temporary, 'index'))
+        try:
+            self.save_neighbor_matrix(per_product)
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(self.path, self.data_hash, per_product)) as executor:
+                for positions, result in zip(blocks, executor.map(_recommend_block, blocks, [n] * len(blocks))):
+                    yield self._to_frame(positions, *result)
+        finally:
+            if temporary is not None:
+                self.path = None
+                shutil.rmtree(temporary)
+
+    def recommend_all(self, n=5, per_product=5, block_size=50_000, n_workers=1):
+        """Tüm müşteriler için öneriler (tek DataFrame)"""
+        return pd.concat(list(self.iter_recommendations(n, per_product, block_size, n_workers)), ignore_index=True)
+
+    def write_recommendations(self, path, n=5, per_product=5, block_size=50_000, n_workers=1):
+        """Tüm müşterilerin önerilerini bloklar halinde Parquet dosyasına yazma
+
+        Returns:
+            n_rows: Yazılan öneri satırı sayısı
+        """
+        writer = None
+        n_rows = 0
+        try:
+            for frame in self.iter_recommendations(n, per_product, block_size, n_workers):
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                n_rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return n_rows
+
+    def recommend(self, customer_id, n=5, per_product=5):
+        """Müşterinin ürünlerinin en benzer komşularından öneri listesi
+
+        Adaylar, müşterinin ürünleriyle toplam benzerlik skoruna göre sıralanır
+        (eşitlikte ürün adı); sonuç her çağrıda aynıdır.
+        """
+        recommendations = self.recommend_batch([customer_id], n=n, per_product=per_product)
+        return recommendations['product_name'].tolist()
+
+
+def _randomized_svd(matrix, n_components, n_iter=4, n_oversamples=10, seed=0):
+    """Seyrek matrisin kesik SVD'si (rastgele izdüşüm + kuvvet iterasyonu, Halko vd.)
+
+    Alt uzay sütun (ürün) tarafında aranır; QR ayrışımları müşteri sayısından
+    bağımsız, ürün sayısı boyutunda kalır.
+
+    Returns:
+        singular_values, vt: En büyük n_components tekil değer ve sağ tekil vektörler
+    """
+    rng = np.random.default_rng(seed)
+    matrix_t = matrix.T.tocsr()
+    q = rng.standard_normal((matrix.shape[1], min(n_components + n_oversamples, min(matrix.shape))))
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(q)
+        q = matrix_t @ (matrix @ q)
+    q, _ = np.linalg.qr(q)
+    _, singular_values, wt = np.linalg.svd(matrix @ q, full_matrices=False)
+    return singular_values[:n_components], (wt @ q.T)[:n_components]
+
+
+def _spherical_kmeans(vectors, n_clusters, n_iter=10, seed=0, block_size=65_536):
+    """Birim vektörler üzerinde k-means (kosinüs benzerliğine göre atama)
+
+    Returns:
+        centroids, labels: Birim uzunluklu merkezler ve her vektörün kümesi
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)]
+    labels = np.zeros(len(vectors), dtype=np.int32)
+    for _ in range(n_iter):
+        for start in range(0, len(vectors), block_size):
+            labels[start:start + block_size] = np.argmax(vectors[start:start + block_size] @ centroids.T, axis=1)
+        assignment = sparse.csr_matrix(
+            (np.ones(len(vectors), dtype=vectors.dtype), (labels, np.arange(len(vectors)))),
+            shape=(n_clusters, len(vectors))
+        )
+        sums = np.asarray(assignment @ vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Boş kalan kümeler eski merkezlerini korur
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids).astype(vectors.dtype)
+    return centroids, labels
+
+
+class ApproximateItemIndex:
+    """Ürün gömmeleri üzerinde yaklaşık en yakın komşu (IVF) indeksi
+
+    Ürünler, etkileşim matrisinin kesik SVD'sinden elde edilen düşük boyutlu
+    birim vektörlerle temsil edilir ve küresel k-means ile n_lists listeye
+    ayrılır. Sorgu yalnızca merkezi sorguya en yakın n_probe listedeki
+    ürünleri tarar; n_probe arttıkça isabet (recall) artar, hız düşer.
+    """
+
+    def __init__(self, products, embeddings, centroids, list_indptr, list_members, n_probe=4, rerank=0,
+                 item_vectors=None):
+        self.products = products            # Ürün adları (kod sırası)
+        self.embeddings = embeddings        # Ürün x boyut birim vektörler (float32)
+        self.item_vectors = item_vectors    # Ürün x müşteri normalize CSR (kesin yeniden sıralama için)
+        self.centroids = centroids          # Liste merkezleri
+        self.list_indptr = list_indptr      # Liste başına üye aralığı
+        self.list_members = list_members    # Listelere göre sıralı ürün kodları
+        self.n_probe = n_probe
+        self.rerank = rerank
+
+    @classmethod
+    def from_interactions(cls, products, interactions, n_components=64, n_lists=None, n_probe=4, rerank=0, seed=0):
+        """Müşteri x ürün etkileşim matrisinden indeks oluşturma
+
+        Args:
+            products: Ürün adları (matris sütun sırası)
+            interactions: Müşteri x ürün seyrek matris
+            n_components: Gömme boyutu
+            n_lists: Liste sayısı (varsayılan: ürün sayısının karekökü)
+            n_probe: Sorguda taranacak varsayılan liste sayısı
+            rerank: Varsayılan kesin yeniden sıralama çarpanı (bkz. search)
+            seed: SVD ve k-means için tohum değeri
+        """
+        n_products = interactions.shape[1]
+        singular_values, vt = _randomized_svd(sparse.csr_matrix(interactions, dtype=float),
+                                              min(n_components, min(interactions.shape)), seed=seed)
+        # Sütunların iç çarpımı X^T X = V S^2 V^T olduğundan gömme V S'dir
+        embeddings = (vt.T * singular_values).astype(np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+
+        n_lists = n_lists or max(1, int(np.sqrt(n_products)))
+        n_lists = min(n_lists, n_products)
+        centroids, labels = _spherical_kmeans(embeddings, n_lists, seed=seed)
+        list_members = np.argsort(labels, kind='stable').astype(np.int32)
+        list_indptr = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))]).astype(np.int64)
+
+        interactions = sparse.csr_matrix(interactions, dtype=float)
+        column_norms = np.sqrt(np.asarray(interactions.multiply(interactions).sum(axis=0))).ravel()
+        inverse = np.divide(1.0, column_norms, out=np.zeros_like(column_norms), where=column_norms > 0)
+        item_vectors = (interactions @ sparse.diags(inverse)).T.tocsr()
+        return cls(np.asarray(products, dtype=object), embeddings, centroids, list_indptr, list_members,
+                   n_probe, rerank, item_vectors)
+
+    def search(self, code, k=10, n_probe=None, rerank=None):
+        """Tek bir ürün koduna en benzer k ürün (kendisi ve pozitif olmayan skorlar hariç)
+
+        Args:
+            code: Sorgu ürün kodu
+            k: Komşu sayısı
+            n_probe: Taranacak liste sayısı (varsayılan: self.n_probe)
+            rerank: 0'dan büyükse gömmelere göre en iyi k * rerank aday, etkileşim
+                vektörleriyle kesin kosinüse göre yeniden sıralanır (varsayılan: self.rerank)
+
+        Returns:
+            neighbors, scores: Skora göre azalan ürün kodları ve kosinüs benzerlikleri
+        """
+        _, neighbors, scores = self.search_batch(np.array([code]), k, n_probe, rerank)
+        return neighbors, scores
+
+    def _probe_lists(self, codes, n_probe, block_size=65_536):
+        """Her sorgu için merkezi en yakın n_probe liste (sorgu x n_probe)"""
+        if n_probe >= len(self.centroids):
+            return np.broadcast_to(np.arange(len(self.centroids)), (len(codes), len(self.centroids)))
+        probes = np.empty((len(codes), n_probe), dtype=np.int64)
+        for start in range(0, len(codes), block_size):
+            centroid_scores = self.embeddings[codes[start:start + block_size]] @ self.centroids.T
+            probes[start:start + block_size] = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+        return probes
+
+    def search_batch(self, codes, k=10, n_probe=None, rerank=None, block_size=4096):
+        """Birden fazla sorgu ürünü için search (liste bazında toplu)
+
+        Sorgular taradıkları listelere göre gruplanır; her liste için o listeyi
+        tarayan tüm sorguların skorları tek matris çarpımıyla hesaplanır ve satır
+        başına en iyi k aday tek argpartition ile seçilir. Listeler ayrık
+        olduğundan sorgunun sonucu listelerindeki adayların en iyi k'sidir.
+
+        Returns:
+            rows, neighbors, scores: codes içindeki sorgu sırası, komşu ürün kodları ve
+                kosinüs benzerlikleri (sorgu sırasına, sorgu içinde skor azalan)
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        rerank = self.rerank if rerank is None else rerank
+        if rerank:
+            rows, candidates, _ = self.search_batch(codes, k * rerank, n_probe, rerank=0, block_size=block_size)
+            scores = np.concatenate([np.zeros(0)] + [
+                np.asarray(self.item_vectors[codes[rows[start:start + 65_536]]].multiply(
+                    self.item_vectors[candidates[start:start + 65_536]]).sum(axis=1)).ravel()
+                for start in range(0, len(rows), 65_536)
+            ])
+            return _top_k_triples(rows, candidates, scores, k)
+
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probes = self._probe_lists(codes, n_probe)
+        query_rows = np.repeat(np.arange(len(codes)), probes.shape[1])
+        lists = probes.ravel()
+        order = np.argsort(lists, kind='stable')
+        query_rows, lists = query_rows[order], lists[order]
+        bounds = np.searchsorted(lists, np.arange(len(self.centroids) + 1))
+
+        all_rows, all_cols, all_scores = [], [], []
+        for p in np.flatnonzero(np.diff(bounds)):
+            members = self.list_members[self.list_indptr[p]:self.list_indptr[p + 1]]
+            if len(members) == 0:
+                continue
+            member_vectors = self.embeddings[members].T
+            for start in range(bounds[p], bounds[p + 1], block_size):
+                rows = query_rows[start:min(start + block_size, bounds[p + 1])]
+                scores = self.embeddings[codes[rows]] @ member_vectors
+                scores[codes[rows][:, None] == members[None, :]] = 0  # Sorgunun kendisi (pozitif olmayanlar atılır)
+                if len(members) > k:
+                    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                else:
+                    top = np.broadcast_to(np.arange(len(members)), scores.shape)
+                all_rows.append(np.repeat(rows, top.shape[1]))
+                all_cols.append(members[top].ravel())
+                all_scores.append(np.take_along_axis(scores, top, axis=1).ravel())
+
+        if not all_rows:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int32), np.array([], dtype=np.float32)
+        return _top_k_triples(np.concatenate(all_rows), np.concatenate(all_cols), np.concatenate(all_scores), k)
+
+    def similar_products(self, product_name, n=5, n_probe=None, rerank=None):
+        """Bir ürüne en benzer n ürün (yaklaşık benzerlik skoruyla)"""
+        code = np.searchsorted(self.products, product_name)
+        if code >= len(self.products) or self.products[code] != product_name:
+            return pd.Series(dtype=float)
+        neighbors, scores = self.search(code, n, n_probe, rerank)
+        return pd.Series(scores, index=self.products[neighbors])
+
+    def top_k(self, k, n_probe=None, rerank=None):
+        """Tüm ürünler için komşu listeleri (ItemSimilarityIndex'in CSR biçiminde, tek toplu arama)"""
+        n_products = len(self.products)
+        rows, neighbors, scores = self.search_batch(np.arange(n_products), k, n_probe, rerank)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n_products))]).astype(np.int64)
+        return indptr, neighbors.astype(np.int32), scores.astype(np.float32)
+
+    def recall_report(self, exact_index, k=10, n_probes=(1, 2, 4, 8, 16), reranks=(0, 10), sample=1000, seed=0):
+        """Kesin indekse göre isabet (recall@k) ve sorgu süresi raporu
+
+        Args:
+            exact_index: Aynı ürünlerle kesin yöntemle oluşturulmuş ItemSimilarityIndex
+            k: Karşılaştırılacak komşu sayısı (exact_index'in top_k değerini aşmamalı)
+            n_probes: Denenecek taranan liste sayıları
+            reranks: Denenecek yeniden sıralama çarpanları (0: yalnızca gömmeler)
+            sample: Örneklenecek sorgu ürünü sayısı
+
+        Returns:
+            report: n_probe, rerank, recall, ms_per_query sütunlu DataFrame
+        """
+        rng = np.random.default_rng(seed)
+        has_neighbors = np.flatnonzero(np.diff(exact_index.indptr) > 0)
+        codes = rng.choice(has_neighbors, min(sample, len(has_neighbors)), replace=False)
+        truth = [set(exact_index.neighbors[exact_index.indptr[c]:min(exact_index.indptr[c] + k, exact_index.indptr[c + 1])])
+                 for c in codes]
+
+        rows = []
+        for n_probe in n_probes:
+            if n_probe > len(self.centroids):
+                continue
+            for rerank in reranks:
+                start = time.perf_counter()
+                found = [self.search(code, k, n_probe, rerank)[0] for code in codes]
+                elapsed = time.perf_counter() - start
+                hits = sum(len(expected.intersection(result)) for expected, result in zip(truth, found))
+                rows.append({
+                    'n_probe': n_probe,
+                    'rerank': rerank,
+                    'recall': hits / max(sum(len(expected) for expected in truth), 1),
+                    'ms_per_query': elapsed * 1000 / max(len(codes), 1)
+                })
+        return pd.DataFrame(rows)
+
+
+# Süreç havuzu işçileri için indeks ve komşu matrisi (işçi başına bir kez eşlenir)
+_worker_state = {}
+
+
+def _init_worker(path, data_hash, per_product):
+    index = ItemSimilarityIndex.load(path, expected_hash=data_hash)
+    _worker_state['index'] = index
+    _worker_state['neighbor_matrix'] = index.neighbor_matrix(per_product)
+
+
+def _recommend_block(positions, n):
+    index = _worker_state['index']
+    return index._score_positions(positions, n, _worker_state['neighbor_matrix'])
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+# Satır konumu indeksi tutulan anahtar sütunlar
+INDEXED_COLUMNS = ('product_name', 'category', 'customer_id')
+
+
+class _KeyIndex:
+    """Bir anahtar sütun için kategori kodları ve anahtar bazlı satır konumları
+
+    Satır konumları koda göre (kararlı) sıralanıp tek dizide tutulur; k.
+    anahtarın satırları order[indptr[k]:indptr[k + 1]] aralığındadır (CSR gibi).
+    """
+
+    def __init__(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            keys = values.cat.categories
+        else:
+            codes, keys = pd.factorize(values, sort=True)
+        self.keys = pd.Index(keys)
+        self.codes = codes
+        order = np.argsort(codes, kind='stable')
+        n_missing = int(np.count_nonzero(codes < 0))  # -1 kodlu (eksik) satırlar başta kalır
+        self.order = order[n_missing:]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.keys))
+        self.indptr = np.concatenate([[0], np.cumsum(counts)])
+
+    def lookup(self, values):
+        """Anahtar değerlerinin kodları (bulunmayan değerler atlanır)"""
+        codes = self.keys.get_indexer(values)
+        return codes[codes >= 0]
+
+    def size(self, codes):
+        return int(sum(self.indptr[c + 1] - self.indptr[c] for c in codes))
+
+    def positions(self, codes):
+        parts = [self.order[self.indptr[c]:self.indptr[c + 1]] for c in codes]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=self.order.dtype)
+
+
+class SalesStore:
+    """Satış verisi üzerinde ikincil indeksler ve sorgu arayüzü
+
+    Ürün, kategori ve müşteri sütunları için kategori kodları ve anahtar bazlı
+    satır konumları, tarih sütunu için sıralı bir indeks bir kez oluşturulur.
+    Böylece df[df['category'] == ...] gibi tüm tabloyu tarayan maskeler yerine
+    sorgular yalnızca eşleşen satırları dolaşır: anahtar aramaları O(sonuç),
+    tarih aralıkları O(log n + sonuç) sürer.
+
+    Kullanım:
+        store = SalesStore(df)
+        store.query(category='Elektronik', start='2024-06-01')
+        store.query(customer_id=[1, 2], columns=['product_name', 'quantity'])
+    """
+
+    def __init__(self, df, columns=INDEXED_COLUMNS, date_column='purchase_date'):
+        self.df = df
+        self._indexes = {column: _KeyIndex(df[column]) for column in columns if column in df.columns}
+        self.date_column = date_column if date_column in df.columns else None
+        if self.date_column is not None:
+            dates = pd.to_datetime(df[date_column]).to_numpy('datetime64[ns]')
+            order = np.argsort(dates, kind='stable')  # NaT değerleri sona sıralanır
+            n_valid = len(dates) - int(np.count_nonzero(np.isnat(dates)))
+            self._dates = dates
+            self._date_order = order[:n_valid]
+            self._sorted_dates = dates[self._date_order]
+
+    def __len__(self):
+        return len(self.df)
+
+    def keys(self, column):
+        """İndeksli sütunun (sıralı) benzersiz değerleri"""
+        return self._indexes[column].keys
+
+    def counts(self, column):
+        """İndeksli sütunda değer bazında satır sayıları"""
+        index = self._indexes[column]
+        return pd.Series(np.diff(index.indptr), index=index.keys, name='count')
+
+    def date_range(self):
+        """En eski ve en yeni satış tarihi"""
+        if self.date_column is None or len(self._sorted_dates) == 0:
+            return pd.NaT, pd.NaT
+        return pd.Timestamp(self._sorted_dates[0]), pd.Timestamp(self._sorted_dates[-1])
+
+    def _date_bounds(self, start, end):
+        """Sıralı tarih indeksinde [start, end) aralığının sınırları"""
+        start = None if start is None else np.datetime64(pd.Timestamp(start), 'ns')
+        end = None if end is None else np.datetime64(pd.Timestamp(end), 'ns')
+        lo = 0 if start is None else int(np.searchsorted(self._sorted_dates, start, 'left'))
+        hi = len(self._sorted_dates) if end is None else int(np.searchsorted(self._sorted_dates, end, 'left'))
+        return lo, max(lo, hi), start, end
+
+    def positions(self, start=None, end=None, **filters):
+        """Filtrelere uyan satırların konumları (artan sırada)
+
+        Aday satırlar en seçici koşuldan alınır (boyutu indeksten okunur), kalan
+        koşullar yalnızca bu adaylar üzerinde kodlarla kontrol edilir.
+
+        Args:
+            start: Bu tarih ve sonrası (dahil)
+            end: Bu tarihten öncesi (hariç)
+            **filters: {indeksli sütun: değer veya değer listesi}
+
+        Raises:
+            KeyError: Filtre sütunu indeksli değilse
+        """
+        conditions = []
+        for column, value in filters.items():
+            if column not in self._indexes:
+                raise KeyError(f"'{column}' sütunu için indeks yok")
+            values = list(value) if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)) else [value]
+            codes = self._indexes[column].lookup(values)
+            conditions.append((self._indexes[column].size(codes), column, codes))
+        if start is not None or end is not None:
+            if self.date_column is None:
+                raise KeyError("tarih indeksi yok")
+            bounds = self._date_bounds(start, end)
+            conditions.append((bounds[1] - bounds[0], None, bounds))
+
+        if not conditions:
+            return np.arange(len(self.df))
+        conditions.sort(key=lambda condition: condition[0])
+
+        _, column, arg = conditions[0]
+        if column is None:
+            positions = np.sort(self._date_order[arg[0]:arg[1]])
+        else:
+            positions = self._indexes[column].positions(arg)
+
+        for _, column, arg in conditions[1:]:
+            if len(positions) == 0:
+                break
+            if column is None:
+                _, _, start, end = arg
+                dates = self._dates[positions]
+                keep = ~np.isnat(dates)
+                if start is not None:
+                    keep &= dates >= start
+                if end is not None:
+                    keep &= dates < end
+            else:
+                keep = np.isin(self._indexes[column].codes[positions], arg)
+            positions = positions[keep]
+        return positions
+
+    def query(self, columns=None, start=None, end=None, **filters):
+        """Filtrelere uyan satırlar (özgün satır sırasıyla)
+
+        Args:
+            columns: Döndürülecek sütunlar (varsayılan: tümü)
+            start, end, **filters: positions() ile aynı
+        """
+        frame = self.df if columns is None else self.df[list(columns)]
+        return frame.take(self.positions(start, end, **filters))
+
+    def groups(self, column):
+        """İndeksli sütunun her değeri için (değer, satır konumları) çiftleri"""
+        index = self._indexes[column]
+        for code, key in enumerate(index.keys):
+            yield key, index.order[index.indptr[code]:index.indptr[code + 1]]
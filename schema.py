@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+# Temizlenmiş satış verisinin sütun tipleri. Düşük kardinaliteli metinler
+# kategorik, sayılar değer aralıklarına yetecek en küçük tipte tutulur.
+CLEAN_SCHEMA = {
+    'id': 'int32',
+    'customer_id': 'int32',
+    'product_name': 'category',
+    'category': 'category',
+    'payment_method': 'category',
+    'customer_gender': 'category',
+    'price': 'float32',
+    'shipping_cost': 'float32',
+    'satisfaction_score': 'float32',
+    'quantity': 'int16',
+    'customer_age': 'int16',
+    'discount_applied': 'bool',
+    'revenue': 'float64',
+}
+
+
+def _fits(series, dtype):
+    """Tamsayı sütunu eksiksiz ve değerleri hedef tipin aralığında mı"""
+    if series.isnull().any():
+        return False
+    if len(series) == 0:
+        return True
+    info = np.iinfo(dtype)
+    values = series.to_numpy()
+    return bool(np.all(values == np.floor(values))) and info.min <= values.min() and values.max() <= info.max
+
+
+def enforce_schema(df, schema=CLEAN_SCHEMA):
+    """Sütunları şemadaki kompakt tiplere çevirme (df yerinde güncellenir)
+
+    Tamsayı sütunlarında eksik ya da aralık dışı değer varsa sütun olduğu gibi
+    bırakılır; eksik değerli mantıksal sütunlar 'boolean' tipine çevrilir.
+    Şemada olmayan metin sütunları Arrow destekli string tipinde saklanır.
+    """
+    for column in df.columns:
+        dtype = schema.get(column)
+        series = df[column]
+        if dtype is None:
+            if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                df[column] = series.astype('string[pyarrow]')
+        elif dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[column] = series.astype('category')
+        elif dtype == 'bool':
+            if series.dtype != bool:
+                df[column] = series.astype('boolean' if series.isnull().any() else 'bool')
+        elif dtype.startswith('int'):
+            if series.dtype != dtype and _fits(series, dtype):
+                df[column] = series.astype(dtype)
+        elif series.dtype != dtype:
+            df[column] = series.astype(dtype)
+    return df
+
+
+def concat_frames(parts):
+    """Parçaları kategorik sütunları koruyarak birleştirme
+
+    Kategorileri farklı parçalar doğrudan birleştirilirse pandas sütunu object
+    tipine çevirir; önce kategoriler birleşimine (mevcut sıra korunarak) genişletilir.
+    """
+    parts = list(parts)
+    if len(parts) > 1:
+        for column in parts[0].columns:
+            dtypes = [part[column].dtype for part in parts if column in part.columns]
+            if not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+                continue
+            categories = dtypes[0].categories
+            for dtype in dtypes[1:]:
+                categories = categories.append(dtype.categories.difference(categories, sort=False))
+            for part in parts:
+                if not part[column].cat.categories.equals(categories):
+                    part[column] = part[column].cat.set_categories(categories)
+    return pd.concat(parts)
+
+
+class MissingnessBitmap:
+    """Ham verinin eksik değer konumlarını sütun başına bit dizisi olarak tutma
+
+    Orijinal verinin tam kopyası yerine satır başına sütun sayısı kadar bit
+    saklanır; eksik değer sayıları ve temizleme sırasında atılan satırlar
+    buradan türetilir. Yeni satışlar ayrı parçalar olarak eklenir.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._chunks = []   # (satır sayısı, sütun x bayt paketlenmiş bitler)
+        self.n_rows = 0
+
+    @classmethod
+    def from_frame(cls, df):
+        bitmap = cls(df.columns)
+        bitmap.append(df)
+        return bitmap
+
+    def append(self, df):
+        """Yeni satırların eksik değer bitlerini ekleme"""
+        missing = df.reindex(columns=self.columns).isnull().to_numpy().T
+        self._chunks.append((len(df), np.packbits(missing, axis=1)))
+        self.n_rows += len(df)
+        return self
+
+    def matrix(self):
+        """Satır x sütun eksik değer maskesi (açılmış bool dizi)"""
+        if not self._chunks:
+            return np.zeros((0, len(self.columns)), dtype=bool)
+        return np.concatenate([
+            np.unpackbits(bits, axis=1, count=n).astype(bool) for n, bits in self._chunks
+        ], axis=1).T
+
+    def counts(self):
+        """Sütun bazında eksik değer sayıları"""
+        totals = np.zeros(len(self.columns), dtype=np.int64)
+        for n, bits in self._chunks:
+            totals += np.unpackbits(bits, axis=1, count=n).sum(axis=1, dtype=np.int64)
+        return pd.Series(totals, index=self.columns)
+
+    def kept_rows(self, thresh):
+        """En az thresh dolu değeri olan satırlar (dropna(thresh=...) ile aynı kural)"""
+        return (len(self.columns) - self.matrix().sum(axis=1)) >= thresh
+
+    @property
+    def nbytes(self):
+        return sum(bits.nbytes for _, bits in self._chunks)
+
+
+def memory_usage(df):
+    """Sütun bazında bellek kullanımı (bayt, metinler dahil)"""
+    return df.memory_usage(deep=True, index=False)
+
+
+def memory_report(before, after, extra=None):
+    """Sütun bazında önce/sonra bellek karşılaştırması (MB)
+
+    Args:
+        before: Ham veri sütun bellekleri (memory_usage çıktısı)
+        after: Tipli veri sütun bellekleri
+        extra: {satır adı: (önce bayt, sonra bayt)} ek yapılar (örn. orijinal veri kopyası)
+    """
+    report = pd.DataFrame({'Önce (MB)': before, 'Sonra (MB)': after}).fillna(0)
+    for name, nbytes in (extra or {}).items():
+        report.loc[name] = list(nbytes)
+    report.loc['Toplam'] = report.sum()
+    report = report / 2 ** 20
+    report['Oran'] = (report['Önce (MB)'] / report['Sonra (MB)']).where((report['Önce (MB)'] > 0) & (report['Sonra (MB)'] > 0))
+    return report.round(3)
@@ -0,0 +1,319 @@
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """Göreli hata sınırlı, birleştirilebilir yaklaşık quantile özeti
+
+    Pozitif değerler logaritmik kovalara sayılır (DDSketch benzeri): kova i,
+    (gamma^(i-1), gamma^i] aralığını kapsar ve gamma = (1 + a) / (1 - a)
+    seçildiğinde döndürülen her quantile gerçek değere göre en fazla a göreli
+    hatalıdır. Bellek kullanımı veri boyutundan değil değer aralığından
+    bağımsızdır; veri parça parça eklenebilir ve ayrı özetler merge ile
+    birleştirilebilir.
+
+    Kullanım:
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for chunk in chunks:
+            sketch.add(chunk['spending'])
+        sketch.quantile([0.25, 0.5, 0.75])
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy 0 ile 1 arasında olmalı")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.keys = np.empty(0, dtype=np.int64)    # Sıralı kova numaraları
+        self.counts = np.empty(0, dtype=np.int64)  # Kova başına değer sayısı
+        self.zero_count = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, values):
+        """Değerleri özete ekleme (NaN değerler atlanır)
+
+        Raises:
+            ValueError: Negatif değer varsa
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        if values.min() < 0:
+            raise ValueError("QuantileSketch yalnızca negatif olmayan değerleri destekler")
+        positive = values[values > 0]
+        keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+        self._add_buckets(keys, counts)
+        self.zero_count += len(values) - len(positive)
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def _add_buckets(self, keys, counts):
+        if len(self.keys) == 0:
+            self.keys, self.counts = keys, counts.astype(np.int64)
+            return
+        merged = np.concatenate([self.keys, keys])
+        self.keys, inverse = np.unique(merged, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]),
+                                  minlength=len(self.keys)).astype(np.int64)
+
+    def merge(self, other):
+        """Başka bir özeti ekleme (aynı relative_accuracy ile oluşturulmuş olmalı)"""
+        if other.gamma != self.gamma:
+            raise ValueError("Farklı doğrulukta özetler birleştirilemez")
+        self._add_buckets(other.keys, other.counts)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Yaklaşık quantile değer(ler)i (np.quantile ile aynı sıra tanımı)
+
+        Args:
+            q: 0-1 arası tek değer veya dizi
+        """
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.count == 0:
+            result = np.full(len(q), np.nan)
+            return result[0] if scalar else result
+        ranks = q * (self.count - 1)
+        # Sıfır kovası başta, ardından pozitif kovalar artan sırada
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        positions = np.searchsorted(cumulative, ranks, side='right')
+        positions = np.minimum(positions, len(self.keys) - 1) if len(self.keys) else positions
+        values = np.where(
+            ranks < self.zero_count, 0.0,
+            2 * self.gamma ** self.keys[positions].astype(float) / (self.gamma + 1) if len(self.keys) else 0.0
+        )
+        result = np.clip(values, self.min, self.max)
+        # Uç quantile'lar kesin olarak bilinir
+        result[q <= 0] = self.min
+        result[q >= 1] = self.max
+        return result[0] if scalar else result
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.counts.nbytes
+
+
+def quantile_tiers(values, sketch, q=4, labels=None):
+    """Değerleri özetin quantile sınırlarına göre seviyelere ayırma (pd.qcut karşılığı)
+
+    Sınırlar parça parça oluşturulmuş veya birleştirilmiş bir özetten okunur;
+    değerlerin kendisinin sıralanması gerekmez.
+
+    Args:
+        values: Seviyesi belirlenecek değerler (Series)
+        sketch: Aynı dağılımdan oluşturulmuş QuantileSketch
+        q: Seviye sayısı
+        labels: Seviye etiketleri (varsayılan: aralıklar)
+    """
+    edges = sketch.quantile(np.linspace(0, 1, q + 1))
+    for i in range(1, len(edges)):
+        # Yaklaşık sınırlar çakışırsa aralıklar boş kalmayacak şekilde kaydırılır
+        if edges[i] <= edges[i - 1]:
+            edges[i] = np.nextafter(edges[i - 1], np.inf)
+    return pd.cut(values, edges, labels=labels, include_lowest=True)
+
+
+def _stable_hash(items, key):
+    """Süreçler arasında aynı kalan 64 bit öğe özetleri (Python hash() süreç başına değişir)"""
+    return pd.util.hash_array(np.asarray(items, dtype=object), hash_key=key)
+
+
+class CountMinSketch:
+    """Ağırlıklı sıklıklar için Count-Min özeti
+
+    depth x width sayaç tablosu; her öğe her satırda bir sayaca eklenir ve
+    tahmin satırlardaki en küçük sayaçtır. Tahmin gerçek değerden asla küçük
+    değildir ve 1 - delta olasılıkla en fazla epsilon * toplam ağırlık kadar
+    büyüktür (width = e / epsilon, depth = ln(1 / delta)). Aynı boyut ve
+    tohumla oluşturulmuş özetler tablolar toplanarak birleştirilir.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01, seed=0):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = int(np.ceil(np.e / epsilon))
+        self.depth = int(np.ceil(np.log(1 / delta)))
+        self.table = np.zeros((self.depth, self.width), dtype=np.float64)
+        self.total = 0.0
+        self._keys = [f"{seed:08d}{row:08d}" for row in range(self.depth)]
+
+    def _columns(self, items):
+        return [(_stable_hash(items, key) % np.uint64(self.width)).astype(np.intp) for key in self._keys]
+
+    def add(self, items, weights):
+        """Öğe ağırlıklarını ekleme (aynı öğe birden fazla kez geçebilir)"""
+        weights = np.asarray(weights, dtype=np.float64)
+        for row, columns in enumerate(self._columns(items)):
+            self.table[row] += np.bincount(columns, weights=weights, minlength=self.width)
+        self.total += float(weights.sum())
+        return self
+
+    def estimate(self, items):
+        """Öğelerin tahmini toplam ağırlıkları (üst sınır)"""
+        return np.min([self.table[row, columns] for row, columns in enumerate(self._columns(items))], axis=0)
+
+    def merge(self, other):
+        """Aynı boyut ve tohumla oluşturulmuş başka bir özeti ekleme"""
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError("Farklı boyut veya tohumla oluşturulmuş Count-Min özetleri birleştirilemez")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    @property
+    def error_bound(self):
+        """1 - delta olasılıkla tahminlerin en fazla aşabileceği miktar"""
+        return self.epsilon * self.total
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+
+class SpaceSaving:
+    """Ağırlıklı Space-Saving özeti: en fazla capacity öğe için sayaç
+
+    Her sayaç (count, error) çiftidir; öğenin gerçek toplamı
+    count - error <= gerçek <= count aralığındadır ve özette olmayan bir
+    öğenin toplamı en küçük sayacı aşamaz. Hata en fazla toplam ağırlık /
+    capacity olur. Yeni veriler parti halinde toplanıp özetlerin
+    birleştirilmesiyle eklenir; bu nedenle süreçler arası birleştirme de
+    aynı işlemdir.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.float64)
+        self.errors = pd.Series(dtype=np.float64)
+        self.total = 0.0
+
+    @property
+    def floor(self):
+        """Özette olmayan öğeler için üst sınır (özet dolu değilse 0)"""
+        return float(self.counts.min()) if len(self.counts) >= self.capacity else 0.0
+
+    def add(self, items, weights):
+        """Bir partiyi ekleme: parti önce kesin olarak toplanır, sonra özetle birleştirilir"""
+        batch = pd.Series(np.asarray(weights, dtype=np.float64)).groupby(np.asarray(items, dtype=object)).sum()
+        other = SpaceSaving(self.capacity)
+        other.counts, other.errors, other.total = batch, pd.Series(0.0, index=batch.index), float(batch.sum())
+        # Parti kesin olduğundan taban değeri 0 olmalıdır; sayaç sınırı birleştirmede uygulanır
+        return self._combine(other, other_floor=0.0)
+
+    def merge(self, other):
+        """Başka bir Space-Saving özetini ekleme"""
+        return self._combine(other, other_floor=other.floor)
+
+    def _combine(self, other, other_floor):
+        floor = self.floor
+        items = self.counts.index.union(other.counts.index)
+        counts = self.counts.reindex(items, fill_value=floor) + other.counts.reindex(items, fill_value=other_floor)
+        errors = self.errors.reindex(items, fill_value=floor) + other.errors.reindex(items, fill_value=other_floor)
+        if len(items) > self.capacity:
+            keep = counts.sort_values(ascending=False, kind='stable').index[:self.capacity]
+            counts, errors = counts[keep], errors[keep]
+        self.counts, self.errors = counts, errors
+        self.total += other.total
+        return self
+
+    def top(self, n=10):
+        """En büyük n sayaç (count, error, lower)"""
+        counts = self.counts.sort_values(ascending=False, kind='stable').head(n)
+        errors = self.errors[counts.index]
+        return pd.DataFrame({'count': counts, 'error': errors, 'lower': counts - errors})
+
+
+class StreamingTopProducts:
+    """Sınırlı bellekle akış halindeki satışlardan en çok satan ürünler
+
+    Space-Saving özeti aday ürünleri ve alt sınırları, Count-Min özeti her
+    ürün için ikinci bir üst sınır tutar; bildirilen tahmin iki üst sınırın
+    küçüğüdür. Bellek kullanımı satış ya da ürün sayısından bağımsızdır.
+    Partiler fetch_data/iter_pages sayfalarından veya JSON Lines akışından
+    gelebilir; ayrı süreçlerde oluşturulan özetler merge ile birleştirilir.
+
+    Kullanım:
+        tracker = StreamingTopProducts(capacity=1000)
+        tracker.consume(api.iter_pages(page_size=10_000, columns=['product_name', 'quantity']))
+        tracker.top(10)
+    """
+
+    def __init__(self, capacity=1000, epsilon=0.001, delta=0.01, seed=0,
+                 item_column='product_name', weight_column='quantity'):
+        self.space_saving = SpaceSaving(capacity)
+        self.count_min = CountMinSketch(epsilon, delta, seed)
+        self.item_column = item_column
+        self.weight_column = weight_column
+        self.n_rows = 0
+
+    def update(self, batch):
+        """Bir satış partisini ekleme (ürünü veya miktarı eksik satırlar atlanır)"""
+        batch = batch[[self.item_column, self.weight_column]].dropna()
+        items = batch[self.item_column].astype(object).to_numpy()
+        weights = batch[self.weight_column].to_numpy(np.float64)
+        self.space_saving.add(items, weights)
+        self.count_min.add(items, weights)
+        self.n_rows += len(batch)
+        return self
+
+    def consume(self, batches):
+        """Parti akışının tamamını ekleme (DataFrame üreten herhangi bir yineleyici)"""
+        for batch in batches:
+            self.update(batch)
+        return self
+
+    def merge(self, other):
+        """Başka bir süreçte oluşturulmuş izleyiciyi ekleme"""
+        self.space_saving.merge(other.space_saving)
+        self.count_min.merge(other.count_min)
+        self.n_rows += other.n_rows
+        return self
+
+    def top(self, n=10):
+        """Tahmini en çok satan n ürün ve hata sınırları
+
+        Returns:
+            top: estimate (üst sınır), lower (alt sınır), error (estimate - lower)
+                ve guaranteed (ürün kesin olarak ilk n'de mi) sütunlu DataFrame
+        """
+        candidates = self.space_saving.top(len(self.space_saving.counts))
+        upper = np.minimum(candidates['count'].to_numpy(), self.count_min.estimate(candidates.index.to_numpy()))
+        lower = candidates['lower'].to_numpy()
+        top = pd.DataFrame({'estimate': upper, 'lower': lower}, index=candidates.index)
+        top = top.sort_values(['estimate', 'lower'], ascending=False, kind='stable')
+        top.index.name = self.item_column
+        top['error'] = top['estimate'] - top['lower']
+        # Alt sınırı, ilk n dışındaki en büyük üst sınırdan (veya özet dışı sınırdan) büyük olanlar kesin
+        outside = max(top['estimate'].iloc[n:].max() if len(top) > n else 0.0, self.space_saving.floor)
+        top = top.head(n)
+        top['guaranteed'] = top['lower'] >= outside
+        return top
+
+    @property
+    def nbytes(self):
+        return self.count_min.nbytes + self.space_saving.counts.memory_usage(deep=True) * 2
+
+
+def iter_jsonl_batches(source, batch_size=100_000, columns=('product_name', 'quantity')):
+    """JSON Lines dosyasını veya akışını sabit boyutlu DataFrame partileri olarak okuma
+
+    Args:
+        source: Dosya yolu veya satır satır okunabilen dosya nesnesi (örn. sys.stdin)
+        batch_size: Parti başına satır sayısı
+        columns: Partide tutulacak sütunlar
+    """
+    with pd.read_json(source, lines=True, chunksize=batch_size, dtype=False) as reader:
+        for chunk in reader:
+            yield chunk.reindex(columns=list(columns))
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+
+class DailyMatrix:
+    """Gün x anahtar (ürün, kategori) günlük toplam matrisi
+
+    Satırlar ilk satış gününden son satış gününe kadar her gün için (satış
+    olmayan günler sıfır), sütunlar sıralı anahtarlar içindir. Kümülatif
+    toplamlar bir kez hesaplanır; herhangi bir tarih aralığının anahtar bazlı
+    toplamı iki satırın farkıdır ve O(anahtar sayısı) sürer.
+
+    Matris yoğun tutulur: bellek gün sayısı x anahtar sayısı x 8 bayttır.
+    """
+
+    def __init__(self, start_day, keys, values, name=None):
+        self.start_day = pd.Timestamp(start_day)
+        self.keys = pd.Index(keys)
+        self.values = values
+        self.name = name  # Ölçü adı (örn. 'quantity')
+        self.cumulative = np.vstack([np.zeros((1, values.shape[1]), dtype=values.dtype), np.cumsum(values, axis=0)])
+
+    @classmethod
+    def from_series(cls, series):
+        """(gün, anahtar) indeksli günlük toplamlardan matris oluşturma (eksik gün/anahtar atlanır)"""
+        days = series.index.get_level_values(0)
+        keys = series.index.get_level_values(1)
+        valid = ~(days.isna() | keys.isna())
+        days, keys, totals = days[valid], keys[valid], series.to_numpy()[valid]
+        key_codes, key_values = pd.factorize(keys, sort=True)
+        key_values = pd.Index(key_values, name=series.index.names[1])
+        if len(days) == 0:
+            return cls(pd.NaT, key_values, np.zeros((0, len(key_values)), dtype=totals.dtype), series.name)
+        start_day = days.min()
+        day_codes = ((days - start_day) // pd.Timedelta(days=1)).to_numpy()
+        n_days = int(day_codes.max()) + 1
+        flat = np.bincount(day_codes * len(key_values) + key_codes, weights=totals, minlength=n_days * len(key_values))
+        values = flat.reshape(n_days, len(key_values)).astype(totals.dtype)
+        return cls(start_day, key_values, values, series.name)
+
+    @property
+    def n_days(self):
+        return self.values.shape[0]
+
+    @property
+    def days(self):
+        """Satırların tarihleri"""
+        return pd.date_range(self.start_day, periods=self.n_days, freq='D')
+
+    @property
+    def end_day(self):
+        return self.start_day + pd.Timedelta(days=self.n_days - 1) if self.n_days else pd.NaT
+
+    def _row(self, day):
+        """Tarihin gün sırası (matris dışındaysa sınırlara çekilir)"""
+        ordinal = (pd.Timestamp(day).normalize() - self.start_day) // pd.Timedelta(days=1)
+        return int(min(max(ordinal, -1), self.n_days))
+
+    def window(self, start=None, end=None):
+        """[start, end] tarih aralığında (iki uç dahil) anahtar bazında toplamlar"""
+        if self.n_days == 0:
+            return pd.Series(np.zeros(len(self.keys), dtype=self.values.dtype), index=self.keys, name=self.name)
+        lo = 0 if start is None else self._row(start)
+        hi = self.n_days - 1 if end is None else self._row(end)
+        lo, hi = max(lo, 0), min(hi, self.n_days - 1)
+        if hi < lo:
+            totals = np.zeros(len(self.keys), dtype=self.values.dtype)
+        else:
+            totals = self.cumulative[hi + 1] - self.cumulative[lo]
+        return pd.Series(totals, index=self.keys, name=self.name)
+
+    def trailing(self, days, end=None):
+        """Son günden (veya end'den) geriye days gün öncesine kadar toplamlar
+
+        time_based_analysis ile aynı tanım: son gün - days tarihinden itibaren
+        (iki uç dahil).
+        """
+        end = self.end_day if end is None else pd.Timestamp(end)
+        return self.window(end - pd.Timedelta(days=days), end)
+
+    def rolling(self, window, keys=None, mean=False):
+        """Her gün için son window günün toplamı (veya ortalaması)
+
+        İlk window - 1 günde pencere veri başlangıcıyla kısaltılır (ortalama yine
+        window'a bölünür).
+
+        Args:
+            window: Pencere uzunluğu (gün)
+            keys: Yalnızca bu anahtarların serileri (varsayılan: tümü)
+            mean: True ise hareketli ortalama
+
+        Returns:
+            series: Gün x anahtar DataFrame
+        """
+        columns = slice(None) if keys is None else self.keys.get_indexer(list(keys))
+        if keys is not None and (columns < 0).any():
+            raise KeyError(f"Bilinmeyen anahtar: {list(np.asarray(list(keys))[columns < 0])}")
+        cumulative = self.cumulative[:, columns]
+        rows = np.arange(1, self.n_days + 1)
+        totals = cumulative[rows] - cumulative[np.maximum(rows - window, 0)]
+        if mean:
+            totals = totals / window
+        return pd.DataFrame(totals, index=self.days, columns=self.keys if keys is None else self.keys[columns])
+
+
+class SalesTimeSeries:
+    """Günlük ürün ve kategori satış matrisleri üzerinde zaman penceresi analizleri
+
+    Matrisler toplam küpünden (gün seviyesi) bir kez oluşturulur; ardından
+    1/7/30/90 gün gibi tüm pencereler ve istenen tarih aralıkları veriyi
+    yeniden taramadan kümülatif toplamlardan yanıtlanır.
+
+    Kullanım:
+        series = processor.timeseries
+        series.top_products(n=10, days=7)
+        series.windows(days=(1, 7, 30, 90))
+        series.rolling('category', window=7, mean=True)
+    """
+
+    def __init__(self, product, category):
+        self.matrices = {'product': product, 'category': category}
+
+    @classmethod
+    def from_cube(cls, cube, measure='quantity'):
+        """(kategori, ürün, ödeme, gün) küpünden günlük ürün ve kategori matrisleri"""
+        def daily(level):
+            return cube[measure].groupby(level=['day', level], observed=True).sum()
+        return cls(DailyMatrix.from_series(daily('product_name')), DailyMatrix.from_series(daily('category')))
+
+    def totals(self, by='product', days=None, start=None, end=None):
+        """Son days gün veya [start, end] aralığında anahtar bazında toplamlar"""
+        matrix = self.matrices[by]
+        if days is not None:
+            return matrix.trailing(days, end)
+        return matrix.window(start, end)
+
+    def top_products(self, n=10, days=None, start=None, end=None, by='product'):
+        """Pencerede en çok satan n ürün (veya kategori); n=None ise satışı olan tümü"""
+        totals = self.totals(by, days, start, end)
+        top = totals[totals > 0].sort_values(ascending=False, kind='stable')
+        return top if n is None else top.head(n)
+
+    def windows(self, days=(1, 7, 30, 90), n=10, by='product'):
+        """Birden fazla son-N-gün penceresinin en çok satanları {gün: Series}"""
+        return {d: self.top_products(n, days=d, by=by) for d in days}
+
+    def rolling(self, by='product', window=7, keys=None, mean=False):
+        """Ürün veya kategori bazında günlük hareketli toplam/ortalama serileri"""
+        return self.matrices[by].rolling(window, keys, mean)